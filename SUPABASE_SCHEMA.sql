@@ -18,6 +18,7 @@ CREATE TABLE IF NOT EXISTS user_api_keys (
     account_name TEXT NOT NULL,
     exchange TEXT NOT NULL DEFAULT 'hyperliquid',
     api_key TEXT,
+    api_key_hash TEXT,  -- HMAC blind index of api_key, for duplicate lookups
     api_secret TEXT NOT NULL,
     is_master_account BOOLEAN DEFAULT true,
     wallet_address TEXT,
@@ -34,6 +35,7 @@ CREATE TABLE IF NOT EXISTS user_api_keys (
 -- Indexes for user_api_keys
 CREATE INDEX IF NOT EXISTS idx_user_api_keys_user_id ON user_api_keys(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_api_keys_exchange ON user_api_keys(exchange);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_api_keys_user_api_key_hash ON user_api_keys(user_id, api_key_hash) WHERE api_key_hash IS NOT NULL;
 
 -- =====================================================
 -- TABLE: lp_positions
@@ -182,6 +184,47 @@ CREATE TRIGGER update_user_api_keys_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- =====================================================
+-- FUNCTION: update_api_key_balances (batch balance write-back)
+-- =====================================================
+-- Updates account_value/available_balance for many trading accounts in one call.
+-- SECURITY INVOKER so the user_api_keys RLS policy still applies.
+CREATE OR REPLACE FUNCTION update_api_key_balances(balances JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+    WITH updated AS (
+        UPDATE user_api_keys k
+        SET account_value = (b->>'account_value')::numeric,
+            available_balance = (b->>'available_balance')::numeric
+        FROM jsonb_array_elements(balances) AS b
+        WHERE k.id = (b->>'id')::uuid
+        RETURNING k.id
+    )
+    SELECT count(*)::integer FROM updated;
+$$;
+
+-- =====================================================
+-- FUNCTION: update_position_sizes (batch position_size_usd write-back)
+-- =====================================================
+-- Updates position_size_usd for many positions in one call.
+-- SECURITY INVOKER so the position_configs RLS policy still applies.
+CREATE OR REPLACE FUNCTION update_position_sizes(sizes JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+    WITH updated AS (
+        UPDATE position_configs p
+        SET position_size_usd = (s->>'position_size_usd')::numeric
+        FROM jsonb_array_elements(sizes) AS s
+        WHERE p.id = (s->>'id')::uuid
+        RETURNING p.id
+    )
+    SELECT count(*)::integer FROM updated;
+$$;
+
 -- =====================================================
 -- TABLE: plan_tiers (Master Plan Definitions)
 -- =====================================================
@@ -403,6 +446,8 @@ LEFT JOIN plan_tiers pt ON us.plan_tier_id = pt.id;
 -- PERMISSIONS
 -- =====================================================
 GRANT SELECT ON user_subscription_status TO authenticated;
+GRANT EXECUTE ON FUNCTION update_api_key_balances(JSONB) TO authenticated;
+GRANT EXECUTE ON FUNCTION update_position_sizes(JSONB) TO authenticated;
 GRANT ALL ON user_subscriptions TO service_role;
 
 -- =====================================================
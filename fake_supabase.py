@@ -0,0 +1,51 @@
+"""
+Minimal in-memory stand-in for the Supabase client, shared by the tests
+
+Table queries return canned rows per table; filters are accepted and ignored.
+Every executed table query and RPC call is recorded in order.
+"""
+import time
+from typing import Dict, List, Optional
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Chainable PostgREST query builder: every filter returns the query itself"""
+
+    def __init__(self, supabase: "FakeSupabase", name: str, params: Optional[Dict] = None):
+        self.supabase, self.name, self.params = supabase, name, params
+        self.not_ = self
+
+    def _chain(self, *args, **kwargs):
+        return self
+
+    select = eq = neq = is_ = in_ = order = limit = insert = update = upsert = delete = _chain
+
+    def execute(self) -> FakeResponse:
+        self.supabase.executed.append((self.name, self.params))
+        if self.supabase.delay:
+            time.sleep(self.supabase.delay)
+        return FakeResponse(self.supabase.rows.get(self.name, []))
+
+
+class FakeSupabase:
+    """
+    Args:
+        rows: Table name -> rows returned by queries on it
+        delay: Seconds each execute() takes, to check that queries overlap
+    """
+
+    def __init__(self, rows: Optional[Dict[str, List[Dict]]] = None, delay: float = 0.0):
+        self.rows = rows or {}
+        self.delay = delay
+        self.executed: List[tuple] = []  # (table or function name, RPC params or None)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: Dict) -> FakeQuery:
+        return FakeQuery(self, name, params)
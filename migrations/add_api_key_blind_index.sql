@@ -0,0 +1,25 @@
+-- Migration: Add api_key_hash blind index to user_api_keys
+-- Date: 2026-10-18
+-- Reason: Encrypted api_key values are randomized (Fernet), so duplicate trading
+--         accounts can't be found by comparing ciphertext. api_key_hash holds a
+--         keyed HMAC of the plaintext key, making the duplicate check one indexed
+--         lookup. Existing rows are filled by scripts/backfill_api_key_blind_index.py
+
+ALTER TABLE user_api_keys
+ADD COLUMN IF NOT EXISTS api_key_hash TEXT;
+
+-- One trading account per API key for each user (rows without a key are ignored)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_api_keys_user_api_key_hash
+ON user_api_keys(user_id, api_key_hash)
+WHERE api_key_hash IS NOT NULL;
+
+-- Verify column and index exist
+SELECT column_name, data_type
+FROM information_schema.columns
+WHERE table_name = 'user_api_keys'
+AND column_name = 'api_key_hash';
+
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'user_api_keys'
+AND indexname = 'idx_user_api_keys_user_api_key_hash';
@@ -0,0 +1,25 @@
+-- Migration: Add update_api_key_balances function
+-- Date: 2026-10-18
+-- Reason: Refreshing trading account balances wrote one UPDATE per account.
+--         This function writes all of a user's balances in a single call.
+
+CREATE OR REPLACE FUNCTION update_api_key_balances(balances JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+    WITH updated AS (
+        UPDATE user_api_keys k
+        SET account_value = (b->>'account_value')::numeric,
+            available_balance = (b->>'available_balance')::numeric
+        FROM jsonb_array_elements(balances) AS b
+        WHERE k.id = (b->>'id')::uuid
+        RETURNING k.id
+    )
+    SELECT count(*)::integer FROM updated;
+$$;
+
+GRANT EXECUTE ON FUNCTION update_api_key_balances(JSONB) TO authenticated;
+
+-- Verify: should return 0 (no matching ids)
+SELECT update_api_key_balances('[]'::jsonb);
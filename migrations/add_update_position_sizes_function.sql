@@ -0,0 +1,24 @@
+-- Migration: Add update_position_sizes function
+-- Date: 2026-10-18
+-- Reason: Loading the dashboard wrote position_size_usd with one UPDATE per
+--         position. The write-behind sync now writes them in a single call.
+
+CREATE OR REPLACE FUNCTION update_position_sizes(sizes JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+    WITH updated AS (
+        UPDATE position_configs p
+        SET position_size_usd = (s->>'position_size_usd')::numeric
+        FROM jsonb_array_elements(sizes) AS s
+        WHERE p.id = (s->>'id')::uuid
+        RETURNING p.id
+    )
+    SELECT count(*)::integer FROM updated;
+$$;
+
+GRANT EXECUTE ON FUNCTION update_position_sizes(JSONB) TO authenticated;
+
+-- Verify: should return 0 (no matching ids)
+SELECT update_position_sizes('[]'::jsonb);
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+One-time script to fill user_api_keys.api_key_hash for existing rows.
+
+Run after migrations/add_api_key_blind_index.sql, with the same ENCRYPTION_KEY
+and BLIND_INDEX_KEY as the web app. Re-run it whenever BLIND_INDEX_KEY
+changes: every stored hash depends on it, so duplicate checks stop matching
+until they are rewritten. Rotating ENCRYPTION_KEY doesn't affect the hashes.
+
+This script:
+1. Decrypts each stored api_key and computes its blind index
+2. Checks for users that have the same API key saved more than once
+3. Reports conflicts for manual review (they would violate the unique index)
+4. Waits for user confirmation before applying changes
+5. Writes api_key_hash for every row that is missing or has a stale hash
+
+Run from project root:
+    python3 scripts/backfill_api_key_blind_index.py
+"""
+
+import os
+import sys
+from typing import Dict, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supabase import create_client, Client
+from dotenv import load_dotenv
+
+# Load environment variables from web_ui/.env
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+env_path = os.path.join(project_root, 'web_ui', '.env')
+load_dotenv(env_path)
+
+# Imported after loading .env so the encryption keys are picked up
+from web_ui.crypto_utils import blind_index, decrypt_value
+
+
+def get_supabase_admin_client() -> Client:
+    """Get Supabase client with service role key for admin operations"""
+    url = os.getenv("SUPABASE_URL")
+    # Use service role key to bypass RLS policies for migration
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in environment")
+
+    return create_client(url, key)
+
+
+def analyze_user_api_keys(supabase: Client) -> Tuple[List[Dict], List[str]]:
+    """Compute the blind index of every stored API key"""
+    print("\n📋 Analyzing user_api_keys table...")
+
+    response = supabase.table("user_api_keys").select("id, user_id, account_name, api_key, api_key_hash").execute()
+
+    print(f"  Found {len(response.data)} total rows")
+
+    changes = []
+    conflicts = []
+    seen_keys = {}
+
+    for row in response.data:
+        if not row.get('api_key'):
+            continue
+
+        try:
+            new_hash = blind_index(decrypt_value(row['api_key']))
+        except Exception as e:
+            conflicts.append(f"user_api_keys: Could not decrypt api_key for id={row['id']} ({e})")
+            continue
+
+        # UNIQUE(user_id, api_key_hash)
+        key = (row['user_id'], new_hash)
+        if key in seen_keys:
+            conflicts.append(
+                f"user_api_keys: User {row['user_id']} has the same API key in "
+                f"'{seen_keys[key]}' and '{row['account_name']}'"
+            )
+        seen_keys[key] = row['account_name']
+
+        if row.get('api_key_hash') != new_hash:
+            changes.append({
+                'id': row['id'],
+                'account_name': row['account_name'],
+                'new': new_hash,
+            })
+
+    print(f"  Found {len(changes)} hashes to write")
+    print(f"  Found {len(conflicts)} potential conflicts")
+
+    return changes, conflicts
+
+
+def print_changes(changes: List[Dict]):
+    """Print all changes in a readable format"""
+    if not changes:
+        print("\n✅ All API keys already have a blind index!")
+        return
+
+    print(f"\n📝 Summary of changes ({len(changes)} total):")
+    print("=" * 80)
+    for i, change in enumerate(changes[:5], 1):  # Show first 5 examples
+        print(f"  {i}. {change['account_name']} (id={change['id']}): api_key_hash → {change['new'][:12]}...")
+    if len(changes) > 5:
+        print(f"  ... and {len(changes) - 5} more")
+
+
+def apply_changes(supabase: Client, changes: List[Dict]) -> bool:
+    """Write api_key_hash for each changed row"""
+    print("\n🔄 Applying changes...")
+
+    success_count = 0
+    error_count = 0
+
+    for change in changes:
+        try:
+            supabase.table("user_api_keys").update({"api_key_hash": change['new']}).eq("id", change['id']).execute()
+            success_count += 1
+
+        except Exception as e:
+            print(f"  ❌ Error updating user_api_keys.api_key_hash (id={change['id']}): {e}")
+            error_count += 1
+
+    print(f"\n✅ Successfully updated {success_count} rows")
+    if error_count > 0:
+        print(f"❌ Failed to update {error_count} rows")
+        return False
+
+    return True
+
+
+def verify_changes(supabase: Client) -> bool:
+    """Verify that every stored API key has a blind index"""
+    print("\n🔍 Verifying changes...")
+
+    response = supabase.table("user_api_keys").select("id, api_key, api_key_hash").execute()
+    issues = [
+        f"user_api_keys.api_key_hash missing for id={row['id']}"
+        for row in response.data
+        if row.get('api_key') and not row.get('api_key_hash')
+    ]
+
+    if issues:
+        print(f"❌ Found {len(issues)} verification issues:")
+        for issue in issues:
+            print(f"  - {issue}")
+        return False
+
+    print("✅ All API keys have a blind index!")
+    return True
+
+
+def main():
+    """Main backfill script"""
+    print("=" * 80)
+    print("API Key Blind Index Backfill")
+    print("=" * 80)
+
+    try:
+        # Get Supabase client
+        supabase = get_supabase_admin_client()
+        print("✅ Connected to Supabase")
+
+        changes, conflicts = analyze_user_api_keys(supabase)
+
+        # Report conflicts
+        if conflicts:
+            print("\n⚠️  CONFLICTS DETECTED:")
+            print("=" * 80)
+            for conflict in conflicts:
+                print(f"  - {conflict}")
+            print("\n❌ Please resolve conflicts manually before proceeding.")
+            return 1
+
+        # Print changes
+        print_changes(changes)
+
+        if not changes:
+            print("\n✅ Backfill complete - no changes needed!")
+            return 0
+
+        # Confirm with user
+        print("\n" + "=" * 80)
+        response = input("Apply these changes? (yes/no): ").strip().lower()
+
+        if response != 'yes':
+            print("❌ Backfill cancelled by user")
+            return 1
+
+        # Apply changes
+        if not apply_changes(supabase, changes):
+            print("\n❌ Backfill failed - some updates did not succeed")
+            return 1
+
+        # Verify changes
+        if not verify_changes(supabase):
+            print("\n⚠️  Backfill completed but verification found issues")
+            return 1
+
+        print("\n" + "=" * 80)
+        print("✅ Backfill completed successfully!")
+        print("=" * 80)
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Backfill failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
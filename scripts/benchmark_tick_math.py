@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark the exact TickMath port against the old floating point formula.
+
+Reports, for a spread of ticks across the full range:
+1. Time per call of get_sqrt_ratio_at_tick (uncached and cached) vs
+   int(1.0001 ** (tick / 2) * 2**96)
+2. How far the float result is from the exact sqrtPriceX96 (in raw units)
+3. How many token0/token1 amounts differ for a sample position as a result
+
+Run from project root:
+    python3 scripts/benchmark_tick_math.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_ui.tick_math import (
+    MAX_TICK, MIN_TICK, get_amount0_delta, get_amount1_delta, get_sqrt_ratio_at_tick,
+)
+
+SAMPLE_SIZE = 10_000
+# Typical mainnet position liquidity (uint128)
+LIQUIDITY = 12_345_678_901_234_567
+
+
+def float_sqrt_price_x96(tick: int) -> int:
+    """The previous blockchain_utils.tick_to_sqrt_price_x96"""
+    return int((1.0001 ** (tick / 2)) * (2 ** 96))
+
+
+def benchmark_speed(ticks):
+    print("\n⏱️  Speed")
+    # Cached calls are what position refreshes see: the same range bounds every time
+    get_sqrt_ratio_at_tick.cache_clear()
+    for tick in ticks[:4096]:
+        get_sqrt_ratio_at_tick(tick)
+    timings = (
+        ("exact TickMath", get_sqrt_ratio_at_tick.__wrapped__, ticks),
+        ("exact (cached)", get_sqrt_ratio_at_tick, ticks[:4096]),
+        ("float formula", float_sqrt_price_x96, ticks),
+    )
+    for name, fn, sample in timings:
+        seconds = min(timeit.repeat(lambda: [fn(t) for t in sample], number=1, repeat=5))
+        print(f"  {name:<15} {seconds / len(sample) * 1e9:8.0f} ns/call")
+
+
+def benchmark_accuracy(ticks):
+    print("\n🎯 Accuracy of the float formula")
+    errors = [abs(float_sqrt_price_x96(t) - get_sqrt_ratio_at_tick(t)) for t in ticks]
+    wrong = sum(1 for e in errors if e)
+    print(f"  {wrong}/{len(ticks)} sqrtPriceX96 values differ from on-chain")
+    print(f"  Max error: {max(errors)} raw units")
+
+    amount_mismatches = 0
+    for tick in ticks:
+        lower, upper = max(tick - 600, MIN_TICK), min(tick + 600, MAX_TICK)
+        exact = (get_sqrt_ratio_at_tick(lower), get_sqrt_ratio_at_tick(upper))
+        approx = (float_sqrt_price_x96(lower), float_sqrt_price_x96(upper))
+        if (get_amount0_delta(*exact, LIQUIDITY) != get_amount0_delta(*approx, LIQUIDITY)
+                or get_amount1_delta(*exact, LIQUIDITY) != get_amount1_delta(*approx, LIQUIDITY)):
+            amount_mismatches += 1
+    print(f"  {amount_mismatches}/{len(ticks)} sample positions get different token amounts")
+
+
+def main():
+    print("=" * 80)
+    print("TickMath Benchmark")
+    print("=" * 80)
+
+    rng = random.Random(0)
+    ticks = [rng.randint(MIN_TICK, MAX_TICK) for _ in range(SAMPLE_SIZE)]
+
+    benchmark_speed(ticks)
+    benchmark_accuracy(ticks)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
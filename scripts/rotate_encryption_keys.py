@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Re-encrypt stored exchange credentials under the current ENCRYPTION_KEY.
+
+Run after rotating ENCRYPTION_KEY, with the old key(s) in
+ENCRYPTION_KEY_PREVIOUS (same settings as the web app). Once it has
+completed, the old keys can be removed from ENCRYPTION_KEY_PREVIOUS.
+
+This script:
+1. Finds api_key, api_secret and private_key values not encrypted with ENCRYPTION_KEY
+2. Reports values that no configured key can decrypt for manual review
+3. Waits for user confirmation before applying changes
+4. Re-encrypts each of them with rotate_value
+5. Verifies that every value now decrypts with ENCRYPTION_KEY alone
+
+Run from project root:
+    python3 scripts/rotate_encryption_keys.py
+"""
+
+import os
+import sys
+from typing import Dict, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.fernet import Fernet, InvalidToken
+from supabase import create_client, Client
+from dotenv import load_dotenv
+
+# Load environment variables from web_ui/.env
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+env_path = os.path.join(project_root, 'web_ui', '.env')
+load_dotenv(env_path)
+
+# Imported after loading .env so the encryption keys are picked up
+from web_ui.crypto_utils import get_encryption_key, rotate_value
+
+# Encrypted columns of user_api_keys
+ENCRYPTED_FIELDS = ('api_key', 'api_secret', 'private_key')
+
+
+def get_supabase_admin_client() -> Client:
+    """Get Supabase client with service role key for admin operations"""
+    url = os.getenv("SUPABASE_URL")
+    # Use service role key to bypass RLS policies for migration
+    key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in environment")
+
+    return create_client(url, key)
+
+
+def is_current(primary: Fernet, encrypted_value: str) -> bool:
+    """Whether a value is already encrypted with ENCRYPTION_KEY"""
+    try:
+        primary.decrypt(encrypted_value.encode())
+        return True
+    except InvalidToken:
+        return False
+
+
+def analyze_user_api_keys(supabase: Client, primary: Fernet) -> Tuple[List[Dict], List[str]]:
+    """Find encrypted values that still use a previous key"""
+    print("\n📋 Analyzing user_api_keys table...")
+
+    response = supabase.table("user_api_keys").select("id, account_name, " + ", ".join(ENCRYPTED_FIELDS)).execute()
+
+    print(f"  Found {len(response.data)} total rows")
+
+    changes = []
+    conflicts = []
+
+    for row in response.data:
+        for field in ENCRYPTED_FIELDS:
+            value = row.get(field)
+            if not value or is_current(primary, value):
+                continue
+
+            try:
+                new_value = rotate_value(value)
+            except InvalidToken:
+                conflicts.append(
+                    f"user_api_keys: No configured key decrypts {field} for id={row['id']} "
+                    f"('{row['account_name']}')"
+                )
+                continue
+
+            changes.append({
+                'id': row['id'],
+                'account_name': row['account_name'],
+                'field': field,
+                'new': new_value,
+            })
+
+    print(f"  Found {len(changes)} values to re-encrypt")
+    print(f"  Found {len(conflicts)} potential conflicts")
+
+    return changes, conflicts
+
+
+def print_changes(changes: List[Dict]):
+    """Print all changes in a readable format"""
+    if not changes:
+        print("\n✅ All values are already encrypted with ENCRYPTION_KEY!")
+        return
+
+    print(f"\n📝 Summary of changes ({len(changes)} total):")
+    print("=" * 80)
+    for i, change in enumerate(changes[:5], 1):  # Show first 5 examples
+        print(f"  {i}. {change['account_name']} (id={change['id']}): {change['field']} → re-encrypted")
+    if len(changes) > 5:
+        print(f"  ... and {len(changes) - 5} more")
+
+
+def apply_changes(supabase: Client, changes: List[Dict]) -> bool:
+    """Write each re-encrypted value"""
+    print("\n🔄 Applying changes...")
+
+    success_count = 0
+    error_count = 0
+
+    for change in changes:
+        try:
+            supabase.table("user_api_keys").update({change['field']: change['new']}).eq("id", change['id']).execute()
+            success_count += 1
+
+        except Exception as e:
+            print(f"  ❌ Error updating user_api_keys.{change['field']} (id={change['id']}): {e}")
+            error_count += 1
+
+    print(f"\n✅ Successfully updated {success_count} values")
+    if error_count > 0:
+        print(f"❌ Failed to update {error_count} values")
+        return False
+
+    return True
+
+
+def verify_changes(supabase: Client, primary: Fernet) -> bool:
+    """Verify that every stored value decrypts with ENCRYPTION_KEY alone"""
+    print("\n🔍 Verifying changes...")
+
+    response = supabase.table("user_api_keys").select("id, " + ", ".join(ENCRYPTED_FIELDS)).execute()
+    issues = [
+        f"user_api_keys.{field} not encrypted with ENCRYPTION_KEY for id={row['id']}"
+        for row in response.data
+        for field in ENCRYPTED_FIELDS
+        if row.get(field) and not is_current(primary, row[field])
+    ]
+
+    if issues:
+        print(f"❌ Found {len(issues)} verification issues:")
+        for issue in issues:
+            print(f"  - {issue}")
+        return False
+
+    print("✅ All values are encrypted with ENCRYPTION_KEY!")
+    return True
+
+
+def main():
+    """Main rotation script"""
+    print("=" * 80)
+    print("Encryption Key Rotation")
+    print("=" * 80)
+
+    try:
+        # Get Supabase client
+        supabase = get_supabase_admin_client()
+        print("✅ Connected to Supabase")
+
+        primary = Fernet(get_encryption_key())
+        changes, conflicts = analyze_user_api_keys(supabase, primary)
+
+        # Report conflicts
+        if conflicts:
+            print("\n⚠️  CONFLICTS DETECTED:")
+            print("=" * 80)
+            for conflict in conflicts:
+                print(f"  - {conflict}")
+            print("\n❌ Please add the missing keys to ENCRYPTION_KEY_PREVIOUS or resolve manually before proceeding.")
+            return 1
+
+        # Print changes
+        print_changes(changes)
+
+        if not changes:
+            print("\n✅ Rotation complete - no changes needed!")
+            return 0
+
+        # Confirm with user
+        print("\n" + "=" * 80)
+        response = input("Apply these changes? (yes/no): ").strip().lower()
+
+        if response != 'yes':
+            print("❌ Rotation cancelled by user")
+            return 1
+
+        # Apply changes
+        if not apply_changes(supabase, changes):
+            print("\n❌ Rotation failed - some updates did not succeed")
+            return 1
+
+        # Verify changes
+        if not verify_changes(supabase, primary):
+            print("\n⚠️  Rotation completed but verification found issues")
+            return 1
+
+        print("\n" + "=" * 80)
+        print("✅ Rotation completed successfully!")
+        print("You can now remove the old keys from ENCRYPTION_KEY_PREVIOUS.")
+        print("=" * 80)
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ Rotation failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Test the trading account usage map shared by the API keys list, wallet selector and save check
+"""
+from fake_supabase import FakeSupabase
+from web_ui.api_key_usage import fetch_api_key_usage
+
+
+def test_usage_is_read_once_and_answers_every_question():
+    rows = [
+        {"hl_api_key_id": "key-1", "position_name": "ETH/USDC", "protocol": "uniswap_v3", "network": "arbitrum", "nft_id": 123},
+        {"hl_api_key_id": "key-2", "position_name": "BTC/USDC", "protocol": "aerodrome", "network": "base", "nft_id": "456"},
+    ]
+    supabase = FakeSupabase({"position_configs": rows})
+    usage = fetch_api_key_usage(supabase, "user-1")
+    assert supabase.executed == [("position_configs", None)]
+
+    # API keys list
+    assert usage.is_in_use("key-1") and usage.used_by_position("key-1") == "ETH/USDC"
+    assert not usage.is_in_use("key-3") and usage.used_by_position("key-3") == ""
+
+    # Wallet selector
+    assert usage.used_key_ids() == {"key-1", "key-2"}
+    assert usage.key_for_position("uniswap_v3", "arbitrum", "123") == "key-1"
+
+    # Availability on save
+    assert usage.is_available("key-3")
+    assert not usage.is_available("key-1")
+    assert usage.is_available("key-1", "uniswap_v3", "arbitrum", "123"), "A position keeps its own key"
+    assert not usage.is_available("key-2", "uniswap_v3", "arbitrum", "123")
+
+
+if __name__ == "__main__":
+    test_usage_is_read_once_and_answers_every_question()
+    print("All API key usage tests passed ✓")
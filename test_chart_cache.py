@@ -0,0 +1,50 @@
+"""
+Test incremental chart refresh: only buckets newer than the cursor are fetched (no database needed)
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import web_ui.chart_cache as chart_cache
+
+
+def _point(dt: datetime, lp: float) -> dict:
+    return {'time': dt.isoformat(), 'timestamp': '', 'lp_value_usd': lp, 'hl_account_value': 0.0, 'total_value': lp}
+
+
+def test_incremental_refresh():
+    """Second call should query from the cursor and replace the partial newest bucket"""
+    now = datetime.utcnow().replace(second=0, microsecond=0)
+    calls = []
+
+    def fake_history(position_id, hours, target_points, since=None):
+        calls.append(since)
+        if since is None:
+            return [_point(now - timedelta(minutes=10), 1.0), _point(now - timedelta(minutes=5), 2.0)]
+        return [_point(now - timedelta(minutes=5), 2.5), _point(now, 3.0)]
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(chart_cache, "get_sampled_position_value_history", fake_history)
+        cache = chart_cache.ChartSeriesCache(target_points=500)
+        first = cache.get_series("pos-1", hours=24)
+        second = cache.get_series("pos-1", hours=24)
+
+    print(f"Query cursors: {calls}")
+    assert calls[0] is None, "First load should be a full fetch"
+    assert calls[1] == now - timedelta(minutes=5), "Refresh should start at the newest bucket"
+    assert [p['lp_value_usd'] for p in first] == [1.0, 2.0]
+    assert [p['lp_value_usd'] for p in second] == [1.0, 2.5, 3.0], "Partial bucket should be replaced"
+
+
+def test_ring_buffer_is_bounded():
+    """Old points are evicted once the buffer is full"""
+    series = chart_cache._ChartSeries(maxlen=3)
+    base = datetime(2025, 1, 1)
+    series.merge([_point(base + timedelta(minutes=i), float(i)) for i in range(5)])
+    assert [p['lp_value_usd'] for p in series.points] == [2.0, 3.0, 4.0]
+
+
+if __name__ == "__main__":
+    test_incremental_refresh()
+    test_ring_buffer_is_bounded()
+    print("All chart cache tests passed ✓")
@@ -0,0 +1,62 @@
+"""
+Test the cached cipher, key rotation and lazily decrypted secrets
+"""
+from functools import lru_cache
+
+import pytest
+from cryptography.fernet import Fernet
+
+import web_ui.crypto_utils as crypto_utils
+
+
+def use_keys(monkeypatch, **keys):
+    """Patch crypto_utils key settings, with fresh caches that are discarded along with them"""
+    for name, value in keys.items():
+        monkeypatch.setattr(crypto_utils, name, value)
+    for cached in ("get_cipher", "get_blind_index_key"):
+        monkeypatch.setattr(crypto_utils, cached, lru_cache(maxsize=1)(getattr(crypto_utils, cached).__wrapped__))
+
+
+def test_cached_cipher_rotation_and_lazy_secrets():
+    old_key, new_key = Fernet.generate_key().decode(), Fernet.generate_key().decode()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        use_keys(monkeypatch, ENCRYPTION_KEY=old_key, ENCRYPTION_KEY_PREVIOUS="")
+        stored = crypto_utils.encrypt_value("secret-123")
+        assert crypto_utils.get_cipher() is crypto_utils.get_cipher(), "Cipher is built once"
+
+        # Rotate: new primary key, old one still decrypts
+        use_keys(monkeypatch, ENCRYPTION_KEY=new_key, ENCRYPTION_KEY_PREVIOUS=old_key)
+        assert crypto_utils.decrypt_value(stored) == "secret-123"
+        rotated = crypto_utils.rotate_value(stored)
+        assert Fernet(new_key.encode()).decrypt(rotated.encode()) == b"secret-123"
+
+        secret = crypto_utils.EncryptedSecret(rotated)
+        assert "secret-123" not in repr(secret)
+        assert secret.reveal() == "secret-123"
+        assert not crypto_utils.EncryptedSecret(None) and crypto_utils.EncryptedSecret(None).reveal() == ""
+
+
+def test_blind_index_is_deterministic_and_keyed():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        use_keys(monkeypatch, ENCRYPTION_KEY=Fernet.generate_key().decode(), BLIND_INDEX_KEY="index-key-1")
+        digest = crypto_utils.blind_index("api-key-1")
+        # Same key always maps to the same hash, unlike its Fernet ciphertext
+        assert crypto_utils.blind_index(" api-key-1 ") == digest
+        assert crypto_utils.blind_index("api-key-2") != digest
+
+        # Rotating the encryption key leaves the hashes alone
+        use_keys(monkeypatch, ENCRYPTION_KEY=Fernet.generate_key().decode())
+        assert crypto_utils.blind_index("api-key-1") == digest
+
+        use_keys(monkeypatch, BLIND_INDEX_KEY="index-key-2")
+        assert crypto_utils.blind_index("api-key-1") != digest
+
+        use_keys(monkeypatch, BLIND_INDEX_KEY="")
+        with pytest.raises(ValueError):
+            crypto_utils.blind_index("api-key-1")
+
+
+if __name__ == "__main__":
+    test_cached_cipher_rotation_and_lazy_secrets()
+    test_blind_index_is_deterministic_and_keyed()
+    print("All crypto utils tests passed ✓")
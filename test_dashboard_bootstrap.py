@@ -0,0 +1,45 @@
+"""
+Test the dashboard bootstrap reads: concurrent, one read per table, shared by sections (no Supabase needed)
+"""
+import asyncio
+import time
+
+from fake_supabase import FakeSupabase
+from web_ui.api_key_usage import APIKeyUsage
+from web_ui.dashboard_bootstrap import section_rows, start_dashboard_reads
+
+
+ROWS = {
+    "user_effective_limits": [{"table": "user_effective_limits"}],
+    "user_api_keys": [{"table": "user_api_keys"}],
+    "lp_positions": [{"table": "lp_positions"}],
+    "position_configs": [
+        {"id": "cfg-1", "hl_api_key_id": "key-1", "position_name": "ETH/USDC"},
+        {"id": "cfg-2", "hl_api_key_id": None, "position_name": "BTC/USDC"},
+    ],
+}
+
+
+def test_reads_are_concurrent_and_shared():
+    supabase = FakeSupabase(ROWS, delay=0.2)
+
+    async def scenario():
+        reads = start_dashboard_reads(supabase, "user-1")
+        sections = ("plan", "api_keys", "wallets", "positions")
+        return await asyncio.gather(*(section_rows(reads, section) for section in sections))
+
+    start = time.monotonic()
+    plan, api_keys, wallets, positions = asyncio.run(scenario())
+    elapsed = time.monotonic() - start
+
+    print(f"Loaded {len(supabase.executed)} tables in {elapsed:.2f}s")
+    assert elapsed < 0.6, "Reads should run concurrently"
+    assert sorted(name for name, _ in supabase.executed) == ["lp_positions", "position_configs", "user_api_keys", "user_effective_limits"]
+    assert plan["plan"] == [{"table": "user_effective_limits"}]
+    assert positions["position_configs"] is api_keys["position_configs"] is wallets["position_configs"]
+    assert APIKeyUsage(api_keys["position_configs"]).used_by_position("key-1") == "ETH/USDC"
+
+
+if __name__ == "__main__":
+    test_reads_are_concurrent_and_shared()
+    print("All dashboard bootstrap tests passed ✓")
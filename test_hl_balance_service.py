@@ -0,0 +1,43 @@
+"""
+Test the bulk HL balance service: concurrent fetches, TTL cache and one batch write-back (no network needed)
+"""
+import asyncio
+import time
+
+import pytest
+
+import web_ui.hl_balance_service as balance_service
+from fake_supabase import FakeSupabase
+
+
+def test_refresh_is_concurrent_cached_and_batched():
+    def fake_balance(wallet):
+        time.sleep(0.2)
+        return {'account_value': 100.0, 'margin_used': 0.0, 'notional_pos': 0.0, 'available': 80.0}
+
+    keys = [{"id": f"key-{i}", "exchange": "hyperliquid", "wallet_address": f"0x{i:040x}"} for i in range(6)]
+    keys.append({"id": "key-binance", "exchange": "binance", "wallet_address": "0xabc"})
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(balance_service, "get_hl_account_balance", fake_balance)
+        monkeypatch.setattr(balance_service, "_balance_cache", {})
+        supabase = FakeSupabase()
+        start = time.monotonic()
+        results = asyncio.run(balance_service.refresh_api_key_balances(supabase, keys))
+        elapsed = time.monotonic() - start
+
+        # Second refresh within the TTL is served from cache with nothing to write
+        cached_supabase = FakeSupabase()
+        asyncio.run(balance_service.refresh_api_key_balances(cached_supabase, keys))
+
+    print(f"Fetched {len(results)} balances in {elapsed:.2f}s, writes: {len(supabase.executed)}")
+    assert elapsed < 0.6, "Wallets should be fetched concurrently"
+    assert set(results) == {f"key-{i}" for i in range(6)}, "Non-Hyperliquid accounts are skipped"
+    assert len(supabase.executed) == 1 and supabase.executed[0][0] == "update_api_key_balances"
+    assert len(supabase.executed[0][1]["balances"]) == 6
+    assert cached_supabase.executed == []
+
+
+if __name__ == "__main__":
+    test_refresh_is_concurrent_cached_and_batched()
+    print("All HL balance service tests passed ✓")
@@ -0,0 +1,67 @@
+"""
+Test the shared Hyperliquid market snapshot: one download serves every lookup (no network needed)
+"""
+import threading
+import time
+
+from web_ui.hl_market_snapshot import HLMarketSnapshot
+
+
+class FakeInfo:
+    def __init__(self):
+        self.calls = 0
+
+    def meta_and_asset_ctxs(self):
+        self.calls += 1
+        time.sleep(0.05)  # Slow enough for concurrent callers to pile up
+        return [
+            {'universe': [{'name': 'BTC', 'szDecimals': 5}, {'name': 'ETH', 'szDecimals': 4}]},
+            [{'markPx': '65000.0'}, {'markPx': '3200.5'}],
+        ]
+
+
+def test_single_flight_refresh():
+    """Concurrent lookups on a cold snapshot trigger exactly one download"""
+    snapshot = HLMarketSnapshot(ttl_seconds=60)
+    fake_info = FakeInfo()
+    snapshot._info = fake_info
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(snapshot.get_market('ETH'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"Downloads: {fake_info.calls}, ETH: {results[0]}")
+    assert fake_info.calls == 1
+    assert all(r == {'sz_decimals': 4, 'price': 3200.5} for r in results)
+    assert snapshot.get_market('DOGE') is None
+    assert fake_info.calls == 1, "Misses are answered from the same snapshot"
+
+
+def test_ttl_expiry_refreshes():
+    snapshot = HLMarketSnapshot(ttl_seconds=0)
+    fake_info = FakeInfo()
+    snapshot._info = fake_info
+    snapshot.get_market('BTC')
+    snapshot.get_market('BTC')
+    assert fake_info.calls == 2
+
+
+def test_static_fields_use_long_ttl():
+    """szDecimals lookups don't re-download the universe every price TTL"""
+    snapshot = HLMarketSnapshot(ttl_seconds=0, static_ttl_seconds=3600)
+    fake_info = FakeInfo()
+    snapshot._info = fake_info
+    assert snapshot.get_static('ETH') == {'sz_decimals': 4, 'asset_index': 1}
+    snapshot.get_static('ETH')
+    snapshot.get_static('BTC')
+    assert fake_info.calls == 1
+
+
+if __name__ == "__main__":
+    test_single_flight_refresh()
+    test_ttl_expiry_refreshes()
+    test_static_fields_use_long_ttl()
+    print("All HL market snapshot tests passed ✓")
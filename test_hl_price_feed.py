@@ -0,0 +1,61 @@
+"""
+Test the Hyperliquid price feed against recorded websocket messages (no network needed)
+"""
+from web_ui.hl_price_feed import HLPriceFeed, ReplayPriceSource
+
+
+MESSAGES = [
+    {'channel': 'allMids', 'data': {'mids': {'ETH': '3200.5', 'BTC': '65000.0'}}},
+    {'channel': 'activeAssetCtx', 'data': {'coin': 'ETH', 'ctx': {'markPx': '3199.9', 'funding': '0.0001'}}},
+    {'channel': 'activeAssetCtx', 'data': {'coin': 'SOL', 'ctx': {'markPx': '150.0'}}},
+]
+
+
+def test_replay_prices():
+    """Watched coins use the mark price, everything else the mid"""
+    feed = HLPriceFeed(max_age_seconds=15)
+    source = ReplayPriceSource(MESSAGES)
+    assert feed.start(source)
+    feed.watch('ETH')
+    source.replay()
+
+    print(f"ETH: {feed.get_price('ETH')}, BTC: {feed.get_price('BTC')}, stats: {feed.stats()}")
+    assert feed.get_price('ETH') == 3199.9
+    assert feed.get_price('BTC') == 65000.0
+    assert feed.get_price('SOL') is None, "Unwatched asset contexts are not delivered"
+    assert feed.staleness('ETH') < 1.0
+
+
+def test_stale_prices_fall_back():
+    """Prices older than max_age are reported as missing so callers use REST"""
+    feed = HLPriceFeed(max_age_seconds=0)
+    source = ReplayPriceSource(MESSAGES[:1])
+    feed.start(source)
+    source.replay()
+    assert feed.get_price('ETH') is None
+    assert feed.staleness('ETH') is not None
+
+
+def test_silent_feed_reconnects_with_backoff():
+    """A feed with no messages for reconnect_after_seconds is dropped and restarted later"""
+    feed = HLPriceFeed(max_age_seconds=15, reconnect_after_seconds=0)
+    source = ReplayPriceSource(MESSAGES[:1])
+    assert feed.start(source)
+    feed.watch('ETH')
+    source.replay()
+
+    assert not feed.check_connection(), "Silence past the threshold drops the connection"
+    assert not feed.running and feed.stats()['watched'] == 0
+    assert not feed.start(), "Reconnect waits for the backoff delay"
+
+    new_source = ReplayPriceSource(MESSAGES[:1])
+    assert feed.start(new_source)
+    new_source.replay()
+    assert feed.get_price('ETH') == 3200.5
+
+
+if __name__ == "__main__":
+    test_replay_prices()
+    test_stale_prices_fall_back()
+    test_silent_feed_reconnects_with_backoff()
+    print("All HL price feed tests passed ✓")
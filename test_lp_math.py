@@ -0,0 +1,79 @@
+"""
+Test the vectorized LP math against the scalar/integer versions in blockchain_utils
+"""
+import time
+
+import numpy as np
+
+from web_ui import lp_math
+from web_ui.blockchain_utils import compute_lp_amounts_from_raw_liquidity, compute_lp_state, tick_to_price
+
+
+def test_lp_state_matches_scalar_and_derivatives():
+    L, pa, pb = 5000.0, 1800.0, 2200.0
+    prices = np.linspace(1000.0, 3000.0, 2001)
+    state = lp_math.lp_state(prices, L, pa, pb)
+
+    expected = np.array([compute_lp_state(p, L, pa, pb) for p in prices])
+    assert np.allclose(state.amount0, expected[:, 0])
+    assert np.allclose(state.amount1, expected[:, 1])
+    assert np.allclose(state.value, expected[:, 2])
+    assert np.allclose(state.delta, expected[:, 3])
+
+    # delta and gamma are the price derivatives of value and delta (away from the range bounds)
+    smooth = (np.abs(prices - pa) > 5) & (np.abs(prices - pb) > 5)
+    smooth[[0, -1]] = False
+    assert np.allclose(np.gradient(state.value, prices)[smooth], state.delta[smooth], rtol=1e-3)
+    assert np.allclose(np.gradient(state.delta, prices)[smooth], state.gamma[smooth], rtol=1e-3)
+    assert np.all(state.gamma[prices < pa] == 0) and np.all(state.gamma[prices > pb] == 0)
+
+    assert np.all(lp_math.lp_state(0.0, L, pa, pb).value == 0)
+
+
+def test_portfolio_is_sum_of_positions():
+    prices = np.linspace(1500.0, 2500.0, 101)
+    liquidity, lower, upper = np.array([100.0, 250.0, 40.0]), np.array([1600.0, 1900.0, 2000.0]), np.array([2100.0, 2300.0, 2400.0])
+
+    total = lp_math.portfolio_state(prices, liquidity, lower, upper)
+    expected = sum(lp_math.lp_state(prices, *position).value for position in zip(liquidity, lower, upper))
+    assert total.value.shape == prices.shape
+    assert np.allclose(total.value, expected)
+
+
+def test_tick_conversions_and_raw_amounts():
+    ticks = np.arange(-50000, 50000, 1000)
+    assert np.allclose(lp_math.tick_to_price(ticks), [tick_to_price(int(t)) for t in ticks])
+
+    # Positions below, in and above range against the integer formulas
+    raw_liquidity, tick_lower, tick_upper = 12_345_678_901_234, -200_000, -190_000
+    for current_tick in (-205_000, -195_000, -185_000):
+        sqrt_price_x96 = int(lp_math.tick_to_sqrt_price_x96(current_tick))
+        amount0, amount1 = lp_math.compute_lp_amounts_from_raw_liquidity(
+            raw_liquidity, tick_lower, tick_upper, sqrt_price_x96, 18, 6
+        )
+        exact0, exact1 = compute_lp_amounts_from_raw_liquidity(
+            raw_liquidity, current_tick, tick_lower, tick_upper, sqrt_price_x96, 18, 6
+        )
+        # Integer formulas round down to one raw unit
+        assert np.isclose(amount0, exact0, rtol=1e-9, atol=1e-18)
+        assert np.isclose(amount1, exact1, rtol=1e-9, atol=1e-6)
+
+
+def test_large_grid_is_fast():
+    prices = np.linspace(100.0, 10000.0, 10_000)
+    liquidity = np.full(500, 1000.0)
+    lower, upper = np.linspace(500.0, 5000.0, 500), np.linspace(1000.0, 9000.0, 500)
+
+    start = time.perf_counter()
+    lp_math.portfolio_state(prices, liquidity, lower, upper)
+    elapsed = time.perf_counter() - start
+    print(f"500 positions x 10,000 prices: {elapsed * 1000:.1f}ms")
+    assert elapsed < 5.0
+
+
+if __name__ == "__main__":
+    test_lp_state_matches_scalar_and_derivatives()
+    test_portfolio_is_sum_of_positions()
+    test_tick_conversions_and_raw_amounts()
+    test_large_grid_is_fast()
+    print("All LP math tests passed ✓")
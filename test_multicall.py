@@ -0,0 +1,46 @@
+"""
+Test Multicall3 result decoding and per-call failure tolerance (no RPC needed)
+"""
+import pytest
+from web3 import Web3
+
+import web_ui.multicall as multicall_module
+from web_ui.blockchain_utils import ERC20_ABI, POOL_ABI
+
+
+TOKEN = "0x4200000000000000000000000000000000000006"
+FACTORY = "0x33128a8fC17869897dcE68Ed026d694621f6FDfD"
+
+
+def test_multicall_decodes_and_tolerates_failures():
+    """Successful calls are decoded like .call(), failed ones come back as None"""
+    w3 = Web3()
+    token = w3.eth.contract(address=TOKEN, abi=ERC20_ABI)
+    factory = w3.eth.contract(address=FACTORY, abi=POOL_ABI)
+    calls = [
+        token.functions.symbol(),
+        token.functions.decimals(),
+        factory.functions.getPool(TOKEN, FACTORY, 500),
+    ]
+    pool = "0xd0b53d9277642d899df5c87a3966a349a798f224"
+
+    def fake_aggregate3(w3, chunk):
+        return [
+            (True, w3.codec.encode(["string"], ["WETH"])),
+            (False, b""),
+            (True, w3.codec.encode(["address"], [pool])),
+        ][:len(chunk)]
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(multicall_module, "_aggregate3", fake_aggregate3)
+        results = multicall_module.multicall(w3, calls)
+
+    print(f"Results: {results}")
+    assert results[0] == "WETH"
+    assert results[1] is None, "Failed call should not fail the batch"
+    assert results[2] == Web3.to_checksum_address(pool), "Addresses should be checksummed like .call()"
+
+
+if __name__ == "__main__":
+    test_multicall_decodes_and_tolerates_failures()
+    print("All multicall tests passed ✓")
@@ -0,0 +1,42 @@
+"""
+Test offline pool address resolution (CREATE2 and memoized getPool results)
+"""
+from web_ui.pool_registry import PoolRegistry
+
+
+UNISWAP_FACTORY = "0x1F98431c8aD98523631AE4a59f267346ea31F984"
+BASE_UNISWAP_FACTORY = "0x33128a8fC17869897dcE68Ed026d694621f6FDfD"
+AERODROME_FACTORY = "0x5e7BB104d84c7CB9B682AaC2F3d509f5F406809A"
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+USDC = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+BASE_WETH = "0x4200000000000000000000000000000000000006"
+BASE_USDC = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+
+
+def test_create2_matches_known_pools():
+    """CREATE2 addresses should match the deployed Uniswap V3 pools"""
+    registry = PoolRegistry()
+    mainnet = registry.get("ethereum", UNISWAP_FACTORY, USDC, WETH, 500)
+    base = registry.get("base", BASE_UNISWAP_FACTORY, BASE_WETH, BASE_USDC, 500)
+    print(f"USDC/WETH 0.05%: {mainnet}, Base WETH/USDC 0.05%: {base}")
+    assert mainnet == "0x88e6A0c2dDD26FEEb64F039a2c41296FcB3f5640"
+    assert base == "0xd0b53D9277642d899DF5C87A3966A349A798F224"
+
+
+def test_rpc_results_are_memoized():
+    """Factories without a known init code hash fall back to getPool, then hit the memo"""
+    registry = PoolRegistry()
+    assert registry.get("base", AERODROME_FACTORY, BASE_WETH, BASE_USDC, 100) is None
+
+    pool = "0xb2cc224c1c9feE385f8ad6a55b4d94E92359DC59"
+    registry.set("base", AERODROME_FACTORY, BASE_WETH, BASE_USDC, 100, pool)
+    registry.set("base", AERODROME_FACTORY, BASE_WETH, BASE_USDC, 200, "0x" + "0" * 40)
+    assert registry.get("base", AERODROME_FACTORY, BASE_WETH.lower(), BASE_USDC, 100) == pool
+    assert registry.get("base", AERODROME_FACTORY, BASE_WETH, BASE_USDC, 200) is None, "Zero address must not be cached"
+
+
+if __name__ == "__main__":
+    test_create2_matches_known_pools()
+    test_rpc_results_are_memoized()
+    print("All pool registry tests passed ✓")
@@ -0,0 +1,54 @@
+"""
+Test the shared position refresh scheduler: one query per cycle for all tabs, deltas per subscriber (no QuestDB needed)
+"""
+import asyncio
+
+from web_ui.position_refresh_scheduler import PositionRefreshScheduler
+
+
+def test_tabs_share_one_refresh_and_receive_changes():
+    values = {'pos-a': 100.0, 'pos-b': 200.0, 'pos-c': 300.0}
+    fetches = []
+
+    async def fake_fetch(position_ids):
+        fetches.append(list(position_ids))
+        return {pid: {'latest': {'lp_value_usd': values[pid]}} for pid in position_ids}
+
+    async def scenario():
+        scheduler = PositionRefreshScheduler(interval_seconds=3600, fetch=fake_fetch)
+
+        # Two tabs of the same user plus another user
+        scheduler.subscribe('tab-1', ['pos-a', 'pos-b'])
+        scheduler.subscribe('tab-2', ['pos-a', 'pos-b'])
+        scheduler.subscribe('tab-3', ['pos-c'])
+        version, changed = await scheduler.wait_for_refresh(['pos-a', 'pos-b'], 0, timeout=1)
+        assert fetches == [['pos-a', 'pos-b', 'pos-c']], "Distinct positions are fetched once"
+        assert set(changed) == {'pos-a', 'pos-b'}
+
+        # Only positions whose snapshot changed are delivered
+        values['pos-b'] = 250.0
+        await scheduler.refresh()
+        assert scheduler.changes_since(['pos-a', 'pos-b'], version) == {
+            'pos-b': {'latest': {'lp_value_usd': 250.0}}
+        }
+        assert scheduler.changes_since(['pos-c'], version) == {}
+
+        # Closed tabs stop contributing positions
+        scheduler.unsubscribe('tab-3')
+        await scheduler.refresh()
+        assert fetches[-1] == ['pos-a', 'pos-b']
+        assert scheduler.get_snapshots(['pos-c']) == {}
+
+        scheduler.unsubscribe('tab-1')
+        scheduler.unsubscribe('tab-2')
+        await asyncio.sleep(0)
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    print(f"Queries: {len(fetches)}, stats: {stats}")
+    assert stats['subscribers'] == 0
+
+
+if __name__ == "__main__":
+    test_tabs_share_one_refresh_and_receive_changes()
+    print("All position refresh scheduler tests passed ✓")
@@ -0,0 +1,61 @@
+"""
+Test the position_size_usd write-behind sync: thresholds, coalescing and one batch write (no Supabase needed)
+"""
+from fake_supabase import FakeSupabase
+from web_ui.position_size_sync import PositionSizeSync
+
+
+def test_changes_are_thresholded_coalesced_and_batched():
+    supabase = FakeSupabase()
+    tokens = []
+    sync = PositionSizeSync(
+        interval_seconds=3600, min_change_usd=1.0, min_change_pct=0.5,
+        client_factory=lambda token: tokens.append(token) or supabase,
+    )
+
+    # Dashboard loads record values without writing anything
+    sync.record("user-1", "token-1", "pos-a", 1000.40, 1000.0)  # Below both thresholds
+    sync.record("user-1", "token-1", "pos-b", 1500.0, 1000.0)
+    sync.record("user-1", "token-1", "pos-b", 1600.0, 1000.0)  # Latest value wins
+    sync.record("user-1", "token-2", "pos-c", 50.0, None)
+    assert supabase.executed == []
+    assert sync.pending_count() == 2
+
+    # The client is only built when flushing, from the user's latest token
+    assert sync.flush() == 2
+    assert tokens == ["token-2"]
+    assert supabase.executed == [("update_position_sizes", {"sizes": [
+        {"id": "pos-b", "position_size_usd": 1600.0},
+        {"id": "pos-c", "position_size_usd": 50.0},
+    ]})]
+
+    # A load that read the row before the write landed doesn't queue it again
+    sync.record("user-1", "token-2", "pos-b", 1600.0, 1000.0)
+    assert sync.pending_count() == 0
+    assert sync.flush() == 0
+
+    # Written sizes are forgotten once a load reads them back
+    sync.record("user-1", "token-2", "pos-b", 1600.0, 1600.0)
+    sync.record("user-1", "token-2", "pos-c", 50.0, 50.0)
+    assert not sync._written
+
+
+def test_sizes_with_expired_token_are_dropped():
+    supabase = FakeSupabase()
+    # Expired tokens get no client: nothing is written with elevated privileges
+    sync = PositionSizeSync(interval_seconds=3600, client_factory=lambda token: supabase if token == "fresh" else None)
+
+    sync.record("user-1", "expired", "pos-a", 1500.0, 1000.0)
+    sync.record("user-2", "fresh", "pos-b", 1500.0, 1000.0)
+    assert sync.flush() == 1
+    assert supabase.executed == [("update_position_sizes", {"sizes": [{"id": "pos-b", "position_size_usd": 1500.0}]})]
+
+    # Dropped, not retried; the next dashboard load records it again
+    assert sync.pending_count() == 0
+    assert "pos-a" not in sync._written
+
+
+if __name__ == "__main__":
+    test_changes_are_thresholded_coalesced_and_batched()
+    test_sizes_with_expired_token_are_dropped()
+    print("All position size sync tests passed ✓")
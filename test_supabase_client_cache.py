@@ -0,0 +1,45 @@
+"""
+Test the Supabase client cache: one client per token until it expires, shared HTTP pool (no network needed)
+"""
+import base64
+import json
+import time
+from collections import OrderedDict
+
+import pytest
+
+import web_ui.auth as auth
+
+
+def make_token(expires_in: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": time.time() + expires_in}).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def test_clients_are_cached_per_token_until_expiry():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(auth, "SUPABASE_URL", "https://example.supabase.co")
+        monkeypatch.setattr(auth, "SUPABASE_KEY", make_token(3600))
+        monkeypatch.setattr(auth, "_client_cache", OrderedDict())
+        monkeypatch.setattr(auth, "_anon_client", None)
+
+        token = make_token(3600)
+        client = auth.get_supabase_client(token)
+        assert auth.get_supabase_client(token) is client
+        assert client.postgrest.session.headers["Authorization"] == f"Bearer {token}"
+
+        other = auth.get_supabase_client(make_token(3600))
+        assert other is not client
+        assert other.postgrest.session._transport is client.postgrest.session._transport, "Clients share one pool"
+
+        # Tokens about to expire get a fresh client each time and aren't kept
+        expiring = make_token(5)
+        assert auth.get_supabase_client(expiring) is not auth.get_supabase_client(expiring)
+        assert expiring not in auth._client_cache
+
+        assert auth.get_supabase_client() is auth.get_supabase_client()
+
+
+if __name__ == "__main__":
+    test_clients_are_cached_per_token_until_expiry()
+    print("All Supabase client cache tests passed ✓")
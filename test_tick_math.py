@@ -0,0 +1,57 @@
+"""
+Test the exact TickMath / SqrtPriceMath port against Uniswap's reference values
+"""
+import random
+from decimal import Decimal, getcontext
+
+from web_ui.tick_math import (
+    MAX_SQRT_RATIO, MAX_TICK, MIN_SQRT_RATIO, MIN_TICK, Q96,
+    get_amount0_delta, get_amount1_delta, get_sqrt_ratio_at_tick, get_tick_at_sqrt_ratio,
+)
+
+
+def test_sqrt_ratio_at_tick_bounds_and_precision():
+    assert get_sqrt_ratio_at_tick(MIN_TICK) == MIN_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+    assert get_sqrt_ratio_at_tick(0) == Q96
+
+    getcontext().prec = 80
+    for tick in (1, -1, 50, -50, 100_000, -100_000, 500_000, -500_000):
+        exact = Decimal("1.0001") ** (Decimal(tick) / 2) * Q96
+        assert abs(exact - get_sqrt_ratio_at_tick(tick)) / exact < Decimal("1e-18"), tick
+
+    for bad_tick in (MIN_TICK - 1, MAX_TICK + 1):
+        try:
+            get_sqrt_ratio_at_tick(bad_tick)
+            assert False, "Out of range tick should raise"
+        except ValueError:
+            pass
+
+
+def test_tick_at_sqrt_ratio_round_trips():
+    rng = random.Random(7)
+    ticks = [MIN_TICK, MIN_TICK + 1, -1, 0, 1, MAX_TICK - 1] + [rng.randint(MIN_TICK + 1, MAX_TICK - 1) for _ in range(2000)]
+    for tick in ticks:
+        ratio = get_sqrt_ratio_at_tick(tick)
+        assert get_tick_at_sqrt_ratio(ratio) == tick
+        if tick > MIN_TICK:
+            assert get_tick_at_sqrt_ratio(ratio - 1) == tick - 1
+
+    assert get_tick_at_sqrt_ratio(MAX_SQRT_RATIO - 1) == MAX_TICK - 1
+
+
+def test_amount_deltas_match_sqrt_price_math_vectors():
+    # Price 1 -> 1.21 with 1e18 liquidity (SqrtPriceMath.spec.ts)
+    sqrt_1, sqrt_1_21, liquidity = Q96, 87150978765690771352898345369, 10 ** 18
+    assert get_amount0_delta(sqrt_1, sqrt_1_21, liquidity, round_up=True) == 90909090909090910
+    assert get_amount0_delta(sqrt_1, sqrt_1_21, liquidity) == 90909090909090909
+    assert get_amount1_delta(sqrt_1, sqrt_1_21, liquidity, round_up=True) == 100000000000000000
+    assert get_amount1_delta(sqrt_1_21, sqrt_1, liquidity) == 99999999999999999
+    assert get_amount0_delta(sqrt_1, sqrt_1, liquidity) == 0
+
+
+if __name__ == "__main__":
+    test_sqrt_ratio_at_tick_bounds_and_precision()
+    test_tick_at_sqrt_ratio_round_trips()
+    test_amount_deltas_match_sqrt_price_math_vectors()
+    print("All tick math tests passed ✓")
@@ -0,0 +1,53 @@
+"""
+Test the parsed-once token registry and its mtime-based hot reload (no network needed)
+"""
+import json
+import os
+import tempfile
+
+from web_ui.token_registry import TokenRegistry
+
+
+def _write(path: str, mappings: dict, stablecoins: list, mtime: float):
+    with open(path, 'w') as f:
+        json.dump({'mappings': mappings, 'stablecoins': stablecoins}, f)
+    os.utime(path, (mtime, mtime))
+
+
+def test_hot_reload_on_mtime_change():
+    """Indexes are reused until the file's mtime changes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'token_mapping.json')
+        _write(path, {'weth': 'ETH'}, ['usdc'], mtime=1000)
+
+        registry = TokenRegistry(path, check_seconds=0)
+        first = registry.get()
+        assert first.mappings['WETH'] == 'ETH', "Keys should be uppercased"
+        assert 'USDC' in first.stablecoins
+        assert registry.get() is first, "Unchanged file should not be re-parsed"
+
+        _write(path, {'WETH': 'ETH', 'WHYPE': 'HYPE'}, ['USDC', 'USDT'], mtime=2000)
+        second = registry.get()
+        print(f"Reloaded mappings: {dict(second.mappings)}")
+        assert second is not first
+        assert second.mappings['WHYPE'] == 'HYPE'
+        assert 'USDT' in second.stablecoins
+
+
+def test_bad_edit_keeps_last_good_version():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'token_mapping.json')
+        _write(path, {'WBTC': 'BTC'}, ['DAI'], mtime=1000)
+        registry = TokenRegistry(path, check_seconds=0)
+        assert registry.get().mappings['WBTC'] == 'BTC'
+
+        with open(path, 'w') as f:
+            f.write('{"mappings": ')  # Half-written file
+        os.utime(path, (2000, 2000))
+        assert registry.get().mappings['WBTC'] == 'BTC'
+
+
+if __name__ == "__main__":
+    test_hot_reload_on_mtime_change()
+    test_bad_edit_keeps_last_good_version()
+    print("All token registry tests passed ✓")
@@ -0,0 +1,54 @@
+"""
+Test RPC failover and circuit breaking in the pooled Web3 provider (no network needed)
+"""
+import pytest
+import requests
+
+import web_ui.web3_provider_pool as provider_pool
+
+
+class FakeProvider:
+    def __init__(self, fail: bool):
+        self.fail = fail
+        self.calls = 0
+
+    def make_request(self, method, params):
+        self.calls += 1
+        if self.fail:
+            raise requests.exceptions.ConnectionError("connection refused")
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
+
+
+def test_failover_and_circuit_breaker():
+    """A failing endpoint is retried, then its circuit opens and traffic goes to the healthy one"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(provider_pool, "RPC_BACKOFF_SECONDS", 0)
+        provider = provider_pool.PooledHTTPProvider(["https://bad.example", "https://good.example"], max_retries=2)
+        bad, good = provider.endpoints
+        bad.provider, good.provider = FakeProvider(fail=True), FakeProvider(fail=False)
+
+        # Only the bad endpoint: it's tried once per request, never retried on itself
+        provider.endpoints = [bad]
+        for expected_calls in range(1, provider_pool.RPC_CIRCUIT_FAILURE_THRESHOLD + 2):
+            try:
+                provider.make_request("eth_blockNumber", [])
+                assert False, "Expected RPCEndpointError"
+            except provider_pool.RPCEndpointError:
+                pass
+            # Once the circuit is open, requests fail without calling the endpoint
+            assert bad.provider.calls == min(expected_calls, provider_pool.RPC_CIRCUIT_FAILURE_THRESHOLD)
+
+        provider.endpoints = [bad, good]
+        for _ in range(10):
+            assert provider.make_request("eth_blockNumber", [])["result"] == "0x1"
+
+    stats = {s['endpoint']: s for s in provider.stats()}
+    print(f"Endpoint stats: {stats}")
+    assert bad.provider.calls == provider_pool.RPC_CIRCUIT_FAILURE_THRESHOLD, "Open circuit should stop traffic"
+    assert stats['bad.example']['circuit'] == 'open'
+    assert stats['good.example']['requests'] == 10
+    assert stats['good.example']['errors'] == 0
+
+if __name__ == "__main__":
+    test_failover_and_circuit_breaker()
+    print("All Web3 provider pool tests passed ✓")
@@ -7,7 +7,7 @@ import sys
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 import stripe
-from supabase import create_client
+from ..auth import get_supabase_client
 
 router = APIRouter()
 
@@ -59,10 +59,7 @@ async def process_payment(request: ProcessPaymentRequest):
         sys.stdout.flush()
         
         # Update database
-        supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_KEY")
-        )
+        supabase = get_supabase_client()
         
         # Get tier details
         tier_result = supabase.table("plan_tiers").select("*").eq("tier_name", tier_name).execute()
@@ -4,8 +4,7 @@ Only syncs subscription status to local database
 Billing history is handled by Stripe Customer Portal
 """
 from typing import Dict, Any
-from supabase import create_client
-import os
+from ..auth import get_service_client
 from datetime import datetime
 
 
@@ -146,16 +145,13 @@ def process_stripe_webhook(event: Dict[str, Any]) -> bool:
     Returns:
         True if processed successfully, False otherwise
     """
-    # Initialize Supabase client
-    supabase_url = os.getenv("SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_SERVICE_KEY")  # Use service key for admin operations
-    
-    if not supabase_url or not supabase_key:
+    # Shared Supabase client with the service role key for admin operations
+    try:
+        supabase = get_service_client()
+    except ValueError:
         print("❌ Supabase credentials not configured")
         return False
     
-    supabase = create_client(supabase_url, supabase_key)
-    
     event_type = event["type"]
     
     try:
@@ -8,7 +8,7 @@ from pydantic import BaseModel
 import stripe
 import os
 import sys
-from supabase import create_client
+from ..auth import get_supabase_client
 from ..services.stripe_service import verify_webhook_signature
 from .stripe_webhook import process_stripe_webhook
 
@@ -115,10 +115,7 @@ async def process_payment(request: ProcessPaymentRequest):
         sys.stdout.flush()
         
         # Update database
-        supabase = create_client(
-            os.getenv("SUPABASE_URL"),
-            os.getenv("SUPABASE_KEY")
-        )
+        supabase = get_supabase_client()
         
         # Get tier details
         tier_result = supabase.table("plan_tiers").select("*").eq("tier_name", tier_name).execute()
@@ -1,21 +1,19 @@
 import reflex as rx
 from pydantic import BaseModel
 from .auth import get_supabase_client
-from .crypto_utils import encrypt_value, decrypt_value
-from .hl_utils import get_hl_account_balance
+from .crypto_utils import EncryptedSecret, blind_index, encrypt_value
+from .hl_balance_service import refresh_api_key_balances
 from .address_utils import normalize_address_for_storage
+from .api_key_usage import APIKeyUsage, fetch_api_key_usage
 
 
 class APIKeyData(BaseModel):
     id: str
     account_name: str
     exchange: str
-    api_key: str = ""
-    api_secret: str
     is_master_account: bool = True
     wallet_address: str = ""
     subaccount_name: str = ""
-    private_key: str = ""
     notes: str = ""
     is_active: bool = True
     created_at: str = ""
@@ -42,6 +40,8 @@ class APIKeyState(rx.State):
     is_loading: bool = False
     loading_key_id: str = ""  # Track which key is being operated on
     _save_form_data: dict = {}  # Temporary storage for save form data
+    # key id -> {"api_key", "api_secret", "private_key"} ciphertext, decrypted only on edit
+    _secrets: dict = {}
     error_message: str = ""
     success_message: str = ""
     show_api_secret: bool = False
@@ -102,15 +102,27 @@ class APIKeyState(rx.State):
         # Find and populate form data
         key_data = next((k for k in self.api_keys if k.id == key_id), None)
         if key_data:
+            # Stored credentials are only decrypted when the account is opened for editing
+            secrets = self._secrets.get(key_id, {})
+            try:
+                api_key = EncryptedSecret(secrets.get("api_key")).reveal()
+                api_secret = EncryptedSecret(secrets.get("api_secret")).reveal()
+                private_key = EncryptedSecret(secrets.get("private_key")).reveal()
+            except Exception as e:
+                print(f"Error decrypting trading account {key_id}: {e}")
+                self.loading_key_id = ""
+                self.error_message = "Could not decrypt this trading account's credentials."
+                return rx.toast.error("Could not decrypt trading account credentials", duration=4000)
+            
             self.selected_key_id = key_id
             self.account_name = key_data.account_name
             self.exchange = key_data.exchange
-            self.api_key = key_data.api_key
-            self.api_secret = key_data.api_secret
+            self.api_key = api_key
+            self.api_secret = api_secret
             self.is_master_account = key_data.is_master_account
             self.wallet_address = key_data.wallet_address
             self.subaccount_name = key_data.subaccount_name
-            self.private_key = key_data.private_key
+            self.private_key = private_key
             self.notes = key_data.notes
             self.is_editing = True
         
@@ -139,39 +151,15 @@ class APIKeyState(rx.State):
             supabase = get_supabase_client(auth_state.access_token)
             response = supabase.table("user_api_keys").select("*").eq("user_id", auth_state.user_id).order("created_at", desc=True).execute()
             
-            if response.data:
-                self.api_keys = []
-                for key_data in response.data:
-                    # Check if this API key is used by any position
-                    try:
-                        position_response = supabase.table("position_configs").select("position_name").eq("hl_api_key_id", key_data["id"]).execute()
-                        used_by_position = position_response.data[0]["position_name"] if position_response.data else ""
-                        is_in_use = len(position_response.data) > 0
-                    except Exception as e:
-                        # If position_configs table doesn't exist or query fails, assume not in use
-                        print(f"Warning: Could not check API key usage: {e}")
-                        used_by_position = ""
-                        is_in_use = False
-                    
-                    decrypted_key = APIKeyData(
-                        id=key_data["id"],
-                        account_name=key_data["account_name"],
-                        exchange=key_data["exchange"],
-                        api_key=decrypt_value(key_data["api_key"]) if key_data.get("api_key") else "",
-                        api_secret=decrypt_value(key_data["api_secret"]),
-                        is_master_account=key_data.get("is_master_account", True),
-                        wallet_address=key_data.get("wallet_address", ""),
-                        subaccount_name=key_data.get("subaccount_name", ""),
-                        private_key=decrypt_value(key_data["private_key"]) if key_data.get("private_key") else "",
-                        notes=key_data.get("notes", ""),
-                        is_active=key_data.get("is_active", True),
-                        created_at=key_data["created_at"],
-                        is_in_use=is_in_use,
-                        used_by_position=used_by_position,
-                    )
-                    self.api_keys.append(decrypted_key)
-            else:
-                self.api_keys = []
+            # Check which API keys are used by positions (one query for all keys)
+            try:
+                key_usage = fetch_api_key_usage(supabase, auth_state.user_id)
+            except Exception as e:
+                # If position_configs table doesn't exist or query fails, assume not in use
+                print(f"Warning: Could not check API key usage: {e}")
+                key_usage = APIKeyUsage([])
+            
+            self._set_api_keys(response.data or [], key_usage)
             
             # Update overview stats
             await self._update_overview_stats()
@@ -190,6 +178,42 @@ class APIKeyState(rx.State):
         finally:
             self.is_loading = False
     
+    def _set_api_keys(self, rows: list, key_usage: APIKeyUsage):
+        """
+        Load user_api_keys rows into api_keys.
+        
+        Credentials stay encrypted in _secrets (backend only) until edit_api_key.
+        
+        Args:
+            rows: user_api_keys rows
+            key_usage: Which positions use each key
+        """
+        self.api_keys = []
+        self._secrets = {}
+        for key_data in rows:
+            used_by_position = key_usage.used_by_position(key_data["id"])
+            is_in_use = key_usage.is_in_use(key_data["id"])
+            
+            key = APIKeyData(
+                id=key_data["id"],
+                account_name=key_data["account_name"],
+                exchange=key_data["exchange"],
+                is_master_account=key_data.get("is_master_account", True),
+                wallet_address=key_data.get("wallet_address", ""),
+                subaccount_name=key_data.get("subaccount_name", ""),
+                notes=key_data.get("notes", ""),
+                is_active=key_data.get("is_active", True),
+                created_at=key_data["created_at"],
+                is_in_use=is_in_use,
+                used_by_position=used_by_position,
+            )
+            self.api_keys.append(key)
+            self._secrets[key_data["id"]] = {
+                "api_key": key_data.get("api_key") or "",
+                "api_secret": key_data.get("api_secret") or "",
+                "private_key": key_data.get("private_key") or "",
+            }
+    
     async def _update_overview_stats(self):
         """Update overview statistics after loading API keys"""
         try:
@@ -255,26 +279,21 @@ class APIKeyState(rx.State):
                     key_data.balance_loading = False
                     return
                 
-                # Fetch balance using wallet address only (read-only query)
-                balance_info = get_hl_account_balance(key_data.wallet_address)
+                # Fetch balance using wallet address only (read-only query), saved to the database
+                from web_ui.state import AuthState
+                auth_state = await self.get_state(AuthState)
+                supabase = get_supabase_client(auth_state.access_token)
+                balances = await refresh_api_key_balances(
+                    supabase,
+                    [{"id": key_data.id, "exchange": key_data.exchange, "wallet_address": key_data.wallet_address}],
+                    force=True,
+                )
+                balance_info = balances.get(key_data.id)
                 
                 if balance_info:
                     key_data.account_value = balance_info['account_value']
                     key_data.available_balance = balance_info['available']
                     
-                    # Save balance to database
-                    try:
-                        from web_ui.state import AuthState
-                        auth_state = await self.get_state(AuthState)
-                        supabase = get_supabase_client(auth_state.access_token)
-                        
-                        supabase.table("user_api_keys").update({
-                            "account_value": balance_info['account_value'],
-                            "available_balance": balance_info['available']
-                        }).eq("id", key_data.id).execute()
-                    except Exception as e:
-                        print(f"Failed to save balance to database: {e}")
-                    
                     yield rx.toast.success(f"Balance fetched for {key_data.account_name}", duration=3000)
                 else:
                     # Check if it's likely an invalid API key/wallet
@@ -297,6 +316,59 @@ class APIKeyState(rx.State):
                 key_data.balance_error = f"Error: {str(e)}"
                 yield rx.toast.error(f"Error fetching balance: {str(e)}", duration=5000)
     
+    def check_all_balances(self):
+        """Immediate feedback handler for refreshing every Hyperliquid account's balance"""
+        hl_keys = [k for k in self.api_keys if k.exchange.lower() == "hyperliquid" and k.wallet_address]
+        if not hl_keys:
+            return rx.toast.info("No Hyperliquid accounts with a wallet address", duration=3000)
+        
+        for key_data in hl_keys:
+            key_data.balance_loading = True
+            key_data.balance_error = ""
+        
+        return [
+            rx.toast.info(f"Fetching balances for {len(hl_keys)} accounts...", duration=5000),
+            APIKeyState.check_all_balances_worker
+        ]
+    
+    async def check_all_balances_worker(self):
+        """Async worker: fetch all loading balances concurrently and save them in one batch"""
+        loading_keys = [k for k in self.api_keys if k.balance_loading]
+        if not loading_keys:
+            return
+        
+        try:
+            from web_ui.state import AuthState
+            auth_state = await self.get_state(AuthState)
+            supabase = get_supabase_client(auth_state.access_token)
+            
+            balances = await refresh_api_key_balances(
+                supabase,
+                [{"id": k.id, "exchange": k.exchange, "wallet_address": k.wallet_address} for k in loading_keys],
+                force=True,
+            )
+            
+            failed = 0
+            for key_data in loading_keys:
+                balance_info = balances.get(key_data.id)
+                if balance_info:
+                    key_data.account_value = balance_info['account_value']
+                    key_data.available_balance = balance_info['available']
+                else:
+                    key_data.balance_error = "Invalid API key or wallet"
+                    failed += 1
+                key_data.balance_loading = False
+            
+            if failed:
+                yield rx.toast.warning(f"Could not fetch {failed} of {len(loading_keys)} balances", duration=5000)
+            else:
+                yield rx.toast.success(f"Balances fetched for {len(loading_keys)} accounts", duration=3000)
+        
+        except Exception as e:
+            for key_data in loading_keys:
+                key_data.balance_loading = False
+            yield rx.toast.error(f"Error fetching balances: {str(e)}", duration=5000)
+    
     def save_api_keys_handler(self, form_data: dict):
         """Immediate feedback handler for saving API keys"""
         # Validation
@@ -367,13 +439,18 @@ class APIKeyState(rx.State):
             
             supabase = get_supabase_client(auth_state.access_token)
             encrypted_key = encrypt_value(api_key) if api_key else None
+            api_key_hash = blind_index(api_key) if api_key else None
             encrypted_secret = encrypt_value(api_secret)
             encrypted_private_key = encrypt_value(private_key) if private_key else None
             
-            # Check for duplicate API key for this user (when creating new)
-            if not self.is_editing and encrypted_key:
+            # Check for duplicate API key for this user via the blind index
+            # (Fernet ciphertext is randomized, so it can't be compared directly)
+            if api_key_hash:
                 print(f"[SAVE API KEY] Checking for duplicate API key for user {auth_state.user_id}", flush=True)
-                duplicate_check = supabase.table("user_api_keys").select("id,account_name").eq("user_id", auth_state.user_id).eq("api_key", encrypted_key).execute()
+                duplicate_query = supabase.table("user_api_keys").select("id,account_name").eq("user_id", auth_state.user_id).eq("api_key_hash", api_key_hash)
+                if self.is_editing and self.selected_key_id:
+                    duplicate_query = duplicate_query.neq("id", self.selected_key_id)
+                duplicate_check = duplicate_query.limit(1).execute()
                 
                 if duplicate_check.data:
                     existing_account = duplicate_check.data[0]["account_name"]
@@ -391,6 +468,7 @@ class APIKeyState(rx.State):
                 "account_name": account_name,
                 "exchange": exchange,
                 "api_key": encrypted_key,
+                "api_key_hash": api_key_hash,
                 "api_secret": encrypted_secret,
                 "is_master_account": is_master_account,
                 "wallet_address": normalized_wallet_address,
@@ -413,6 +491,13 @@ class APIKeyState(rx.State):
             self.clear_form()
             
         except Exception as e:
+            # Unique index on (user_id, api_key_hash) catches a duplicate saved concurrently
+            if "23505" in str(e) or "duplicate key" in str(e).lower():
+                self.error_message = "This trading account is already added"
+                yield rx.toast.error("This trading account already exists", duration=5000)
+                return
+            # e.g. ENCRYPTION_KEY or BLIND_INDEX_KEY missing from the environment
+            print(f"[SAVE API KEY ERROR] Exception: {e}", flush=True)
             self.error_message = "Failed to save trading account. Please try again."
             yield rx.toast.error("Failed to save trading account. Please try again.", duration=5000)
         finally:
@@ -0,0 +1,77 @@
+"""
+Which positions use each trading account
+
+The API keys list (is_in_use/used_by_position), the wallet selector and the
+availability check on save all need the same relation between user_api_keys
+and position_configs. It's read with one query per user (or built from
+position_configs rows that were already fetched) instead of one query per key.
+"""
+from typing import Dict, List, Optional, Set
+
+
+USAGE_COLUMNS = "hl_api_key_id,position_name,protocol,network,nft_id"
+
+
+def _same_position(config: Dict, protocol: str, network: str, nft_id) -> bool:
+    return (config.get("protocol") == protocol and config.get("network") == network
+            and str(config.get("nft_id")) == str(nft_id))
+
+
+class APIKeyUsage:
+    """
+    Trading account id -> position_configs rows using it.
+
+    Args:
+        config_rows: position_configs rows (need hl_api_key_id, position_name, protocol, network, nft_id)
+    """
+
+    def __init__(self, config_rows: List[Dict]):
+        self._positions: Dict[str, List[Dict]] = {}
+        for config in config_rows:
+            key_id = config.get("hl_api_key_id")
+            if key_id:
+                self._positions.setdefault(key_id, []).append(config)
+
+    def used_key_ids(self) -> Set[str]:
+        return set(self._positions)
+
+    def is_in_use(self, key_id: str) -> bool:
+        return key_id in self._positions
+
+    def used_by_position(self, key_id: str) -> str:
+        """Name of the (first) position using the key, or '' if unused"""
+        positions = self._positions.get(key_id)
+        return positions[0].get("position_name", "") if positions else ""
+
+    def key_for_position(self, protocol: str, network: str, nft_id) -> Optional[str]:
+        """Trading account assigned to a position, identified by (protocol, network, nft_id)"""
+        for key_id, positions in self._positions.items():
+            if any(_same_position(config, protocol, network, nft_id) for config in positions):
+                return key_id
+        return None
+
+    def is_available(self, key_id: str, protocol: str = "", network: str = "", nft_id=None) -> bool:
+        """
+        Whether a trading account can be assigned to a position.
+
+        Args:
+            key_id: Trading account id
+            protocol, network, nft_id: Position being edited (its own key stays available);
+                leave empty for a new position
+        """
+        positions = self._positions.get(key_id)
+        if not positions:
+            return True
+        if protocol and network and nft_id:
+            return any(_same_position(config, protocol, network, nft_id) for config in positions)
+        return False
+
+
+def fetch_api_key_usage(supabase, user_id: str) -> APIKeyUsage:
+    """Read a user's trading account usage with a single position_configs query"""
+    response = supabase.table("position_configs")\
+        .select(USAGE_COLUMNS)\
+        .eq("user_id", user_id)\
+        .not_.is_("hl_api_key_id", "null")\
+        .execute()
+    return APIKeyUsage(response.data or [])
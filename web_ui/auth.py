@@ -1,43 +1,150 @@
+import base64
+import json
 import os
 import sys
-from supabase import create_client, Client
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+from postgrest import SyncPostgrestClient
+from supabase import Client
 from dotenv import load_dotenv
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
+# Service role key bypasses RLS - only for server-side payment/webhook handling
+SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_SERVICE_KEY", "")
 
-def get_supabase_client(access_token: str = "") -> Client:
-    print(f"[SUPABASE] Creating Supabase client", flush=True)
-    sys.stdout.flush()
-    print(f"[SUPABASE]   - URL configured: {bool(SUPABASE_URL)}", flush=True)
-    sys.stdout.flush()
-    print(f"[SUPABASE]   - Key configured: {bool(SUPABASE_KEY)}", flush=True)
-    sys.stdout.flush()
-    
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        print("[SUPABASE ERROR] Missing credentials!", flush=True)
-        sys.stdout.flush()
-        raise ValueError("Supabase credentials not configured. Please set SUPABASE_URL and SUPABASE_KEY in .env file")
-    
+# Per-token clients kept alive between calls
+SUPABASE_CLIENT_CACHE_SIZE = int(os.getenv("SUPABASE_CLIENT_CACHE_SIZE", "256"))
+# Tokens without an exp claim are re-checked after this long
+SUPABASE_CLIENT_DEFAULT_TTL_SECONDS = float(os.getenv("SUPABASE_CLIENT_DEFAULT_TTL_SECONDS", "3600"))
+SUPABASE_HTTP_MAX_CONNECTIONS = int(os.getenv("SUPABASE_HTTP_MAX_CONNECTIONS", "100"))
+
+# Drop cached clients this long before their JWT expires
+TOKEN_EXPIRY_LEEWAY_SECONDS = 30
+
+# One connection pool shared by every client's PostgREST session
+_shared_transport = httpx.HTTPTransport(
+    http2=True,
+    limits=httpx.Limits(max_connections=SUPABASE_HTTP_MAX_CONNECTIONS, max_keepalive_connections=20),
+)
+
+
+class _PooledPostgrestClient(SyncPostgrestClient):
+    """PostgREST client whose session uses the shared connection pool"""
+
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None) -> httpx.Client:
+        return httpx.Client(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            transport=_shared_transport,
+        )
+
+
+class _PooledClient(Client):
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout=None, verify=True, proxy=None):
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        return _PooledPostgrestClient(rest_url, headers=headers, schema=schema, **kwargs)
+
+
+def _token_expiry(access_token: str) -> float:
+    """Unix time the JWT expires (exp claim, not verified - only used for cache eviction)"""
     try:
-        client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        print("[SUPABASE] ✓ Client created successfully", flush=True)
-        sys.stdout.flush()
-        
+        payload = access_token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except Exception:
+        return time.time() + SUPABASE_CLIENT_DEFAULT_TTL_SECONDS
+
+
+_client_cache: "OrderedDict[str, tuple]" = OrderedDict()  # access token -> (client, expires_at)
+_anon_client: Optional[Client] = None
+_service_client: Optional[Client] = None
+_cache_lock = threading.Lock()
+
+
+def _create_client(key: str, access_token: str = "") -> Client:
+    try:
+        client = _PooledClient.create(SUPABASE_URL, key)
         # Set the JWT token in postgrest headers for RLS to work
         if access_token:
-            print("[SUPABASE] Setting JWT token for RLS enforcement", flush=True)
-            sys.stdout.flush()
-            # Set the Authorization header with the JWT token
             client.postgrest.auth(access_token)
-        
         return client
     except Exception as e:
         print(f"[SUPABASE ERROR] Failed to create client: {e}", flush=True)
-        sys.stdout.flush()
         import traceback
         traceback.print_exc()
         sys.stdout.flush()
         raise
+
+
+def get_supabase_client(access_token: str = "") -> Client:
+    """
+    Supabase client for a user's access token (or the anon client without one).
+
+    Clients are cached per token until shortly before the token expires, and
+    all of them share one HTTP connection pool. Use get_auth_client() for
+    auth calls, which must not run on a shared client.
+    """
+    global _anon_client
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("[SUPABASE ERROR] Missing credentials!", flush=True)
+        raise ValueError("Supabase credentials not configured. Please set SUPABASE_URL and SUPABASE_KEY in .env file")
+
+    with _cache_lock:
+        if not access_token:
+            if _anon_client is None:
+                _anon_client = _create_client(SUPABASE_KEY)
+            return _anon_client
+
+        now = time.time()
+        cached = _client_cache.get(access_token)
+        if cached and now < cached[1] - TOKEN_EXPIRY_LEEWAY_SECONDS:
+            _client_cache.move_to_end(access_token)
+            return cached[0]
+
+        # Evict expired clients and the least recently used beyond the cache size
+        for token in [t for t, (_, expires_at) in _client_cache.items() if now >= expires_at - TOKEN_EXPIRY_LEEWAY_SECONDS]:
+            del _client_cache[token]
+        client = _create_client(SUPABASE_KEY, access_token)
+        expires_at = _token_expiry(access_token)
+        if now < expires_at - TOKEN_EXPIRY_LEEWAY_SECONDS:
+            _client_cache[access_token] = (client, expires_at)
+            while len(_client_cache) > SUPABASE_CLIENT_CACHE_SIZE:
+                _client_cache.popitem(last=False)
+        return client
+
+
+def get_auth_client() -> Client:
+    """
+    New anon client for sign-in/verify/sign-out flows.
+
+    Auth calls store the user's session on the client they run on, so these
+    must never go through a shared client.
+    """
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("[SUPABASE ERROR] Missing credentials!", flush=True)
+        raise ValueError("Supabase credentials not configured. Please set SUPABASE_URL and SUPABASE_KEY in .env file")
+    return _create_client(SUPABASE_KEY)
+
+
+def get_service_client() -> Client:
+    """Process-wide Supabase client using the service role key (bypasses RLS)"""
+    global _service_client
+
+    if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
+        raise ValueError("Supabase service role not configured. Please set SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in .env file")
+
+    with _cache_lock:
+        if _service_client is None:
+            _service_client = _create_client(SUPABASE_SERVICE_ROLE_KEY)
+        return _service_client
@@ -0,0 +1,99 @@
+"""
+Cache for position entry baselines (first hedge_state row per position)
+
+The first hedge_state row of a position never changes, so it only needs to be
+read from QuestDB once. Baselines are kept in memory and, when
+BASELINE_CACHE_PATH is set, persisted to a small JSON file so they survive
+restarts. Entries are keyed by position_configs.id.
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional
+
+
+class BaselineCache:
+    """
+    In-memory baseline cache with optional JSON persistence.
+
+    Args:
+        path: JSON file to persist baselines to, or None for memory only
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._baselines: Dict[str, Dict] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        """Load the JSON store on first access (lock must be held)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._baselines.update(data)
+        except Exception as e:
+            print(f"Warning: Could not load baseline cache from {self.path}: {e}")
+
+    def _persist(self):
+        """Write the cache to disk atomically (lock must be held)"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(self._baselines, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Warning: Could not persist baseline cache to {self.path}: {e}")
+
+    def get(self, position_id: str) -> Optional[Dict]:
+        """Return the cached baseline for a position, or None on a miss"""
+        with self._lock:
+            self._ensure_loaded()
+            baseline = self._baselines.get(position_id)
+            return dict(baseline) if baseline else None
+
+    def get_many(self, position_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Return cached baselines for the given positions (misses are omitted)"""
+        with self._lock:
+            self._ensure_loaded()
+            return {
+                pid: dict(self._baselines[pid])
+                for pid in position_ids
+                if pid in self._baselines
+            }
+
+    def set_many(self, baselines: Dict[str, Dict]):
+        """Store baselines (only positions that already have a first row)"""
+        baselines = {pid: dict(b) for pid, b in baselines.items() if b}
+        if not baselines:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            self._baselines.update(baselines)
+            self._persist()
+
+    def set(self, position_id: str, baseline: Dict):
+        self.set_many({position_id: baseline})
+
+    def invalidate(self, position_id: str):
+        """Forget a position's baseline (e.g. when the position is deleted or re-created)"""
+        if not position_id:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            if self._baselines.pop(position_id, None) is not None:
+                self._persist()
+
+
+baseline_cache = BaselineCache(os.getenv('BASELINE_CACHE_PATH') or None)
@@ -1,6 +1,7 @@
 """Utilities for fetching Uniswap V3 position data from blockchain"""
+import asyncio
 from web3 import Web3
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import os
 import math
 
@@ -49,6 +50,27 @@ POSITION_MANAGER_ABI = [
     }
 ]
 
+# ERC721Enumerable functions of the position managers, for listing a wallet's NFTs
+POSITION_MANAGER_ENUMERABLE_ABI = [
+    {
+        "inputs": [{"internalType": "address", "name": "owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"internalType": "address", "name": "owner", "type": "address"},
+            {"internalType": "uint256", "name": "index", "type": "uint256"},
+        ],
+        "name": "tokenOfOwnerByIndex",
+        "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
 # Minimal ERC20 ABI for getting token symbols
 ERC20_ABI = [
     {
@@ -142,36 +164,25 @@ FEE_TO_TICK_SPACING = {
 
 
 def get_web3(network: str) -> Optional[Web3]:
-    """Get Web3 instance for the specified network"""
+    """
+    Get the shared Web3 instance for the specified network
+    
+    NETWORK_RPCS values may list several comma-separated URLs; requests are
+    spread over them with retry/failover (see web3_provider_pool). No
+    is_connected() probe - connection errors surface on the first real call.
+    """
     rpc_url = NETWORK_RPCS.get(network.lower())
     if not rpc_url:
         return None
     
     try:
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
-        if not w3.is_connected():
-            print(f"Failed to connect to {network} RPC")
-            return None
-        return w3
+        from .web3_provider_pool import web3_provider_manager
+        return web3_provider_manager.get_web3(network, rpc_url)
     except Exception as e:
         print(f"Error connecting to {network}: {e}")
         return None
 
 
-def get_token_symbol(w3: Web3, token_address: str) -> str:
-    """Get token symbol from contract"""
-    try:
-        token_contract = w3.eth.contract(
-            address=Web3.to_checksum_address(token_address),
-            abi=ERC20_ABI
-        )
-        symbol = token_contract.functions.symbol().call()
-        return symbol
-    except Exception as e:
-        print(f"Error getting token symbol for {token_address}: {e}")
-        return token_address[:8]  # Return shortened address as fallback
-
-
 def fee_to_percentage(fee: int) -> str:
     """Convert fee tier to integer basis points (not percentage string)"""
     # Return as string integer, not percentage
@@ -184,24 +195,21 @@ def tick_to_price(tick: int) -> float:
 
 
 def tick_to_sqrt_price_x96(tick: int) -> int:
-    """Convert tick to sqrtPriceX96 using Uniswap V3 formula"""
-    return int((1.0001 ** (tick / 2)) * (2 ** 96))
+    """Convert tick to sqrtPriceX96 (exact TickMath.getSqrtRatioAtTick)"""
+    from .tick_math import get_sqrt_ratio_at_tick
+    return get_sqrt_ratio_at_tick(tick)
 
 
 def calculate_amount0_from_liquidity(liquidity: int, sqrt_price_a_x96: int, sqrt_price_b_x96: int) -> int:
-    """Calculate amount0 (token0) from liquidity using Uniswap V3 formula"""
-    if sqrt_price_a_x96 > sqrt_price_b_x96:
-        sqrt_price_a_x96, sqrt_price_b_x96 = sqrt_price_b_x96, sqrt_price_a_x96
-    numerator = (liquidity << 96) * (sqrt_price_b_x96 - sqrt_price_a_x96)
-    denominator = sqrt_price_b_x96 * sqrt_price_a_x96
-    return numerator // denominator
+    """Calculate amount0 (token0) from liquidity, rounded down as LiquidityAmounts.getAmount0ForLiquidity"""
+    from .tick_math import get_amount0_delta
+    return get_amount0_delta(sqrt_price_a_x96, sqrt_price_b_x96, liquidity)
 
 
 def calculate_amount1_from_liquidity(liquidity: int, sqrt_price_a_x96: int, sqrt_price_b_x96: int) -> int:
-    """Calculate amount1 (token1) from liquidity using Uniswap V3 formula"""
-    if sqrt_price_a_x96 > sqrt_price_b_x96:
-        sqrt_price_a_x96, sqrt_price_b_x96 = sqrt_price_b_x96, sqrt_price_a_x96
-    return (liquidity * (sqrt_price_b_x96 - sqrt_price_a_x96)) >> 96
+    """Calculate amount1 (token1) from liquidity, rounded down as LiquidityAmounts.getAmount1ForLiquidity"""
+    from .tick_math import get_amount1_delta
+    return get_amount1_delta(sqrt_price_a_x96, sqrt_price_b_x96, liquidity)
 
 
 def compute_lp_amounts_from_raw_liquidity(
@@ -249,6 +257,7 @@ def compute_lp_state(p: float, L: float, pa: float, pb: float) -> tuple:
     """
     Compute LP position state (token amounts, value, delta) at a given price.
     Copied from modulesv5/lp_calculations.py
+    For arrays of prices/positions use lp_math.lp_state.
     
     Returns: (x, y, v, delta) where:
         - x: token0 amount
@@ -264,13 +273,15 @@ def compute_lp_state(p: float, L: float, pa: float, pb: float) -> tuple:
     sqrt_p = math.sqrt(p)
 
     if p < pa:
-        y_full = L * (sqrt_pb - sqrt_pa)
-        v = y_full
-        return 0.0, y_full, v, 0.0
-    elif p > pb:
+        # Below range: entirely token0
         x_full = L * (1 / sqrt_pa - 1 / sqrt_pb)
         v = x_full * p
         return x_full, 0.0, v, x_full
+    elif p > pb:
+        # Above range: entirely token1
+        y_full = L * (sqrt_pb - sqrt_pa)
+        v = y_full
+        return 0.0, y_full, v, 0.0
     else:
         x = L * (1 / sqrt_p - 1 / sqrt_pb)
         y = L * (sqrt_p - sqrt_pa)
@@ -297,139 +308,290 @@ POOL_SLOT0_ABI = [{
 }]
 
 
-async def fetch_uniswap_position(network: str, nft_id: str) -> Dict[str, str]:
+def read_positions_onchain(network: str, nft_ids: List[str], protocol: str = "uniswap_v3") -> Dict[str, Dict]:
     """
-    Fetch Uniswap V3 position data from blockchain
-    
+    Read raw position state for many NFT IDs with Multicall3.
+
+    Uses three aggregated round trips regardless of how many positions are
+    requested: positions() for every NFT, then symbol/decimals/getPool for the
+    distinct tokens and pools, then slot0 for the distinct pools. Token
+    metadata comes from token_metadata_cache and pool addresses from
+    pool_registry where possible, so a known pair needs no symbol/decimals or
+    getPool calls at all.
+
     Args:
-        network: Network name (ethereum, arbitrum, base, polygon, optimism)
-        nft_id: NFT token ID
-        
+        network: Network name
+        nft_ids: NFT token IDs to read
+        protocol: 'uniswap_v3', 'project_x' or 'aerodrome_slipstream'
+
     Returns:
-        Dictionary with position data
+        Dictionary keyed by NFT ID (as str). Each value holds token0/token1,
+        fee, ticks, liquidity, token symbols/decimals, pool_address,
+        sqrt_price_x96 and current_tick - or just {"error": ...} if that
+        position couldn't be read.
     """
-    try:
-        # Get Web3 instance
-        w3 = get_web3(network)
-        if not w3:
-            raise Exception(f"Could not connect to {network} network")
-        
-        # Get position manager contract
+    from .multicall import multicall
+    from .pool_registry import pool_registry
+    from .token_metadata_cache import token_metadata_cache
+
+    is_aerodrome = protocol == "aerodrome_slipstream"
+    if is_aerodrome:
+        if network.lower() != "base":
+            raise Exception(f"Aerodrome Slipstream is only available on Base network")
+        manager_address = AERODROME_POSITION_MANAGER_ADDRESSES.get(network.lower())
+        factory_address = AERODROME_FACTORY_ADDRESSES.get(network.lower())
+        factory_abi = AERODROME_FACTORY_ABI
+        slot0_abi = AERODROME_POOL_SLOT0_ABI  # Different from Uniswap V3
+        if not manager_address:
+            raise Exception(f"Aerodrome position manager not found for {network}")
+        if not factory_address:
+            raise Exception(f"Aerodrome factory not found for {network}")
+    else:
         manager_address = POSITION_MANAGER_ADDRESSES.get(network.lower())
+        factory_address = FACTORY_ADDRESSES.get(network.lower())
+        factory_abi = POOL_ABI
+        slot0_abi = POOL_SLOT0_ABI
         if not manager_address:
             raise Exception(f"Position manager not found for {network}")
-        
-        position_manager = w3.eth.contract(
-            address=Web3.to_checksum_address(manager_address),
-            abi=POSITION_MANAGER_ABI
-        )
-        
-        # Fetch position data
-        position_data = position_manager.functions.positions(int(nft_id)).call()
-        
-        # Parse position data
-        (nonce, operator, token0, token1, fee, tick_lower, tick_upper, 
+
+    w3 = get_web3(network)
+    if not w3:
+        raise Exception(f"Could not connect to {network} network")
+
+    nft_ids = [str(nft_id) for nft_id in nft_ids]
+    results: Dict[str, Dict] = {}
+
+    # Round trip 1: positions() for every NFT
+    position_manager = w3.eth.contract(
+        address=Web3.to_checksum_address(manager_address),
+        abi=POSITION_MANAGER_ABI  # Same ABI for Aerodrome
+    )
+    raw_positions = multicall(w3, [position_manager.functions.positions(int(nft_id)) for nft_id in nft_ids])
+
+    positions = {}
+    for nft_id, position_data in zip(nft_ids, raw_positions):
+        if position_data is None:
+            results[nft_id] = {"error": f"Position #{nft_id} not found on {network}"}
+            continue
+        (nonce, operator, token0, token1, fee, tick_lower, tick_upper,
          liquidity, fee_growth_0, fee_growth_1, tokens_owed_0, tokens_owed_1) = position_data
-        
-        # Get token info (symbol and decimals)
-        token0_symbol = get_token_symbol(w3, token0)
-        token1_symbol = get_token_symbol(w3, token1)
-        
-        # Get token decimals
-        try:
-            token0_contract = w3.eth.contract(address=Web3.to_checksum_address(token0), abi=ERC20_ABI)
-            token0_decimals = token0_contract.functions.decimals().call()
-        except:
-            token0_decimals = 18
-        
-        try:
-            token1_contract = w3.eth.contract(address=Web3.to_checksum_address(token1), abi=ERC20_ABI)
-            token1_decimals = token1_contract.functions.decimals().call()
-        except:
-            token1_decimals = 18
-        
-        # Get pool address from factory
-        factory_address = FACTORY_ADDRESSES.get(network.lower())
-        if factory_address:
-            factory = w3.eth.contract(
-                address=Web3.to_checksum_address(factory_address),
-                abi=POOL_ABI
-            )
-            pool_address = factory.functions.getPool(
+
+        # Aerodrome pools are keyed by tickSpacing instead of fee
+        pool_key = fee
+        if is_aerodrome:
+            pool_key = FEE_TO_TICK_SPACING.get(fee)
+            if not pool_key:
+                results[nft_id] = {"error": f"Unknown fee tier {fee} - cannot determine tickSpacing"}
+                continue
+
+        positions[nft_id] = {
+            "token0": token0,
+            "token1": token1,
+            "fee": fee,
+            "tick_lower": tick_lower,
+            "tick_upper": tick_upper,
+            "liquidity": liquidity,
+            "pool_key": (token0, token1, pool_key, fee),
+        }
+
+    # Round trip 2: symbol/decimals for uncached tokens, getPool for unresolved pools
+    tokens = sorted({p["token0"] for p in positions.values()} | {p["token1"] for p in positions.values()})
+    pool_keys = sorted({p["pool_key"] for p in positions.values()}) if factory_address else []
+
+    token_info = token_metadata_cache.get_many(network, tokens)
+    missing_tokens = [token for token in tokens if token not in token_info]
+
+    pool_addresses = {}
+    for token0, token1, pool_key, fee in pool_keys:
+        pool_address = pool_registry.get(network, factory_address, token0, token1, pool_key)
+        if pool_address:
+            pool_addresses[(token0, token1, pool_key, fee)] = pool_address
+    missing_pools = [key for key in pool_keys if key not in pool_addresses]
+
+    calls = []
+    for token in missing_tokens:
+        token_contract = w3.eth.contract(address=Web3.to_checksum_address(token), abi=ERC20_ABI)
+        calls.append(token_contract.functions.symbol())
+        calls.append(token_contract.functions.decimals())
+    if missing_pools:
+        factory = w3.eth.contract(address=Web3.to_checksum_address(factory_address), abi=factory_abi)
+        for token0, token1, pool_key, fee in missing_pools:
+            calls.append(factory.functions.getPool(
                 Web3.to_checksum_address(token0),
                 Web3.to_checksum_address(token1),
-                fee
-            ).call()
+                pool_key
+            ))
+    outputs = multicall(w3, calls) if calls else []
+
+    fetched_tokens = {}
+    for i, token in enumerate(missing_tokens):
+        symbol, decimals = outputs[2 * i], outputs[2 * i + 1]
+        if symbol is not None and decimals is not None:
+            fetched_tokens[token] = {"symbol": symbol, "decimals": decimals}
+        else:
+            # Not cached, so it's retried on the next fetch
+            print(f"Error getting token metadata for {token}")
+            token_info[token] = {
+                "symbol": symbol if symbol is not None else token[:8],  # Shortened address as fallback
+                "decimals": decimals if decimals is not None else 18,
+            }
+    token_metadata_cache.set_many(network, fetched_tokens)
+    token_info.update(fetched_tokens)
+    for key, pool_address in zip(missing_pools, outputs[2 * len(missing_tokens):]):
+        token0, token1, pool_key, fee = key
+        pool_registry.set(network, factory_address, token0, token1, pool_key, pool_address)
+        pool_addresses[key] = pool_address
+
+    # Round trip 3: slot0 for each distinct pool
+    pools = sorted({
+        address for address in pool_addresses.values()
+        if address and int(address, 16) != 0
+    })
+    slot0s = {}
+    if pools:
+        slot0_calls = [
+            w3.eth.contract(address=Web3.to_checksum_address(pool), abi=slot0_abi).functions.slot0()
+            for pool in pools
+        ]
+        slot0s = dict(zip(pools, multicall(w3, slot0_calls)))
+
+    for nft_id, position in positions.items():
+        if factory_address:
+            pool_address = pool_addresses.get(position["pool_key"])
+            if pool_address is None:
+                results[nft_id] = {"error": f"Could not look up pool for position #{nft_id}"}
+                continue
         else:
             pool_address = "Unknown"
-        
-        # Format fee tier
-        fee_tier = fee_to_percentage(fee)
-        
-        # Get pool's current price from slot0
-        current_price = 0.0
-        current_tick = 0
+
         sqrt_price_x96 = 0
-        current_price_raw = 0
-        try:
-            pool_contract = w3.eth.contract(
-                address=Web3.to_checksum_address(pool_address),
-                abi=POOL_SLOT0_ABI
-            )
-            slot0 = pool_contract.functions.slot0().call()
+        current_tick = 0
+        slot0 = slot0s.get(pool_address)
+        if slot0:
             sqrt_price_x96 = slot0[0]
             current_tick = slot0[1]
-            current_price_raw = (sqrt_price_x96 / (2**96)) ** 2
-        except Exception as e:
-            print(f"Error fetching pool price: {e}")
-        
-        # Adjust for token decimals - applies to current_price, pa, and pb
-        decimal_adjustment = 10 ** (token1_decimals - token0_decimals)
-        current_price = current_price_raw / decimal_adjustment
-        
-        # Calculate price bounds from ticks (adjusted for decimals)
-        pa_raw = tick_to_price(tick_lower)
-        pb_raw = tick_to_price(tick_upper)
-        pa = pa_raw / decimal_adjustment
-        pb = pb_raw / decimal_adjustment
-        
-        # Calculate actual token amounts using Uniswap V3 formulas
-        token0_amount_actual = 0.0
-        token1_amount_actual = 0.0
-        if sqrt_price_x96 > 0:
-            try:
-                token0_amount_actual, token1_amount_actual = compute_lp_amounts_from_raw_liquidity(
-                    raw_liquidity=liquidity,
-                    current_tick=current_tick,
-                    tick_lower=tick_lower,
-                    tick_upper=tick_upper,
-                    sqrt_price_x96=sqrt_price_x96,
-                    token0_decimals=token0_decimals,
-                    token1_decimals=token1_decimals
-                )
-            except Exception as e:
-                print(f"Error calculating token amounts: {e}")
-        
-        base_result = {
-            "network": network,
-            "nft_id": nft_id,
+        else:
+            print(f"Error fetching pool price for {pool_address}")
+
+        position.pop("pool_key")
+        position.update({
+            "token0_symbol": token_info[position["token0"]]["symbol"],
+            "token1_symbol": token_info[position["token1"]]["symbol"],
+            "token0_decimals": token_info[position["token0"]]["decimals"],
+            "token1_decimals": token_info[position["token1"]]["decimals"],
             "pool_address": pool_address,
-            "token0_symbol": token0_symbol,
-            "token1_symbol": token1_symbol,
-            "token0_decimals": token0_decimals,
-            "token1_decimals": token1_decimals,
-            "fee_tier": fee_tier,
-            "position_name": f"{network.title()} {token0_symbol}/{token1_symbol} Position #{nft_id}",
-            "liquidity": str(liquidity),
-            "tick_lower": tick_lower,
-            "tick_upper": tick_upper,
+            "sqrt_price_x96": sqrt_price_x96,
             "current_tick": current_tick,
-            "current_price": current_price,
-            "pa": pa,
-            "pb": pb,
-            "token0_amount": token0_amount_actual,
-            "token1_amount": token1_amount_actual,
-        }
+        })
+        results[nft_id] = position
+
+    return results
+
+
+def read_position_onchain(network: str, nft_id: str, protocol: str = "uniswap_v3") -> Dict:
+    """Read a single position's raw state (see read_positions_onchain), raising if it can't be read"""
+    position = read_positions_onchain(network, [nft_id], protocol)[str(nft_id)]
+    if "error" in position:
+        raise Exception(position["error"])
+    return position
+
+
+def summarize_position(network: str, nft_id: str, chain_data: Dict) -> Dict:
+    """
+    Position fields derived from raw read_positions_onchain data.
+
+    Shared by the add-position fetchers and wallet discovery, so a position
+    shows the same prices, range and amounts however it was found.
+
+    Args:
+        network: Network name
+        nft_id: NFT token ID
+        chain_data: One position from read_positions_onchain
+
+    Returns:
+        Dictionary with pool/token details, current_price, pa, pb,
+        token0_amount, token1_amount and in_range
+    """
+    tick_lower = chain_data["tick_lower"]
+    tick_upper = chain_data["tick_upper"]
+    current_tick = chain_data["current_tick"]
+    liquidity = chain_data["liquidity"]
+    token0_symbol = chain_data["token0_symbol"]
+    token1_symbol = chain_data["token1_symbol"]
+    token0_decimals = chain_data["token0_decimals"]
+    token1_decimals = chain_data["token1_decimals"]
+    sqrt_price_x96 = chain_data["sqrt_price_x96"]
+    
+    # Adjust for token decimals - applies to current_price, pa, and pb
+    decimal_adjustment = 10 ** (token1_decimals - token0_decimals)
+    
+    # Calculate actual token amounts using Uniswap V3 formulas
+    token0_amount, token1_amount = 0.0, 0.0
+    if sqrt_price_x96 > 0:
+        try:
+            token0_amount, token1_amount = compute_lp_amounts_from_raw_liquidity(
+                raw_liquidity=liquidity,
+                current_tick=current_tick,
+                tick_lower=tick_lower,
+                tick_upper=tick_upper,
+                sqrt_price_x96=sqrt_price_x96,
+                token0_decimals=token0_decimals,
+                token1_decimals=token1_decimals
+            )
+        except Exception as e:
+            print(f"Error calculating token amounts: {e}")
+    
+    return {
+        "network": network,
+        "nft_id": nft_id,
+        "position_name": f"{network.title()} {token0_symbol}/{token1_symbol} Position #{nft_id}",
+        "pool_address": chain_data["pool_address"],
+        "token0_address": chain_data["token0"],
+        "token1_address": chain_data["token1"],
+        "token0_symbol": token0_symbol,
+        "token1_symbol": token1_symbol,
+        "token0_decimals": token0_decimals,
+        "token1_decimals": token1_decimals,
+        "fee_tier": fee_to_percentage(chain_data["fee"]),
+        "liquidity": str(liquidity),
+        "tick_lower": tick_lower,
+        "tick_upper": tick_upper,
+        "current_tick": current_tick,
+        # Pool's current price from slot0
+        "current_price": (sqrt_price_x96 / (2**96)) ** 2 / decimal_adjustment,
+        "pa": tick_to_price(tick_lower) / decimal_adjustment,
+        "pb": tick_to_price(tick_upper) / decimal_adjustment,
+        "token0_amount": token0_amount,
+        "token1_amount": token1_amount,
+        "in_range": tick_lower <= current_tick <= tick_upper,
+    }
+
+
+async def fetch_uniswap_position(network: str, nft_id: str) -> Dict[str, str]:
+    """
+    Fetch Uniswap V3 position data from blockchain
+    
+    Args:
+        network: Network name (ethereum, arbitrum, base, polygon, optimism)
+        nft_id: NFT token ID
+        
+    Returns:
+        Dictionary with position data
+    """
+    try:
+        # Read position, tokens, pool and slot0 in batched Multicall3 round trips
+        # (in an executor - the RPC calls block and would stall the event loop)
+        chain_data = await asyncio.get_running_loop().run_in_executor(
+            None, read_position_onchain, network, nft_id, "uniswap_v3"
+        )
+        base_result = summarize_position(network, nft_id, chain_data)
+        token0_symbol = base_result["token0_symbol"]
+        token1_symbol = base_result["token1_symbol"]
+        current_price = base_result["current_price"]
+        pa = base_result["pa"]
+        pb = base_result["pb"]
+        token0_amount_actual = base_result["token0_amount"]
+        token1_amount_actual = base_result["token1_amount"]
         
         # Try to get USD values and metadata from Hyperliquid
         try:
@@ -480,7 +642,7 @@ async def fetch_uniswap_position(network: str, nft_id: str) -> Dict[str, str]:
                 token1_pct = round((token1_amount_usd / position_value_usd * 100), 1) if position_value_usd > 0 else 0.0
                 
                 # Calculate delta (for hedging) - this is just token0 amount for in-range positions
-                delta = token0_amount_rounded if current_tick >= tick_lower and current_tick <= tick_upper else 0.0
+                delta = token0_amount_rounded if base_result["in_range"] else 0.0
                 
                 # Prepare hedge_tokens JSONB data
                 hedge_tokens = {
@@ -514,7 +676,6 @@ async def fetch_uniswap_position(network: str, nft_id: str) -> Dict[str, str]:
                     "delta": delta,
                     "hl_price_available": True,
                     "hedge_tokens": hedge_tokens,  # JSONB data for database
-                    "in_range": current_tick >= tick_lower and current_tick <= tick_upper,
                 })
             else:
                 # Missing prices for non-stablecoin tokens
@@ -554,132 +715,20 @@ async def fetch_aerodrome_position(network: str, nft_id: str) -> Dict[str, str]:
         Dictionary with position data
     """
     try:
-        # Validate network
-        if network.lower() != "base":
-            raise Exception(f"Aerodrome Slipstream is only available on Base network")
-        
-        # Get Web3 instance
-        w3 = get_web3(network)
-        if not w3:
-            raise Exception(f"Could not connect to {network} network")
-        
-        # Get position manager contract
-        manager_address = AERODROME_POSITION_MANAGER_ADDRESSES.get(network.lower())
-        if not manager_address:
-            raise Exception(f"Aerodrome position manager not found for {network}")
-        
-        position_manager = w3.eth.contract(
-            address=Web3.to_checksum_address(manager_address),
-            abi=POSITION_MANAGER_ABI  # Same ABI as Uniswap V3
-        )
-        
-        # Fetch position data
-        position_data = position_manager.functions.positions(int(nft_id)).call()
-        
-        # Parse position data (same structure as Uniswap V3)
-        (nonce, operator, token0, token1, fee, tick_lower, tick_upper, 
-         liquidity, fee_growth_0, fee_growth_1, tokens_owed_0, tokens_owed_1) = position_data
-        
-        # Get token info
-        token0_symbol = get_token_symbol(w3, token0)
-        token1_symbol = get_token_symbol(w3, token1)
-        
-        # Get token decimals
-        try:
-            token0_contract = w3.eth.contract(address=Web3.to_checksum_address(token0), abi=ERC20_ABI)
-            token0_decimals = token0_contract.functions.decimals().call()
-        except:
-            token0_decimals = 18
-        
-        try:
-            token1_contract = w3.eth.contract(address=Web3.to_checksum_address(token1), abi=ERC20_ABI)
-            token1_decimals = token1_contract.functions.decimals().call()
-        except:
-            token1_decimals = 18
-        
-        # Get pool address from Aerodrome factory (uses tickSpacing instead of fee)
-        factory_address = AERODROME_FACTORY_ADDRESSES.get(network.lower())
-        if not factory_address:
-            raise Exception(f"Aerodrome factory not found for {network}")
-        
-        # Convert fee to tickSpacing
-        tick_spacing = FEE_TO_TICK_SPACING.get(fee)
-        if not tick_spacing:
-            raise Exception(f"Unknown fee tier {fee} - cannot determine tickSpacing")
-        
-        factory = w3.eth.contract(
-            address=Web3.to_checksum_address(factory_address),
-            abi=AERODROME_FACTORY_ABI
+        # Read position, tokens, pool and slot0 in batched Multicall3 round trips
+        # (pool lookup uses tickSpacing and Aerodrome's slot0 layout), in an
+        # executor - the RPC calls block and would stall the event loop
+        chain_data = await asyncio.get_running_loop().run_in_executor(
+            None, read_position_onchain, network, nft_id, "aerodrome_slipstream"
         )
-        pool_address = factory.functions.getPool(
-            Web3.to_checksum_address(token0),
-            Web3.to_checksum_address(token1),
-            tick_spacing
-        ).call()
-        
-        # Format fee tier
-        fee_tier = fee_to_percentage(fee)
-        
-        # Get pool's current price from slot0 (Aerodrome has different slot0 structure)
-        current_price = 0.0
-        current_tick = 0
-        sqrt_price_x96 = 0
-        current_price_raw = 0
-        try:
-            pool_contract = w3.eth.contract(
-                address=Web3.to_checksum_address(pool_address),
-                abi=AERODROME_POOL_SLOT0_ABI  # Different from Uniswap V3
-            )
-            slot0 = pool_contract.functions.slot0().call()
-            sqrt_price_x96 = slot0[0]
-            current_tick = slot0[1]
-            current_price_raw = (sqrt_price_x96 / (2**96)) ** 2
-        except Exception as e:
-            print(f"Error fetching pool price: {e}")
-        
-        # Adjust for token decimals
-        decimal_adjustment = 10 ** (token1_decimals - token0_decimals)
-        current_price = current_price_raw / decimal_adjustment
-        
-        # Calculate price bounds from ticks
-        pa_raw = 1.0001 ** tick_lower
-        pb_raw = 1.0001 ** tick_upper
-        pa = pa_raw / decimal_adjustment
-        pb = pb_raw / decimal_adjustment
-        
-        # Calculate token amounts using Uniswap V3 formulas
-        token0_amount_actual, token1_amount_actual = compute_lp_amounts_from_raw_liquidity(
-            raw_liquidity=liquidity,
-            current_tick=current_tick,
-            tick_lower=tick_lower,
-            tick_upper=tick_upper,
-            sqrt_price_x96=sqrt_price_x96,
-            token0_decimals=token0_decimals,
-            token1_decimals=token1_decimals
-        )
-        
-        # Generate position name (matching Uniswap V3 format)
-        position_name = f"{network.title()} {token0_symbol}/{token1_symbol} Position #{nft_id}"
-        
-        # Base result with blockchain data
-        base_result = {
-            "position_name": position_name,
-            "pool_address": pool_address,
-            "token0_address": token0,
-            "token1_address": token1,
-            "token0_symbol": token0_symbol,
-            "token1_symbol": token1_symbol,
-            "token0_decimals": token0_decimals,
-            "token1_decimals": token1_decimals,
-            "fee_tier": fee_tier,
-            "tick_lower": tick_lower,
-            "tick_upper": tick_upper,
-            "current_tick": current_tick,
-            "liquidity": str(liquidity),
-            "current_price": current_price,
-            "pa": pa,
-            "pb": pb,
-        }
+        base_result = summarize_position(network, nft_id, chain_data)
+        token0_symbol = base_result["token0_symbol"]
+        token1_symbol = base_result["token1_symbol"]
+        current_price = base_result["current_price"]
+        pa = base_result["pa"]
+        pb = base_result["pb"]
+        token0_amount_actual = base_result["token0_amount"]
+        token1_amount_actual = base_result["token1_amount"]
         
         # Try to get USD values from Hyperliquid
         try:
@@ -729,7 +778,7 @@ async def fetch_aerodrome_position(network: str, nft_id: str) -> Dict[str, str]:
                 token1_pct = round((token1_amount_usd / position_value_usd * 100), 1) if position_value_usd > 0 else 0.0
                 
                 # Calculate delta
-                delta = token0_amount_rounded if current_tick >= tick_lower and current_tick <= tick_upper else 0.0
+                delta = token0_amount_rounded if base_result["in_range"] else 0.0
                 
                 # Prepare hedge_tokens JSONB data
                 hedge_tokens = {
@@ -763,7 +812,6 @@ async def fetch_aerodrome_position(network: str, nft_id: str) -> Dict[str, str]:
                     "delta": delta,
                     "hl_price_available": True,
                     "hedge_tokens": hedge_tokens,
-                    "in_range": current_tick >= tick_lower and current_tick <= tick_upper,
                 })
             else:
                 # Missing prices
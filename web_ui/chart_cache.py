@@ -0,0 +1,112 @@
+"""
+Incremental cache for position value chart series
+
+Keeps a bounded ring buffer of downsampled points per (position, resolution)
+together with a cursor (start of the newest bucket). Refreshing a chart only
+queries QuestDB for buckets at or after the cursor instead of rescanning the
+whole window.
+"""
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .questdb_utils import (
+    CHART_TARGET_POINTS,
+    choose_sample_interval,
+    get_sampled_position_value_history,
+)
+
+
+class _ChartSeries:
+    """Ring buffer of chart points for one (position, resolution)"""
+
+    def __init__(self, maxlen: int):
+        self.points = deque(maxlen=maxlen)
+        self.window_hours = 0.0  # Longest window this buffer has been filled for
+        self.lock = threading.Lock()
+
+    @property
+    def cursor(self) -> Optional[datetime]:
+        """Start time of the newest bucket, or None if empty"""
+        if not self.points:
+            return None
+        return datetime.fromisoformat(self.points[-1]['time'])
+
+    def merge(self, new_points: List[Dict]):
+        """Append new buckets, replacing the (possibly partial) newest one"""
+        for point in new_points:
+            if self.points and self.points[-1]['time'] >= point['time']:
+                if self.points[-1]['time'] == point['time']:
+                    self.points[-1] = point
+                continue
+            self.points.append(point)
+
+
+class ChartSeriesCache:
+    """
+    Process-wide cache of downsampled chart series.
+
+    Args:
+        target_points: Points per window, also the ring buffer size
+        max_series: Least recently used series beyond this are evicted
+    """
+
+    def __init__(self, target_points: int = CHART_TARGET_POINTS, max_series: int = 256):
+        self.target_points = target_points
+        self.max_series = max_series
+        self._series: "OrderedDict[Tuple[str, str], _ChartSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_series(self, key: Tuple[str, str]) -> _ChartSeries:
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # +1 so a full window plus the in-progress bucket fits
+                series = _ChartSeries(maxlen=self.target_points + 1)
+                self._series[key] = series
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+            return series
+
+    def get_series(self, position_id: str, hours: int = 24) -> List[Dict]:
+        """
+        Get chart points for the last `hours`, fetching only buckets newer than the cursor.
+
+        Args:
+            position_id: The position ID to chart
+            hours: Window length in hours
+
+        Returns:
+            List of chart point dicts (see get_sampled_position_value_history)
+        """
+        _, sample_unit = choose_sample_interval(hours, self.target_points)
+        series = self._get_series((position_id, sample_unit))
+
+        with series.lock:
+            cursor = series.cursor
+            if cursor is None or hours > series.window_hours:
+                # Cold (or wider window than cached): full fetch for the window
+                points = get_sampled_position_value_history(position_id, hours, self.target_points)
+                series.points.clear()
+                series.merge(points)
+                series.window_hours = hours
+            else:
+                # Warm: re-read the newest bucket (it may have been partial) and anything after it
+                new_points = get_sampled_position_value_history(
+                    position_id, hours, self.target_points, since=cursor
+                )
+                series.merge(new_points)
+
+            window_start = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
+            return [point for point in series.points if point['time'] >= window_start]
+
+    def invalidate(self, position_id: str):
+        """Drop all cached series for a position"""
+        with self._lock:
+            for key in [k for k in self._series if k[0] == position_id]:
+                del self._series[key]
+
+
+chart_series_cache = ChartSeriesCache()
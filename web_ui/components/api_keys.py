@@ -180,6 +180,16 @@ def api_keys_component() -> rx.Component:
                 rx.hstack(
                     rx.heading("Trading Accounts", size="6"),
                     rx.spacer(),
+                    rx.cond(
+                        APIKeyState.api_keys.length() > 1,
+                        rx.button(
+                            "Check All Balances",
+                            size="2",
+                            variant="soft",
+                            color_scheme="green",
+                            on_click=APIKeyState.check_all_balances,
+                        ),
+                    ),
                     rx.cond(
                         APIKeyState.is_editing,
                         rx.button(
@@ -570,12 +570,6 @@ def lp_positions_component() -> rx.Component:
         # Position value chart dialog
         position_value_chart(),
         
-        # Auto-refresh position status every 60 seconds
-        rx.moment(
-            interval=60000,  # 60 seconds
-            on_change=LPPositionState.refresh_position_status,
-        ),
-        
         rx.box(
             rx.vstack(
                 rx.hstack(
@@ -46,22 +46,9 @@ class PlanStatusState(rx.State):
             result = supabase.table("user_effective_limits").select("*").eq("user_id", user_id).execute()
             
             if result.data and len(result.data) > 0:
-                plan = result.data[0]
-                self.tier_name = plan.get("tier_name", "free")
-                self.display_name = plan.get("display_name", "Free")
-                self.price_monthly = plan.get("price_monthly", 0.0)
-                self.tvl_limit = plan.get("effective_tvl_limit")
-                self.position_limit = plan.get("effective_position_limit")
-                self.rebalance_frequency = plan.get("effective_rebalance_frequency", "standard")
-                self.has_tvl_override = plan.get("override_tvl_limit") is not None
-                self.has_position_override = plan.get("override_position_limit") is not None
-                self.is_beta_tester = plan.get("is_beta_tester", False)
+                self._set_plan(result.data[0])
             
-            # Sync usage data from OverviewState
-            from ..overview_state import OverviewState
-            overview_state = await self.get_state(OverviewState)
-            self.current_tvl = overview_state.total_value
-            self.current_positions = overview_state.total_positions
+            await self.sync_usage()
             
             # Mark as loaded for dashboard loading state
             from ..dashboard_loading_state import DashboardLoadingState
@@ -76,6 +63,25 @@ class PlanStatusState(rx.State):
             dashboard_loading = await self.get_state(DashboardLoadingState)
             dashboard_loading.mark_plan_data_loaded()
     
+    def _set_plan(self, plan: dict):
+        """Apply a user_effective_limits row"""
+        self.tier_name = plan.get("tier_name", "free")
+        self.display_name = plan.get("display_name", "Free")
+        self.price_monthly = plan.get("price_monthly", 0.0)
+        self.tvl_limit = plan.get("effective_tvl_limit")
+        self.position_limit = plan.get("effective_position_limit")
+        self.rebalance_frequency = plan.get("effective_rebalance_frequency", "standard")
+        self.has_tvl_override = plan.get("override_tvl_limit") is not None
+        self.has_position_override = plan.get("override_position_limit") is not None
+        self.is_beta_tester = plan.get("is_beta_tester", False)
+    
+    async def sync_usage(self):
+        """Sync usage data from OverviewState"""
+        from ..overview_state import OverviewState
+        overview_state = await self.get_state(OverviewState)
+        self.current_tvl = overview_state.total_value
+        self.current_positions = overview_state.total_positions
+    
     def navigate_to_manage_plan(self):
         """Navigate to manage plan section in dashboard"""
         # Import here to avoid circular dependency
@@ -53,8 +53,14 @@ def overview_section() -> rx.Component:
 
 
 def lp_positions_section() -> rx.Component:
+    from ..lp_position_state import LPPositionState
     from .lp_positions import lp_positions_component
-    return lp_positions_component()
+    return rx.fragment(
+        lp_positions_component(),
+        # Position status updates from the shared refresh scheduler, only while this section is shown
+        on_mount=LPPositionState.watch_position_updates,
+        on_unmount=LPPositionState.stop_position_updates,
+    )
 
 
 def settings_section() -> rx.Component:
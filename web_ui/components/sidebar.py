@@ -86,10 +86,7 @@ def sidebar_item(label: str, section: str, icon: str = "circle") -> rx.Component
 
 def sidebar() -> rx.Component:
     from ..dashboard_loading_state import DashboardLoadingState
-    from ..components.plan_status import PlanStatusState
     from ..pages.manage_plan import ManagePlanState
-    from ..api_key_state import APIKeyState
-    from ..lp_position_state import LPPositionState
     
     return rx.box(
         rx.vstack(
@@ -182,11 +179,7 @@ def sidebar() -> rx.Component:
         top="0",
         background=COLORS.BACKGROUND_SURFACE,
         on_mount=[
-            DashboardLoadingState.reset_loading,
-            PlanStatusState.load_plan_data,
+            DashboardLoadingState.bootstrap_dashboard,
             ManagePlanState.load_plan_data,
-            APIKeyState.load_api_keys,
-            LPPositionState.load_positions,
-            LPPositionState.load_wallets,
         ],
     )
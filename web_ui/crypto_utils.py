@@ -1,20 +1,71 @@
+import hashlib
+import hmac
 import os
-from cryptography.fernet import Fernet
+from functools import lru_cache
+from typing import Optional
+from cryptography.fernet import Fernet, MultiFernet
 from dotenv import load_dotenv
 
 load_dotenv()
 
 ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY", "")
+# Comma-separated keys that were rotated out; still accepted for decryption
+ENCRYPTION_KEY_PREVIOUS = os.getenv("ENCRYPTION_KEY_PREVIOUS", "")
 
 def get_encryption_key() -> bytes:
     if not ENCRYPTION_KEY:
         raise ValueError("ENCRYPTION_KEY not set in .env file. Generate one with: python -c 'from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())'")
     return ENCRYPTION_KEY.encode()
 
+@lru_cache(maxsize=1)
+def get_cipher() -> MultiFernet:
+    """Cipher built once: encrypts with ENCRYPTION_KEY, decrypts with it or any previous key"""
+    keys = [get_encryption_key()] + [k.strip().encode() for k in ENCRYPTION_KEY_PREVIOUS.split(",") if k.strip()]
+    return MultiFernet([Fernet(key) for key in keys])
+
 def encrypt_value(value: str) -> str:
-    f = Fernet(get_encryption_key())
-    return f.encrypt(value.encode()).decode()
+    return get_cipher().encrypt(value.encode()).decode()
 
 def decrypt_value(encrypted_value: str) -> str:
-    f = Fernet(get_encryption_key())
-    return f.decrypt(encrypted_value.encode()).decode()
+    return get_cipher().decrypt(encrypted_value.encode()).decode()
+
+def rotate_value(encrypted_value: str) -> str:
+    """Re-encrypt a value under the current ENCRYPTION_KEY"""
+    return get_cipher().rotate(encrypted_value.encode()).decode()
+
+
+class EncryptedSecret:
+    """Stored ciphertext that's only decrypted when revealed"""
+    __slots__ = ("ciphertext",)
+
+    def __init__(self, ciphertext: Optional[str]):
+        self.ciphertext = ciphertext or ""
+
+    def __bool__(self) -> bool:
+        return bool(self.ciphertext)
+
+    def __repr__(self) -> str:
+        return "EncryptedSecret(***)"
+
+    def reveal(self) -> str:
+        return decrypt_value(self.ciphertext) if self.ciphertext else ""
+
+
+# Key for blind indexes; independent of ENCRYPTION_KEY so that can be rotated.
+# Changing it requires re-running scripts/backfill_api_key_blind_index.py
+BLIND_INDEX_KEY = os.getenv("BLIND_INDEX_KEY", "")
+
+@lru_cache(maxsize=1)
+def get_blind_index_key() -> bytes:
+    if not BLIND_INDEX_KEY:
+        raise ValueError("BLIND_INDEX_KEY not set in .env file. Generate one with: python -c 'import secrets; print(secrets.token_hex(32))'")
+    return BLIND_INDEX_KEY.encode()
+
+def blind_index(value: str) -> str:
+    """
+    Deterministic keyed hash of a secret, stored next to its ciphertext.
+
+    Fernet ciphertext is randomized, so equality lookups (e.g. duplicate API
+    keys) go through this column instead of decrypting every row.
+    """
+    return hmac.new(get_blind_index_key(), value.strip().encode(), hashlib.sha256).hexdigest()
@@ -0,0 +1,63 @@
+"""
+Concurrent Supabase reads for the dashboard bootstrap
+
+Every read the dashboard needs on mount (plan limits, trading accounts,
+positions and position configs) is started at once on a small thread pool
+using one shared client. position_configs is read once and shared by every
+section that needs it, instead of each loader querying it again. Sections
+await only the reads they depend on, so each can be shown as soon as its own
+data arrives.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+
+DASHBOARD_READ_WORKERS = int(os.getenv('DASHBOARD_READ_WORKERS', '8'))
+
+_executor = ThreadPoolExecutor(max_workers=DASHBOARD_READ_WORKERS, thread_name_prefix='dashboard-read')
+
+# Read name -> query builder (supabase, user_id)
+DASHBOARD_QUERIES = {
+    'plan': lambda supabase, user_id: supabase.table("user_effective_limits").select("*").eq("user_id", user_id),
+    'api_keys': lambda supabase, user_id: (
+        supabase.table("user_api_keys").select("*").eq("user_id", user_id).order("created_at", desc=True)
+    ),
+    'lp_positions': lambda supabase, user_id: supabase.table("lp_positions").select("*").eq("user_id", user_id),
+    'position_configs': lambda supabase, user_id: supabase.table("position_configs").select("*").eq("user_id", user_id),
+}
+
+# Dashboard section -> reads it needs
+SECTION_READS = {
+    'plan': ('plan',),
+    'api_keys': ('api_keys', 'position_configs'),
+    'wallets': ('api_keys', 'position_configs'),
+    'positions': ('lp_positions', 'position_configs', 'api_keys'),
+}
+
+
+def _execute(query) -> list:
+    return query.execute().data or []
+
+
+def start_dashboard_reads(supabase, user_id: str) -> Dict[str, asyncio.Future]:
+    """
+    Start all dashboard reads concurrently.
+
+    Returns:
+        Dictionary of read name -> future resolving to its rows
+    """
+    loop = asyncio.get_running_loop()
+    return {
+        name: loop.run_in_executor(_executor, _execute, build(supabase, user_id))
+        for name, build in DASHBOARD_QUERIES.items()
+    }
+
+
+async def section_rows(reads: Dict[str, asyncio.Future], section: str) -> Dict[str, list]:
+    """Wait for the reads a section needs and return their rows by read name"""
+    names = SECTION_READS[section]
+    results = await asyncio.gather(*(reads[name] for name in names))
+    return dict(zip(names, results))
+
@@ -42,3 +42,117 @@ class DashboardLoadingState(rx.State):
         self.api_keys_loaded = False
         self.positions_loaded = False
         self.wallets_loaded = False
+    
+    @rx.event(background=True)
+    async def bootstrap_dashboard(self):
+        """
+        Load plan data, trading accounts, positions and wallets concurrently.
+        
+        All reads share one Supabase client and one set of results (see
+        dashboard_bootstrap); each section is applied to its state as soon
+        as the reads it needs have finished.
+        """
+        import asyncio
+        from .auth import get_supabase_client
+        from .api_key_usage import APIKeyUsage
+        from .dashboard_bootstrap import section_rows, start_dashboard_reads
+        from .state import AuthState
+        from .api_key_state import APIKeyState
+        from .lp_position_state import LPPositionState, build_lp_positions
+        from .components.plan_status import PlanStatusState
+        
+        async with self:
+            self.reset_loading()
+            auth_state = await self.get_state(AuthState)
+            user_id = auth_state.user_id
+            access_token = auth_state.access_token
+            if not auth_state.is_authenticated or not user_id:
+                # Nothing to load yet; the plan card falls back to free tier defaults
+                self.mark_plan_data_loaded()
+                return
+            api_key_state = await self.get_state(APIKeyState)
+            api_key_state.is_loading = True
+            lp_state = await self.get_state(LPPositionState)
+            lp_state.is_loading = True
+        
+        try:
+            supabase = get_supabase_client(access_token)
+            reads = start_dashboard_reads(supabase, user_id)
+        except Exception as e:
+            print(f"[DASHBOARD] Failed to start dashboard reads: {e}", flush=True)
+            async with self:
+                (await self.get_state(APIKeyState)).is_loading = False
+                (await self.get_state(LPPositionState)).is_loading = False
+                self.plan_data_loaded = self.api_keys_loaded = self.positions_loaded = self.wallets_loaded = True
+                self._check_all_loaded()
+            return
+        
+        async def load_plan():
+            try:
+                rows = await section_rows(reads, 'plan')
+                async with self:
+                    plan_state = await self.get_state(PlanStatusState)
+                    if rows['plan']:
+                        plan_state._set_plan(rows['plan'][0])
+                    await plan_state.sync_usage()
+                    self.mark_plan_data_loaded()
+            except Exception as e:
+                print(f"[PLAN STATUS ERROR] Failed to load plan data: {e}", flush=True)
+                async with self:
+                    self.mark_plan_data_loaded()
+        
+        async def load_api_keys():
+            try:
+                rows = await section_rows(reads, 'api_keys')
+                async with self:
+                    api_key_state = await self.get_state(APIKeyState)
+                    api_key_state._set_api_keys(rows['api_keys'], APIKeyUsage(rows['position_configs']))
+                    await api_key_state._update_overview_stats()
+                    api_key_state.is_loading = False
+                    self.mark_api_keys_loaded()
+            except Exception as e:
+                print(f"[DASHBOARD] Failed to load API keys: {e}", flush=True)
+                async with self:
+                    api_key_state = await self.get_state(APIKeyState)
+                    api_key_state.error_message = "Failed to load API keys. Please try again."
+                    api_key_state.is_loading = False
+                    self.mark_api_keys_loaded()
+        
+        async def load_wallets():
+            try:
+                rows = await section_rows(reads, 'wallets')
+                async with self:
+                    lp_state = await self.get_state(LPPositionState)
+                    lp_state._set_wallets(rows['api_keys'], APIKeyUsage(rows['position_configs']))
+                    self.mark_wallets_loaded()
+            except Exception as e:
+                print(f"[DASHBOARD] Failed to load wallets: {e}", flush=True)
+                async with self:
+                    self.mark_wallets_loaded()
+        
+        async def load_positions():
+            try:
+                rows = await section_rows(reads, 'positions')
+                positions = []
+                if rows['lp_positions']:
+                    positions = await build_lp_positions(
+                        supabase, user_id, access_token, rows['lp_positions'], rows['position_configs'], rows['api_keys']
+                    )
+                async with self:
+                    lp_state = await self.get_state(LPPositionState)
+                    lp_state.lp_positions = positions
+                    await lp_state._update_overview_stats()
+                    # Plan usage is derived from the overview totals
+                    await (await self.get_state(PlanStatusState)).sync_usage()
+                    lp_state.is_loading = False
+                    self.mark_positions_loaded()
+                print(f"[DASHBOARD] Loaded {len(positions)} positions", flush=True)
+            except Exception as e:
+                print(f"[DASHBOARD] Failed to load positions: {e}", flush=True)
+                async with self:
+                    lp_state = await self.get_state(LPPositionState)
+                    lp_state.error_message = f"Failed to load positions: {str(e)}"
+                    lp_state.is_loading = False
+                    self.mark_positions_loaded()
+        
+        await asyncio.gather(load_plan(), load_api_keys(), load_wallets(), load_positions())
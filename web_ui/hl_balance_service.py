@@ -0,0 +1,157 @@
+"""
+Bulk Hyperliquid balance service
+
+Fetches user_state for many wallets concurrently (bounded by
+HL_BALANCE_MAX_CONCURRENCY worker threads), caches each wallet's balance for
+HL_BALANCE_TTL_SECONDS and writes refreshed balances back to user_api_keys in
+a single update_api_key_balances RPC call.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from .hl_utils import get_hl_account_balance
+
+
+HL_BALANCE_TTL_SECONDS = float(os.getenv('HL_BALANCE_TTL_SECONDS', '30'))
+HL_BALANCE_MAX_CONCURRENCY = int(os.getenv('HL_BALANCE_MAX_CONCURRENCY', '8'))
+
+_executor = ThreadPoolExecutor(max_workers=HL_BALANCE_MAX_CONCURRENCY, thread_name_prefix='hl-balance')
+
+# wallet (lowercase) -> (balance dict, fetched_at)
+_balance_cache: Dict[str, tuple] = {}
+_cache_lock = threading.Lock()
+
+
+def _cached_balance(wallet: str) -> Optional[Dict]:
+    with _cache_lock:
+        entry = _balance_cache.get(wallet)
+    if entry and time.monotonic() - entry[1] < HL_BALANCE_TTL_SECONDS:
+        return dict(entry[0])
+    return None
+
+
+def invalidate_balance(wallet_address: str):
+    """Drop a wallet's cached balance (e.g. after its trading account changes)"""
+    with _cache_lock:
+        _balance_cache.pop(wallet_address.lower(), None)
+
+
+async def _fetch_balances(wallet_addresses: Iterable[str], force: bool) -> tuple:
+    """Fetch balances, returning (results by address, set of wallets fetched from the API)"""
+    results: Dict[str, Optional[Dict]] = {}
+    to_fetch: Dict[str, List[str]] = {}  # lowercase wallet -> addresses as passed in
+    for address in wallet_addresses:
+        if not address:
+            continue
+        wallet = address.lower()
+        cached = None if force else _cached_balance(wallet)
+        if cached is not None:
+            results[address] = cached
+        else:
+            to_fetch.setdefault(wallet, []).append(address)
+
+    if to_fetch:
+        loop = asyncio.get_running_loop()
+        wallets = list(to_fetch)
+        balances = await asyncio.gather(
+            *(loop.run_in_executor(_executor, get_hl_account_balance, wallet) for wallet in wallets),
+            return_exceptions=True,
+        )
+        now = time.monotonic()
+        for wallet, balance in zip(wallets, balances):
+            if isinstance(balance, Exception):
+                print(f"Error fetching HL balance for {wallet}: {balance}")
+                balance = None
+            if balance is not None:
+                with _cache_lock:
+                    _balance_cache[wallet] = (dict(balance), now)
+            for address in to_fetch[wallet]:
+                results[address] = balance
+
+    return results, set(to_fetch)
+
+
+async def fetch_balances(wallet_addresses: Iterable[str], force: bool = False) -> Dict[str, Optional[Dict]]:
+    """
+    Fetch Hyperliquid balances for many wallets at once.
+
+    Args:
+        wallet_addresses: Wallet addresses to query
+        force: Ignore cached balances younger than the TTL
+
+    Returns:
+        Dictionary keyed by wallet address (as passed in) with the
+        get_hl_account_balance dict, or None if that wallet's fetch failed
+    """
+    results, _ = await _fetch_balances(wallet_addresses, force)
+    return results
+
+
+def write_back_balances(supabase, balances_by_key_id: Dict[str, Dict]):
+    """
+    Save account_value/available_balance for many trading accounts in one call.
+
+    Falls back to per-row updates if the update_api_key_balances function
+    hasn't been created yet (see migrations/add_update_api_key_balances_function.sql).
+    """
+    rows = [
+        {
+            "id": key_id,
+            "account_value": balance['account_value'],
+            "available_balance": balance['available'],
+        }
+        for key_id, balance in balances_by_key_id.items()
+        if balance
+    ]
+    if not rows:
+        return
+
+    try:
+        supabase.rpc("update_api_key_balances", {"balances": rows}).execute()
+        return
+    except Exception as e:
+        print(f"Batch balance update unavailable, updating rows individually: {e}")
+
+    for row in rows:
+        try:
+            supabase.table("user_api_keys").update({
+                "account_value": row["account_value"],
+                "available_balance": row["available_balance"]
+            }).eq("id", row["id"]).execute()
+        except Exception as e:
+            print(f"Failed to save balance to database: {e}")
+
+
+async def refresh_api_key_balances(supabase, api_keys: List[Dict], force: bool = False) -> Dict[str, Optional[Dict]]:
+    """
+    Refresh balances for trading accounts and write them back in one batch.
+
+    Args:
+        supabase: Supabase client for the write-back
+        api_keys: user_api_keys rows (need id, exchange, wallet_address)
+        force: Ignore cached balances younger than the TTL
+
+    Returns:
+        Dictionary keyed by api key id with the balance dict, or None if it
+        couldn't be fetched. Non-Hyperliquid accounts and accounts without a
+        wallet address are omitted.
+    """
+    wallets_by_key = {
+        key["id"]: key["wallet_address"]
+        for key in api_keys
+        if key.get("wallet_address") and (key.get("exchange") or "hyperliquid").lower() == "hyperliquid"
+    }
+    balances, fetched = await _fetch_balances(wallets_by_key.values(), force)
+    results = {key_id: balances.get(wallet) for key_id, wallet in wallets_by_key.items()}
+
+    # Cached balances were already saved when they were fetched
+    fresh = {key_id: balance for key_id, balance in results.items() if wallets_by_key[key_id].lower() in fetched}
+    try:
+        await asyncio.get_running_loop().run_in_executor(_executor, write_back_balances, supabase, fresh)
+    except Exception as e:
+        print(f"Failed to save balances to database: {e}")
+    return results
@@ -0,0 +1,138 @@
+"""
+Process-wide Hyperliquid market snapshot
+
+Downloads the perp universe (meta_and_asset_ctxs) once, indexes it by market
+symbol and serves token lookups from memory. The snapshot is refreshed when
+older than HL_MARKET_SNAPSHOT_TTL_SECONDS; concurrent callers that find it
+stale share a single refresh instead of each downloading the universe.
+
+Static per-market fields (szDecimals, asset index) rarely change, so
+get_static() serves them for HL_MARKET_STATIC_TTL_SECONDS. Callers that already
+have a live websocket price don't need to refresh the snapshot at all.
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from hyperliquid.info import Info as HLInfo
+from hyperliquid.utils import constants
+
+
+HL_MARKET_SNAPSHOT_TTL_SECONDS = float(os.getenv('HL_MARKET_SNAPSHOT_TTL_SECONDS', '10'))
+HL_MARKET_STATIC_TTL_SECONDS = float(os.getenv('HL_MARKET_STATIC_TTL_SECONDS', '3600'))
+
+
+class HLMarketSnapshot:
+    """
+    Cached Hyperliquid universe indexed by market symbol.
+
+    Args:
+        ttl_seconds: Max snapshot age before the next lookup refreshes it
+        static_ttl_seconds: Max age of szDecimals/asset index served by get_static
+    """
+
+    def __init__(self, ttl_seconds: float = HL_MARKET_SNAPSHOT_TTL_SECONDS,
+                 static_ttl_seconds: float = HL_MARKET_STATIC_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.static_ttl_seconds = static_ttl_seconds
+        self._markets: Dict[str, Dict] = {}
+        self._static: Dict[str, Dict] = {}
+        self._fetched_at = 0.0
+        self._info: Optional[HLInfo] = None
+        self._refresh_lock = threading.Lock()
+
+    def _is_fresh(self, ttl_seconds: Optional[float] = None) -> bool:
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        return bool(self._markets) and time.monotonic() - self._fetched_at < ttl_seconds
+
+    def _get_info(self) -> HLInfo:
+        if self._info is None:
+            self._info = HLInfo(constants.MAINNET_API_URL, skip_ws=True)
+        return self._info
+
+    def refresh(self) -> bool:
+        """
+        Download and index the universe (caller should hold _refresh_lock).
+
+        Returns:
+            True if the snapshot was updated
+        """
+        meta_and_asset_ctxs = self._get_info().meta_and_asset_ctxs()
+        if not meta_and_asset_ctxs or len(meta_and_asset_ctxs) != 2:
+            return False
+
+        universe = meta_and_asset_ctxs[0].get('universe', [])
+        asset_ctxs = meta_and_asset_ctxs[1]
+
+        markets: Dict[str, Dict] = {}
+        static: Dict[str, Dict] = {}
+        for i, asset in enumerate(universe):
+            name = asset.get('name')
+            if not name or name in markets:
+                continue
+            price = None
+            if i < len(asset_ctxs):
+                mark_px = asset_ctxs[i].get('markPx')
+                if mark_px:
+                    price = float(mark_px)
+            markets[name] = {
+                'sz_decimals': asset.get('szDecimals', 8),  # Default to 8 if not found
+                'price': price,
+            }
+            static[name] = {'sz_decimals': markets[name]['sz_decimals'], 'asset_index': i}
+
+        # Swap in the new index in one assignment so readers never see a partial one
+        self._markets = markets
+        self._static = static
+        self._fetched_at = time.monotonic()
+        return True
+
+    def _ensure_fresh(self, ttl_seconds: Optional[float] = None):
+        if self._is_fresh(ttl_seconds):
+            return
+        with self._refresh_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._is_fresh(ttl_seconds):
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                if not self._markets:
+                    raise
+                print(f"Warning: Hyperliquid market refresh failed, serving stale snapshot: {e}")
+
+    def get_market(self, hl_symbol: str) -> Optional[Dict]:
+        """
+        Look up a market by Hyperliquid symbol.
+
+        Args:
+            hl_symbol: Market symbol (e.g. 'ETH', 'BTC')
+
+        Returns:
+            Dict with sz_decimals and price (None if no mark price), or None if not listed
+        """
+        self._ensure_fresh()
+        market = self._markets.get(hl_symbol)
+        return dict(market) if market else None
+
+
+    def get_static(self, hl_symbol: str) -> Optional[Dict]:
+        """
+        Static fields of a market, refreshing only every static_ttl_seconds.
+
+        An unknown symbol triggers a refresh only once the regular TTL has also
+        passed, so a newly listed market shows up without a download per miss.
+
+        Returns:
+            Dict with sz_decimals and asset_index, or None if not listed
+        """
+        self._ensure_fresh(self.static_ttl_seconds)
+        market = self._static.get(hl_symbol)
+        if market is None and not self._is_fresh():
+            self._ensure_fresh()
+            market = self._static.get(hl_symbol)
+        return dict(market) if market else None
+
+
+hl_market_snapshot = HLMarketSnapshot()
@@ -0,0 +1,242 @@
+"""
+Optional Hyperliquid websocket price feed
+
+When HL_PRICE_FEED_ENABLED is set, a background websocket subscription to
+allMids (every market's mid) plus activeAssetCtx for markets we actually look
+up (their mark price) keeps an in-memory price table fresh. Lookups are plain
+dict reads; a price older than HL_PRICE_FEED_MAX_AGE_SECONDS counts as stale and
+callers fall back to the REST market snapshot.
+
+allMids arrives about every second, so a feed that has been silent for
+HL_PRICE_FEED_RECONNECT_SECONDS is treated as dropped: the websocket is closed
+and restarted on a later lookup, with exponential backoff between attempts.
+
+ReplayPriceSource stands in for the websocket client so the feed can be
+exercised offline from recorded messages.
+"""
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+HL_PRICE_FEED_ENABLED = os.getenv('HL_PRICE_FEED_ENABLED', 'false').lower() == 'true'
+HL_PRICE_FEED_MAX_AGE_SECONDS = float(os.getenv('HL_PRICE_FEED_MAX_AGE_SECONDS', '15'))
+
+HL_PRICE_FEED_RECONNECT_SECONDS = float(os.getenv('HL_PRICE_FEED_RECONNECT_SECONDS', '30'))
+
+# Backoff between websocket (re)start attempts, doubled after each failure
+START_RETRY_SECONDS = 5
+MAX_START_RETRY_SECONDS = 300
+
+
+class ReplayPriceSource:
+    """
+    Offline stand-in for hyperliquid Info's websocket subscriptions.
+
+    Args:
+        messages: Websocket messages ({'channel': ..., 'data': ...}) to replay
+    """
+
+    def __init__(self, messages: Iterable[Dict]):
+        self.messages = list(messages)
+        self.subscriptions: List[tuple] = []
+
+    @classmethod
+    def from_file(cls, path: str) -> "ReplayPriceSource":
+        """Load messages from a JSON lines file (one websocket message per line)"""
+        with open(path, 'r') as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def subscribe(self, subscription: Dict, callback: Callable[[Dict], None]) -> int:
+        self.subscriptions.append((subscription, callback))
+        return len(self.subscriptions)
+
+    def replay(self):
+        """Deliver every recorded message to the matching subscriptions"""
+        for message in self.messages:
+            for subscription, callback in list(self.subscriptions):
+                if subscription['type'] != message.get('channel'):
+                    continue
+                coin = subscription.get('coin')
+                if coin and message.get('data', {}).get('coin') != coin:
+                    continue
+                callback(message)
+
+
+class HLPriceFeed:
+    """
+    In-memory Hyperliquid price table fed by websocket subscriptions.
+
+    Args:
+        max_age_seconds: Prices older than this are treated as missing
+        reconnect_after_seconds: Silence after which the connection is considered dropped
+    """
+
+    def __init__(self, max_age_seconds: float = HL_PRICE_FEED_MAX_AGE_SECONDS,
+                 reconnect_after_seconds: float = HL_PRICE_FEED_RECONNECT_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self.reconnect_after_seconds = reconnect_after_seconds
+        self._mids: Dict[str, tuple] = {}  # coin -> (price, received_at)
+        self._marks: Dict[str, tuple] = {}  # coin -> (price, received_at)
+        self._watched = set()
+        self._source = None
+        self._last_message_at: Optional[float] = None
+        self._started_at: Optional[float] = None
+        self._start_failed_at: Optional[float] = None
+        self._retry_delay = START_RETRY_SECONDS
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._source is not None
+
+    def start(self, source=None) -> bool:
+        """
+        Subscribe to allMids (idempotent).
+
+        Args:
+            source: Object with Info.subscribe(subscription, callback); defaults
+                to a websocket-enabled hyperliquid Info client
+
+        Returns:
+            True if the feed is running
+        """
+        with self._lock:
+            if self._source is not None:
+                return True
+            if (source is None and self._start_failed_at is not None
+                    and time.monotonic() - self._start_failed_at < self._retry_delay):
+                return False
+            try:
+                if source is None:
+                    from hyperliquid.info import Info as HLInfo
+                    from hyperliquid.utils import constants
+                    source = HLInfo(constants.MAINNET_API_URL, skip_ws=False)
+                source.subscribe({'type': 'allMids'}, self._on_all_mids)
+                self._source = source
+                self._started_at = time.monotonic()
+            except Exception as e:
+                self._schedule_retry()
+                print(f"Warning: Could not start Hyperliquid price feed, using REST prices: {e}")
+                return False
+        print("Hyperliquid price feed started")
+        return True
+
+    def _schedule_retry(self):
+        """Back off before the next start attempt (lock must be held)"""
+        if self._start_failed_at is not None:
+            self._retry_delay = min(self._retry_delay * 2, MAX_START_RETRY_SECONDS)
+        self._start_failed_at = time.monotonic()
+
+    def check_connection(self) -> bool:
+        """
+        Drop the websocket if it has gone silent, so the next lookup reconnects.
+
+        Returns:
+            True if the feed is (still) running
+        """
+        with self._lock:
+            if self._source is None:
+                return False
+            last_seen = max(self._last_message_at or 0.0, self._started_at or 0.0)
+            if time.monotonic() - last_seen < self.reconnect_after_seconds:
+                return True
+            source, self._source = self._source, None
+            self._watched.clear()
+            self._schedule_retry()
+            retry_in = self._retry_delay
+        print(f"Warning: Hyperliquid price feed silent for {self.reconnect_after_seconds:.0f}s, reconnecting in {retry_in:.0f}s")
+        try:
+            if hasattr(source, 'disconnect_websocket'):
+                source.disconnect_websocket()
+        except Exception as e:
+            print(f"Warning: Could not close Hyperliquid websocket: {e}")
+        return False
+
+    def watch(self, coin: str):
+        """Also subscribe to activeAssetCtx for a coin to track its mark price"""
+        with self._lock:
+            if self._source is None or coin in self._watched:
+                return
+            self._watched.add(coin)
+            source = self._source
+        try:
+            source.subscribe({'type': 'activeAssetCtx', 'coin': coin}, self._on_asset_ctx)
+        except Exception as e:
+            print(f"Warning: Could not subscribe to {coin} asset context: {e}")
+
+    def _on_all_mids(self, message: Dict):
+        now = time.monotonic()
+        mids = message.get('data', {}).get('mids', {})
+        updates = {}
+        for coin, price in mids.items():
+            try:
+                updates[coin] = (float(price), now)
+            except (TypeError, ValueError):
+                continue
+        with self._lock:
+            self._mids.update(updates)
+            self._last_message_at = now
+            self._start_failed_at = None
+            self._retry_delay = START_RETRY_SECONDS
+
+    def _on_asset_ctx(self, message: Dict):
+        data = message.get('data', {})
+        coin = data.get('coin')
+        mark_px = data.get('ctx', {}).get('markPx')
+        if not coin or not mark_px:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._marks[coin] = (float(mark_px), now)
+            self._last_message_at = now
+
+    def get_price(self, coin: str) -> Optional[float]:
+        """
+        Fresh price for a coin (mark price if watched, else mid), or None if stale/unknown.
+
+        Args:
+            coin: Hyperliquid market symbol (e.g. 'ETH')
+        """
+        now = time.monotonic()
+        for table in (self._marks, self._mids):
+            entry = table.get(coin)
+            if entry and now - entry[1] <= self.max_age_seconds:
+                return entry[0]
+        return None
+
+    def staleness(self, coin: str) -> Optional[float]:
+        """Seconds since the coin's last price update, or None if never seen"""
+        received = [table[coin][1] for table in (self._marks, self._mids) if coin in table]
+        if not received:
+            return None
+        return time.monotonic() - max(received)
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        return {
+            'running': self.running,
+            'coins': len(self._mids),
+            'watched': len(self._watched),
+            'seconds_since_last_message': (
+                round(now - self._last_message_at, 1) if self._last_message_at is not None else None
+            ),
+        }
+
+
+hl_price_feed = HLPriceFeed()
+
+
+def get_live_price(coin: str) -> Optional[float]:
+    """
+    Live websocket price for a Hyperliquid market, or None to fall back to REST.
+
+    Starts the feed on first use when HL_PRICE_FEED_ENABLED is set.
+    """
+    if not hl_price_feed.check_connection():
+        if not HL_PRICE_FEED_ENABLED or not hl_price_feed.start():
+            return None
+    hl_price_feed.watch(coin)
+    return hl_price_feed.get_price(coin)
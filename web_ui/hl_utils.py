@@ -4,30 +4,18 @@ Copied from modulesv5/hyperliquid.py and core_hedger_v5.py
 """
 from hyperliquid.info import Info as HLInfo
 from hyperliquid.utils import constants
-from typing import Optional, Dict
+from typing import Optional, Dict, Mapping
 import requests
-import json
-import os
+import threading
 
+from web_ui.hl_market_snapshot import hl_market_snapshot
+from web_ui.hl_price_feed import get_live_price
+from web_ui.token_registry import token_registry
 
-# Load token mapping from JSON config file
-def _load_token_mapping() -> Dict[str, str]:
-    """Load token symbol mapping from JSON config file"""
-    config_path = os.path.join(os.path.dirname(__file__), 'token_mapping.json')
-    try:
-        with open(config_path, 'r') as f:
-            data = json.load(f)
-            mappings = data.get('mappings', {})
-            # Normalize keys to uppercase for case-insensitive lookups
-            return {k.upper(): v for k, v in mappings.items()}
-    except Exception as e:
-        print(f"Warning: Could not load token_mapping.json: {e}")
-        # Fallback to basic mappings
-        return {
-            'ETH': 'ETH', 'WETH': 'ETH',
-            'BTC': 'BTC', 'WBTC': 'BTC',
-            'LINK': 'LINK', 'ENA': 'ENA',
-        }
+
+def _load_token_mapping() -> Mapping[str, str]:
+    """Token symbol -> Hyperliquid market mapping from token_mapping.json (uppercased keys)"""
+    return token_registry.get().mappings
 
 
 def is_stablecoin(token_symbol: str) -> bool:
@@ -41,16 +29,20 @@ def is_stablecoin(token_symbol: str) -> bool:
     Returns:
         True if token is a stablecoin, False otherwise
     """
-    config_path = os.path.join(os.path.dirname(__file__), 'token_mapping.json')
-    try:
-        with open(config_path, 'r') as f:
-            data = json.load(f)
-            stablecoins = data.get('stablecoins', [])
-            return token_symbol.upper() in [s.upper() for s in stablecoins]
-    except Exception as e:
-        print(f"Warning: Could not load stablecoins from token_mapping.json: {e}")
-        # Fallback to basic list if file read fails
-        return token_symbol.upper() in {'USDC', 'USDT', 'DAI'}
+    return token_symbol.upper() in token_registry.get().stablecoins
+
+
+_info: Optional[HLInfo] = None
+_info_lock = threading.Lock()
+
+
+def _get_info() -> HLInfo:
+    """Process-wide Info client (its constructor downloads meta, so build it once)"""
+    global _info
+    with _info_lock:
+        if _info is None:
+            _info = HLInfo(constants.MAINNET_API_URL, skip_ws=True)
+        return _info
 
 
 def get_hl_account_balance(wallet_address: str) -> Optional[Dict]:
@@ -65,8 +57,8 @@ def get_hl_account_balance(wallet_address: str) -> Optional[Dict]:
         Dict with balance info or None if error
     """
     try:
-        # Initialize Info client (same as core_hedger)
-        info = HLInfo(constants.MAINNET_API_URL, skip_ws=True)
+        # Shared Info client (same as core_hedger, but metadata is only loaded once)
+        info = _get_info()
         
         # Get user state (same as hl_get_user_state in modulesv5/hyperliquid.py)
         addr = wallet_address.lower()
@@ -122,41 +114,29 @@ def get_hl_token_metadata(token_symbol: str) -> Optional[Dict]:
         Dict with price, sz_decimals, hl_symbol or None if not found
     """
     try:
-        # Load mapping fresh each time to pick up changes without restart
+        # Registry reloads token_mapping.json when it changes, so edits apply without restart
         token_mapping = _load_token_mapping()
         # Map token symbol to Hyperliquid market symbol
         hl_symbol = token_mapping.get(token_symbol.upper(), token_symbol.upper())
         
-        info = HLInfo(constants.MAINNET_API_URL, skip_ws=True)
-        
-        # Get all market data
-        meta_and_asset_ctxs = info.meta_and_asset_ctxs()
-        if not meta_and_asset_ctxs or len(meta_and_asset_ctxs) != 2:
+        # szDecimals/listing change rarely: served from the snapshot with a long TTL
+        static = hl_market_snapshot.get_static(hl_symbol)
+        if not static:
             return None
         
-        universe = meta_and_asset_ctxs[0].get('universe', [])
-        asset_ctxs = meta_and_asset_ctxs[1]
+        # Prefer the live websocket price; only refresh the REST snapshot when it's stale/off
+        price = get_live_price(hl_symbol)
+        if price is None:
+            market = hl_market_snapshot.get_market(hl_symbol)
+            price = market['price'] if market else None
         
-        # Find the token in the universe using mapped symbol
-        for i, asset in enumerate(universe):
-            if asset.get('name') == hl_symbol:
-                metadata = {
-                    'hl_symbol': hl_symbol,
-                    'pool_symbol': token_symbol.upper(),
-                    'sz_decimals': asset.get('szDecimals', 8),  # Default to 8 if not found
-                    'price_decimals': 5,  # Hyperliquid uses 5 for most tokens
-                    'price': None
-                }
-                
-                # Get price if available
-                if i < len(asset_ctxs):
-                    mark_px = asset_ctxs[i].get('markPx')
-                    if mark_px:
-                        metadata['price'] = float(mark_px)
-                
-                return metadata
-        
-        return None
+        return {
+            'hl_symbol': hl_symbol,
+            'pool_symbol': token_symbol.upper(),
+            'sz_decimals': static['sz_decimals'],
+            'price_decimals': 5,  # Hyperliquid uses 5 for most tokens
+            'price': price
+        }
         
     except Exception as e:
         print(f"Error fetching HL metadata for {token_symbol} (mapped to {hl_symbol}): {e}")
@@ -0,0 +1,120 @@
+"""
+Vectorized concentrated-liquidity math
+
+NumPy versions of the LP formulas in blockchain_utils (tick_to_price,
+compute_lp_state, compute_lp_amounts_from_raw_liquidity). Every function takes
+scalars or arrays and broadcasts, so a payoff curve, a stress test or a whole
+portfolio over thousands of prices is one call instead of a Python loop.
+
+Prices are token1 per token0 (Uniswap convention). Results are float64: use the
+integer functions in blockchain_utils where on-chain exactness matters.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+
+TICK_BASE = 1.0001
+Q96 = float(2 ** 96)
+
+
+class LPState(NamedTuple):
+    """LP position state; each field is an array shaped like the broadcast inputs"""
+    amount0: np.ndarray  # token0 held
+    amount1: np.ndarray  # token1 held
+    value: np.ndarray    # amount0 * price + amount1, in token1
+    delta: np.ndarray    # d(value)/d(price), equals amount0
+    gamma: np.ndarray    # d(delta)/d(price), zero out of range
+
+
+def tick_to_price(ticks) -> np.ndarray:
+    """Convert Uniswap V3 ticks to prices"""
+    return np.power(TICK_BASE, np.asarray(ticks, dtype=float))
+
+
+def tick_to_sqrt_price(ticks) -> np.ndarray:
+    """Convert ticks to sqrt(price)"""
+    return np.power(TICK_BASE, np.asarray(ticks, dtype=float) / 2)
+
+
+def tick_to_sqrt_price_x96(ticks) -> np.ndarray:
+    """Convert ticks to sqrtPriceX96 (float approximation)"""
+    return tick_to_sqrt_price(ticks) * Q96
+
+
+def lp_state(prices, liquidity, price_lower, price_upper) -> LPState:
+    """
+    Compute LP position state (token amounts, value, delta, gamma) at given prices.
+
+    Args:
+        prices: Price(s) to evaluate at
+        liquidity: Position liquidity L, in the same units as compute_lp_state
+        price_lower, price_upper: Range bounds (pa, pb)
+
+    All arguments broadcast against each other, e.g. prices of shape (m,) with
+    one position gives (m,); prices[None, :] with positions[:, None] gives (n, m).
+    """
+    p = np.asarray(prices, dtype=float)
+    L = np.asarray(liquidity, dtype=float)
+    sqrt_pa = np.sqrt(np.asarray(price_lower, dtype=float))
+    sqrt_pb = np.sqrt(np.asarray(price_upper, dtype=float))
+
+    valid = p > 0
+    p_safe = np.where(valid, p, 1.0)
+    # Below the range sqrt price sticks at pa (all token0), above it at pb (all token1)
+    sqrt_p = np.clip(np.sqrt(p_safe), sqrt_pa, sqrt_pb)
+
+    amount0 = np.where(valid, L * (1 / sqrt_p - 1 / sqrt_pb), 0.0)
+    amount1 = np.where(valid, L * (sqrt_p - sqrt_pa), 0.0)
+    value = amount0 * p + amount1
+    in_range = valid & (p_safe >= sqrt_pa ** 2) & (p_safe <= sqrt_pb ** 2)
+    gamma = np.where(in_range, -L / (2 * p_safe ** 1.5), 0.0)
+
+    return LPState(amount0, amount1, value, amount0, gamma)
+
+
+def portfolio_state(prices, liquidity, price_lower, price_upper) -> LPState:
+    """
+    Aggregate LP state of many positions over many prices.
+
+    Args:
+        prices: 1-D array of m prices
+        liquidity, price_lower, price_upper: 1-D arrays, one entry per position (n)
+
+    Returns:
+        LPState with each field of shape (m,), summed over positions
+    """
+    prices = np.asarray(prices, dtype=float)[np.newaxis, :]
+    per_position = lp_state(
+        prices,
+        np.asarray(liquidity, dtype=float)[:, np.newaxis],
+        np.asarray(price_lower, dtype=float)[:, np.newaxis],
+        np.asarray(price_upper, dtype=float)[:, np.newaxis],
+    )
+    return LPState(*(field.sum(axis=0) for field in per_position))
+
+
+def compute_lp_amounts_from_raw_liquidity(
+    raw_liquidity,
+    tick_lower,
+    tick_upper,
+    sqrt_price_x96,
+    token0_decimals,
+    token1_decimals,
+) -> tuple:
+    """
+    Token amounts from raw Uniswap V3 liquidity for arrays of positions/prices.
+
+    Returns: (amount0, amount1) in human-readable units
+    """
+    sqrt_lower = tick_to_sqrt_price(tick_lower)
+    sqrt_upper = tick_to_sqrt_price(tick_upper)
+    sqrt_price = np.clip(np.asarray(sqrt_price_x96, dtype=float) / Q96, sqrt_lower, sqrt_upper)
+    L = np.asarray(raw_liquidity, dtype=float)
+
+    amount0_raw = L * (sqrt_upper - sqrt_price) / (sqrt_price * sqrt_upper)
+    amount1_raw = L * (sqrt_price - sqrt_lower)
+
+    amount0 = amount0_raw / np.power(10.0, np.asarray(token0_decimals, dtype=float))
+    amount1 = amount1_raw / np.power(10.0, np.asarray(token1_decimals, dtype=float))
+    return amount0, amount1
@@ -1,7 +1,11 @@
+import asyncio
+from typing import Dict
+
 import reflex as rx
 from pydantic import BaseModel
 from .auth import get_supabase_client
 from .position_metrics import PositionMetrics
+from .api_key_usage import APIKeyUsage, fetch_api_key_usage
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -119,6 +123,390 @@ class LPPositionData(BaseModel):
     metrics: PositionMetrics = PositionMetrics()
 
 
+def compute_position_refresh(snapshot: dict) -> dict:
+    """
+    Compute refreshed values for one position from its QuestDB snapshot
+    (see get_position_snapshots). Pure function - no state is modified.
+    
+    Returns:
+        Dict with 'values' (None if QuestDB has no rows yet) and 'last_update'
+    """
+    from datetime import datetime
+    from web_ui.questdb_utils import format_time_ago
+    
+    update = {
+        'values': None,
+        'last_update': format_time_ago(snapshot.get('last_execution')),
+    }
+    
+    latest_values = snapshot.get('latest')
+    if not latest_values:
+        return update
+    
+    values = {
+        'lp_value': latest_values['lp_value_usd'],
+        'hedge_value': latest_values['hl_account_value'],
+        'total_value': latest_values['total_value'],
+        'fee_usd_total': latest_values.get('fee_usd_total', 0.0),
+        'fee_amount_0': latest_values.get('fee_amount_0', 0.0),
+        'fee_amount_1': latest_values.get('fee_amount_1', 0.0),
+        'fee_usd_0': latest_values.get('fee_usd_0', 0.0),
+        'fee_usd_1': latest_values.get('fee_usd_1', 0.0),
+        'entry': None,
+        'lp_pnl_usd': None,
+        'lp_pnl_pct': None,
+        'hedge_pnl_usd': None,
+        'hedge_pnl_pct': None,
+        'total_pnl_usd': None,
+        'total_pnl_pct': None,
+        'apr': None,
+        'position_age_days': None,
+    }
+    
+    # Calculate PnL if we have first values
+    first_values = snapshot.get('first')
+    if first_values:
+        entry_lp_value = first_values['lp_value_usd']
+        entry_hedge_value = first_values['hl_account_value']
+        entry_total_value = first_values['total_value']
+        values['entry'] = (entry_lp_value, entry_hedge_value, entry_total_value)
+        
+        # Calculate LP PnL
+        lp_pnl_usd = values['lp_value'] - entry_lp_value
+        values['lp_pnl_usd'] = lp_pnl_usd
+        values['lp_pnl_pct'] = (lp_pnl_usd / entry_lp_value * 100) if entry_lp_value > 0 else 0
+        
+        # Calculate Hedge PnL
+        hedge_pnl_usd = values['hedge_value'] - entry_hedge_value
+        values['hedge_pnl_usd'] = hedge_pnl_usd
+        values['hedge_pnl_pct'] = (hedge_pnl_usd / entry_hedge_value * 100) if entry_hedge_value > 0 else 0
+        
+        # Calculate Total PnL (includes fees as profit)
+        total_pnl_usd = lp_pnl_usd + hedge_pnl_usd + values['fee_usd_total']
+        values['total_pnl_usd'] = total_pnl_usd
+        values['total_pnl_pct'] = (total_pnl_usd / entry_total_value * 100) if entry_total_value > 0 else 0
+        
+        # Calculate position age and APR
+        start_time = datetime.fromisoformat(first_values['timestamp'])
+        current_time = datetime.fromisoformat(latest_values['timestamp'])
+        position_age_days = (current_time - start_time).total_seconds() / 86400
+        values['position_age_days'] = position_age_days
+        
+        if entry_total_value > 0 and position_age_days > 0:
+            values['apr'] = (total_pnl_usd / entry_total_value) * (365 / position_age_days) * 100
+    
+    update['values'] = values
+    return update
+
+
+def apply_position_refresh(position: "LPPositionData", update: dict):
+    """Apply values from compute_position_refresh to a position"""
+    values = update['values']
+    if values:
+        new_lp_value = values['lp_value']
+        new_hedge_value = values['hedge_value']
+        new_total_value = values['total_value']
+        
+        # Log if values changed significantly (more than $0.01)
+        if abs(position.position_size_usd - new_lp_value) > 0.01:
+            print(f"[REFRESH STATUS] Position {position.position_name} LP value: ${position.position_size_usd:,.2f} -> ${new_lp_value:,.2f}", flush=True)
+        
+        # Update old fields (backward compatibility)
+        position.position_size_usd = new_lp_value
+        position.position_value_formatted = f"${new_lp_value:,.2f}"
+        position.api_account_value = new_hedge_value
+        position.total_value_usd = new_total_value
+        position.total_value_formatted = f"${new_total_value:,.2f}"
+        
+        # Update metrics object with calculated values
+        position.metrics.lp_value = new_lp_value
+        position.metrics.hedge_value = new_hedge_value
+        position.metrics.total_value = new_total_value
+        
+        # Update fee metrics
+        position.metrics.fee_usd_total = values['fee_usd_total']
+        position.metrics.fee_amount_0 = values['fee_amount_0']
+        position.metrics.fee_amount_1 = values['fee_amount_1']
+        position.metrics.fee_usd_0 = values['fee_usd_0']
+        position.metrics.fee_usd_1 = values['fee_usd_1']
+        
+        fee_usd_total = values['fee_usd_total']
+        if fee_usd_total > 0:
+            print(f"[REFRESH STATUS] Position {position.position_name} fees: ${fee_usd_total:,.2f} (Token0: {position.metrics.fee_amount_0:.6f}, Token1: {position.metrics.fee_amount_1:.6f})", flush=True)
+        else:
+            print(f"[REFRESH STATUS] Position {position.position_name} has no fees (fee_usd_total={fee_usd_total})", flush=True)
+        
+        # Update entry baselines
+        if values['entry']:
+            (position.metrics.entry_lp_value,
+             position.metrics.entry_hedge_value,
+             position.metrics.entry_total_value) = values['entry']
+        
+        # Update PnL with CALCULATED values (NO backend fallback)
+        position.metrics.lp_pnl_usd = values['lp_pnl_usd']
+        position.metrics.lp_pnl_pct = values['lp_pnl_pct']
+        position.metrics.hedge_pnl_usd = values['hedge_pnl_usd']
+        position.metrics.hedge_pnl_pct = values['hedge_pnl_pct']
+        position.metrics.current_pnl = values['total_pnl_usd']
+        position.metrics.pnl_percentage = values['total_pnl_pct']
+        position.metrics.apr = values['apr']
+        position.metrics.position_age_days = int(values['position_age_days']) if values['position_age_days'] else None
+    
+    # Update last hedge execution time (only log if status changed)
+    new_status = update['last_update']
+    if position.last_hedge_execution != new_status:
+        print(f"[REFRESH STATUS] Position {position.position_name} last check: {position.last_hedge_execution} -> {new_status}", flush=True)
+        position.last_hedge_execution = new_status
+        position.metrics.last_update = new_status
+
+
+async def build_lp_positions(supabase, user_id: str, access_token: str, lp_rows: list, config_rows: list, api_key_rows: list) -> list:
+    """
+    Build LPPositionData for a user's positions from already-fetched rows.
+    
+    Merges each lp_positions row with its position_configs row, refreshes
+    balances of assigned trading accounts and fills in values/PnL from QuestDB.
+    
+    Args:
+        supabase: User's Supabase client (for balance write-back)
+        user_id: User the positions belong to
+        access_token: User's access token (for position size write-back)
+        lp_rows: lp_positions rows
+        config_rows: position_configs rows
+        api_key_rows: user_api_keys rows (need id, account_name, account_value, exchange, wallet_address)
+    
+    Returns:
+        List of LPPositionData
+    """
+    positions = []
+    
+    # Build config map using protocol, network, and nft_id (actual columns in database)
+    config_map = {}
+    for c in config_rows:
+        protocol = c.get('protocol', 'uniswap_v3')
+        nft_id = c.get('nft_id', '')
+        print(f"Config: protocol={protocol}, network={c.get('network')}, nft_id={nft_id}")
+        if nft_id:
+            config_map[f"{protocol}_{c['network']}_{nft_id}"] = c
+    print(f"Built config_map with {len(config_map)} entries")
+    
+    # Trading account names and balances
+    api_key_map = {k["id"]: {"name": k["account_name"], "balance": float(k.get("account_value", 0.0))} for k in api_key_rows}
+    
+    # Refresh live balances for accounts assigned to positions (concurrent, TTL cached)
+    assigned_key_ids = {c.get("hl_api_key_id") for c in config_map.values() if c.get("hl_api_key_id")}
+    assigned_keys = [k for k in api_key_rows if k["id"] in assigned_key_ids]
+    if assigned_keys:
+        from web_ui.hl_balance_service import refresh_api_key_balances
+        live_balances = await refresh_api_key_balances(supabase, assigned_keys)
+        for key_id, balance_info in live_balances.items():
+            if balance_info:
+                api_key_map[key_id]["balance"] = balance_info['account_value']
+    
+    # Fetch QuestDB snapshots for all configured positions in one batch
+    from web_ui.questdb_utils import format_time_ago
+    from web_ui.questdb_async import get_position_snapshots
+    from web_ui.position_size_sync import position_size_sync
+    snapshots = await get_position_snapshots([c["id"] for c in config_map.values() if c.get("id")])
+    
+    for pos_data in lp_rows:
+        # Look up config
+        protocol = pos_data.get('protocol', 'uniswap_v3')
+        config_key = f"{protocol}_{pos_data['network']}_{pos_data['nft_id']}"
+        config = config_map.get(config_key, {})
+        print(f"Position: network={pos_data['network']}, nft_id={pos_data['nft_id']}, config_found={bool(config)}")
+        
+        # Get trading account name and balance if assigned
+        api_key_id = config.get("hl_api_key_id", "")
+        api_key_info = api_key_map.get(api_key_id, {"name": "", "balance": 0.0})
+        api_key_name = api_key_info["name"]
+        api_account_value = api_key_info["balance"]
+        
+        # Get LP value from QuestDB (most accurate, updated by hedging bot)
+        # Fall back to database value only if QuestDB has no data (new positions)
+        position_size_usd = float(config.get("position_size_usd", 0.0))  # Fallback value
+        last_hedge_time_str = "Never"
+        
+        # Initialize PnL variables
+        entry_lp_value = None
+        entry_hedge_value = None
+        entry_total_value = None
+        lp_pnl_usd = None
+        lp_pnl_pct = None
+        hedge_pnl_usd = None
+        hedge_pnl_pct = None
+        total_pnl_usd = None
+        total_pnl_pct = None
+        apr = None
+        position_age_days = None
+        
+        # Initialize IL and range metrics
+        lp_il_usd = None
+        lp_il_pct = None
+        lp_utilization_pct = None
+        lp_distance_to_lower_pct = None
+        lp_distance_to_upper_pct = None
+        
+        latest_values = None
+        if config.get("id"):
+            try:
+                snapshot = snapshots.get(config["id"], {})
+                
+                # Try to get latest values from QuestDB
+                latest_values = snapshot.get('latest')
+                if latest_values and latest_values.get('lp_value_usd'):
+                    # Use QuestDB value (most accurate)
+                    position_size_usd = latest_values['lp_value_usd']
+                    
+                    # Get IL and range metrics from QuestDB
+                    lp_il_usd = latest_values.get('lp_il_usd')
+                    lp_il_pct = latest_values.get('lp_il_pct')
+                    lp_utilization_pct = latest_values.get('lp_utilization_pct')
+                    lp_distance_to_lower_pct = latest_values.get('lp_distance_to_lower_pct')
+                    lp_distance_to_upper_pct = latest_values.get('lp_distance_to_upper_pct')
+                    
+                    # Queue the QuestDB value for write-behind sync to Supabase
+                    position_size_sync.record(
+                        user_id, access_token, config["id"], position_size_usd,
+                        config.get("position_size_usd"),
+                    )
+                    
+                    # Also update hedge account value if available
+                    if latest_values.get('hl_account_value'):
+                        api_account_value = latest_values['hl_account_value']
+                    
+                    # Get first values for PnL calculation
+                    first_values = snapshot.get('first')
+                    if first_values:
+                        entry_lp_value = first_values['lp_value_usd']
+                        entry_hedge_value = first_values['hl_account_value']
+                        entry_total_value = first_values['total_value']
+                        
+                        # Calculate LP PnL
+                        lp_pnl_usd = position_size_usd - entry_lp_value
+                        lp_pnl_pct = (lp_pnl_usd / entry_lp_value * 100) if entry_lp_value > 0 else 0
+                        
+                        # Calculate Hedge PnL
+                        hedge_pnl_usd = api_account_value - entry_hedge_value
+                        hedge_pnl_pct = (hedge_pnl_usd / entry_hedge_value * 100) if entry_hedge_value > 0 else 0
+                        
+                        # Calculate Total PnL (includes fees as profit)
+                        fee_usd_total_for_pnl = latest_values.get('fee_usd_total', 0.0) if latest_values else 0.0
+                        total_pnl_usd = lp_pnl_usd + hedge_pnl_usd + fee_usd_total_for_pnl
+                        total_pnl_pct = (total_pnl_usd / entry_total_value * 100) if entry_total_value > 0 else 0
+                        
+                        # Calculate position age and APR
+                        from datetime import datetime
+                        
+                        start_time = datetime.fromisoformat(first_values['timestamp'])
+                        current_time = datetime.fromisoformat(latest_values['timestamp'])
+                        
+                        # Calculate days (use fractional days if less than 1 day)
+                        time_delta = current_time - start_time
+                        position_age_days = time_delta.total_seconds() / 86400
+                        
+                        # Calculate APR
+                        apr = None
+                        if entry_total_value > 0 and position_age_days > 0:
+                            apr = (total_pnl_usd / entry_total_value) * (365 / position_age_days) * 100
+                
+                # Get last hedge execution time
+                last_hedge_dt = snapshot.get('last_execution')
+                last_hedge_time_str = format_time_ago(last_hedge_dt)
+            except Exception as e:
+                print(f"Error fetching QuestDB data for position {config.get('id')}: {e}")
+        
+        # Calculate total value (LP position + API account + Accumulated Fees)
+        fee_usd_total = latest_values.get('fee_usd_total', 0.0) if latest_values else 0.0
+        total_value_usd = position_size_usd + api_account_value + fee_usd_total
+        
+        # Create PositionMetrics object
+        position_metrics = PositionMetrics(
+            lp_value=position_size_usd,
+            hedge_value=api_account_value,
+            total_value=total_value_usd,
+            last_update=last_hedge_time_str,
+            entry_lp_value=entry_lp_value,
+            entry_hedge_value=entry_hedge_value,
+            entry_total_value=entry_total_value,
+            lp_pnl_usd=lp_pnl_usd,
+            lp_pnl_pct=lp_pnl_pct,
+            hedge_pnl_usd=hedge_pnl_usd,
+            hedge_pnl_pct=hedge_pnl_pct,
+            current_pnl=total_pnl_usd,
+            pnl_percentage=total_pnl_pct,
+            apr=apr,
+            position_age_days=int(position_age_days) if position_age_days else None,
+            il_usd=lp_il_usd,
+            il_pct=lp_il_pct,
+            utilization_pct=lp_utilization_pct,
+            distance_to_lower_pct=lp_distance_to_lower_pct,
+            distance_to_upper_pct=lp_distance_to_upper_pct,
+            fee_usd_total=latest_values.get('fee_usd_total') if latest_values else None,
+            fee_amount_0=latest_values.get('fee_amount_0') if latest_values else None,
+            fee_amount_1=latest_values.get('fee_amount_1') if latest_values else None,
+            fee_usd_0=latest_values.get('fee_usd_0') if latest_values else None,
+            fee_usd_1=latest_values.get('fee_usd_1') if latest_values else None,
+        )
+        
+        position = LPPositionData(
+            id=pos_data["id"],
+            position_config_id=config.get("id", ""),
+            position_name=pos_data["position_name"],
+            protocol=pos_data.get("protocol", "uniswap_v3"),
+            network=pos_data["network"],
+            nft_id=pos_data["nft_id"],
+            pool_address=pos_data.get("pool_address", ""),
+            token0_symbol=pos_data.get("token0_symbol", ""),
+            token1_symbol=pos_data.get("token1_symbol", ""),
+            fee_tier=str(pos_data.get("fee_tier", "")),
+            liquidity=str(config.get("liquidity", "0")),
+            is_active=pos_data.get("is_active", True),
+            notes=pos_data.get("notes", ""),
+            created_at=pos_data.get("created_at", ""),
+            # Populate new fields from config
+            position_size_usd=position_size_usd,
+            position_value_formatted=f"${position_size_usd:,.2f}",
+            hedge_enabled=config.get("hedge_enabled", False),
+            target_hedge_ratio=float(config.get("target_hedge_ratio", 0.0)),
+            hedge_details=f"Hedge: {int(float(config.get('target_hedge_ratio', 0.0)))}%" if config.get("hedge_enabled", False) else "Hedge: Disabled",
+            api_key_name=api_key_name,
+            api_account_value=api_account_value,
+            total_value_usd=total_value_usd,
+            total_value_formatted=f"${total_value_usd:,.2f}",
+            hedge_token0=config.get("hedge_token0", True),
+            hedge_token1=config.get("hedge_token1", True),
+            use_dynamic_hedging=config.get("use_dynamic_hedging", False),
+            dynamic_profile=config.get("dynamic_profile", "balanced"),
+            rebalance_cooldown_hours=float(config.get("rebalance_cooldown_hours", 8.0)),
+            delta_drift_threshold_pct=float(config.get("delta_drift_threshold_pct", 0.38)),
+            down_threshold=float(config.get("down_threshold", -0.065)),
+            bounce_threshold=float(config.get("bounce_threshold", -0.038)),
+            lookback_hours=float(config.get("lookback_hours", 6.0)),
+            drift_min_pct_of_capital=float(config.get("drift_min_pct_of_capital", 0.06)),
+            max_hedge_drift_pct=float(config.get("max_hedge_drift_pct", 0.50)),
+            last_hedge_execution=last_hedge_time_str,
+            # New metrics object
+            metrics=position_metrics,
+        )
+        positions.append(position)
+    return positions
+
+
+# Client token -> stop event of its running watch_position_updates task
+_position_watchers: Dict[str, asyncio.Event] = {}
+
+
+def _client_connected(client_token: str) -> bool:
+    """Whether a browser tab is still connected with this client token"""
+    try:
+        from reflex.utils.prerequisites import get_app
+        event_namespace = get_app().app.event_namespace
+        return event_namespace is None or client_token in event_namespace.token_to_sid
+    except Exception:
+        return True
+
+
 class LPPositionState(rx.State):
     lp_positions: list[LPPositionData] = []
     selected_position_id: str = ""
@@ -343,14 +731,14 @@ class LPPositionState(rx.State):
         """User cancelled disabling hedging"""
         self.show_disable_hedge_dialog = False
     
-    def open_settings_dialog(self, position_id: str):
+    async def open_settings_dialog(self, position_id: str):
         """Open settings dialog for a position"""
         self.selected_settings_position_id = position_id
         self.show_settings_dialog = True
         
         # Fetch latest regime tracking data
-        from .questdb_utils import get_latest_regime_tracking
-        regime_data = get_latest_regime_tracking(position_id)
+        from .questdb_async import get_latest_regime_tracking
+        regime_data = await get_latest_regime_tracking(position_id)
         
         if regime_data:
             self.regime_timestamp = regime_data.get('timestamp', '')
@@ -641,41 +1029,7 @@ class LPPositionState(rx.State):
             
             if response.data:
                 # Get trading accounts that are already in use by other positions
-                # Explicitly exclude NULL values to avoid issues
-                used_keys_response = supabase.table("position_configs")\
-                    .select("hl_api_key_id")\
-                    .eq("user_id", auth_state.user_id)\
-                    .not_.is_("hl_api_key_id", "null")\
-                    .execute()
-                used_key_ids = {config["hl_api_key_id"] for config in used_keys_response.data}
-                
-                # When editing, allow the current position's trading account to appear
-                # Use (protocol, network, nft_id) as unique identifier
-                current_position_key_id = None
-                if self.is_editing and self.protocol and self.network and self.nft_id:
-                    current_config = supabase.table("position_configs")\
-                        .select("hl_api_key_id")\
-                        .eq("user_id", auth_state.user_id)\
-                        .eq("protocol", self.protocol)\
-                        .eq("network", self.network)\
-                        .eq("nft_id", self.nft_id)\
-                        .execute()
-                    if current_config.data and current_config.data[0].get("hl_api_key_id"):
-                        current_position_key_id = current_config.data[0]["hl_api_key_id"]
-                
-                # Filter out used keys (except the current position's key when editing)
-                available_keys = [
-                    key for key in response.data 
-                    if key["id"] not in used_key_ids or key["id"] == current_position_key_id
-                ]
-                
-                # Add None option to allow unassigning trading accounts
-                wallets = ["None"] + [f"{key['account_name']} ({key['exchange']})" for key in available_keys]
-                # Store in cache for immediate use
-                self._cached_wallets = wallets
-                # Don't auto-select - let it default to empty/None
-                # For new positions: User must explicitly select trading account
-                # For editing positions: load_hedge_config() will set the correct wallet
+                self._set_wallets(response.data, fetch_api_key_usage(supabase, auth_state.user_id))
             
             # Mark wallets as loaded for dashboard loading state
             from web_ui.dashboard_loading_state import DashboardLoadingState
@@ -688,6 +1042,40 @@ class LPPositionState(rx.State):
             dashboard_loading.mark_wallets_loaded()
             pass
     
+    def _set_wallets(self, api_key_rows: list, key_usage: APIKeyUsage):
+        """
+        Build the wallet selector options from trading accounts and their usage.
+        
+        Args:
+            api_key_rows: user_api_keys rows (need id, account_name, exchange, is_active)
+            key_usage: Which positions use each trading account
+        """
+        active_keys = [key for key in api_key_rows if key.get("is_active", True)]
+        if not active_keys:
+            return
+        
+        used_key_ids = key_usage.used_key_ids()
+        
+        # When editing, allow the current position's trading account to appear
+        # Use (protocol, network, nft_id) as unique identifier
+        current_position_key_id = None
+        if self.is_editing and self.protocol and self.network and self.nft_id:
+            current_position_key_id = key_usage.key_for_position(self.protocol, self.network, self.nft_id)
+        
+        # Filter out used keys (except the current position's key when editing)
+        available_keys = [
+            key for key in active_keys 
+            if key["id"] not in used_key_ids or key["id"] == current_position_key_id
+        ]
+        
+        # Add None option to allow unassigning trading accounts
+        wallets = ["None"] + [f"{key['account_name']} ({key['exchange']})" for key in available_keys]
+        # Store in cache for immediate use
+        self._cached_wallets = wallets
+        # Don't auto-select - let it default to empty/None
+        # For new positions: User must explicitly select trading account
+        # For editing positions: load_hedge_config() will set the correct wallet
+    
     @rx.var
     def available_wallets(self) -> list[str]:
         """Get list of available trading accounts for wallet selector"""
@@ -789,7 +1177,7 @@ class LPPositionState(rx.State):
         """Fetch balance for selected wallet"""
         try:
             from web_ui.state import AuthState
-            from web_ui.hl_utils import get_hl_account_balance
+            from web_ui.hl_balance_service import refresh_api_key_balances
             
             auth_state = await self.get_state(AuthState)
             
@@ -819,21 +1207,13 @@ class LPPositionState(rx.State):
                     wallet_address = key_data.get("wallet_address")
                     
                     if wallet_address:
-                        # Fetch balance using wallet address
-                        balance_info = get_hl_account_balance(wallet_address)
+                        # Fetch balance using wallet address (cached briefly, saved to database)
+                        balances = await refresh_api_key_balances(supabase, [key_data])
+                        balance_info = balances.get(key_data["id"])
                         
                         if balance_info:
                             self.selected_wallet_balance = balance_info['account_value']
                             self.selected_wallet_available = balance_info['available']
-                            
-                            # Save balance to database
-                            try:
-                                supabase.table("user_api_keys").update({
-                                    "account_value": balance_info['account_value'],
-                                    "available_balance": balance_info['available']
-                                }).eq("id", key_data["id"]).execute()
-                            except Exception as e:
-                                print(f"Failed to save balance to database: {e}")
                         else:
                             self.balance_error = "Failed to fetch balance"
                     else:
@@ -893,29 +1273,15 @@ class LPPositionState(rx.State):
             
             # Check if this trading account is already used by another position
             try:
-                # Get all positions using this API key (excluding NULL)
-                result = supabase.table("position_configs")\
-                    .select("user_id, protocol, network, nft_id")\
-                    .eq("user_id", auth_state.user_id)\
-                    .eq("hl_api_key_id", api_key_id)\
-                    .execute()
+                key_usage = fetch_api_key_usage(supabase, auth_state.user_id)
                 
-                if not result.data:
-                    return True  # Not used by any of this user's positions
-                
-                # If editing, check if it's THIS position using it
-                # Use (user_id, protocol, network, nft_id) as unique identifier
+                # When editing, the position's own trading account stays available
+                # Use (protocol, network, nft_id) as unique identifier
                 if self.is_editing and self.protocol and self.network and self.nft_id:
-                    for config in result.data:
-                        if (config["user_id"] == auth_state.user_id and 
-                            config["protocol"] == self.protocol and
-                            config["network"] == self.network and 
-                            config["nft_id"] == self.nft_id):
-                            return True  # Same position, allowed
-                    return False  # Different position using it
+                    return key_usage.is_available(api_key_id, self.protocol, self.network, self.nft_id)
                 
                 # For new positions, trading account must not be used by any other position
-                return False
+                return key_usage.is_available(api_key_id)
             except Exception as table_error:
                 # If position_configs table doesn't exist, assume trading account is available
                 print(f"Warning: position_configs table not accessible: {table_error}")
@@ -1039,6 +1405,11 @@ class LPPositionState(rx.State):
             
             supabase.table("lp_positions").delete().eq("id", position_id).eq("user_id", auth_state.user_id).execute()
             
+            # Drop cached entry baseline so a re-created position starts fresh
+            if position and position.position_config_id:
+                from web_ui.baseline_cache import baseline_cache
+                baseline_cache.invalidate(position.position_config_id)
+            
             await self.load_positions()
             if self.selected_position_id == position_id:
                 self.clear_form()
@@ -1050,141 +1421,94 @@ class LPPositionState(rx.State):
             self.is_loading = False
             self.loading_position_id = ""
 
-    async def refresh_position_status(self):
-        """Lightweight refresh of position status and metric values without full reload"""
+    @rx.event(background=True)
+    async def watch_position_updates(self):
+        """
+        Apply position updates from the shared refresh scheduler.
+        
+        The scheduler queries QuestDB once per interval for the distinct
+        positions of all connected clients; this task subscribes this tab's
+        positions and applies only the ones whose snapshot changed. It runs
+        while the positions section is mounted (see stop_position_updates).
+        """
+        from web_ui.questdb_async import get_chart_series
+        from web_ui.questdb_utils import format_time_ago
+        from web_ui.position_refresh_scheduler import position_refresh_scheduler
+        
+        async with self:
+            client_token = self.router.session.client_token
+        if not client_token:
+            return
+        if client_token in _position_watchers:
+            # Section re-mounted before the previous task noticed it was stopped
+            _position_watchers[client_token].clear()
+            return
+        stop = asyncio.Event()
+        _position_watchers[client_token] = stop
+        
         try:
-            print("[REFRESH STATUS] Starting position status refresh", flush=True)
-            
-            from web_ui.state import AuthState
-            auth_state = await self.get_state(AuthState)
-            
-            if not auth_state.is_authenticated or not auth_state.user_id:
-                print("[REFRESH STATUS] Not authenticated, skipping refresh", flush=True)
-                return
-            
-            # Update metrics and last_hedge_execution for existing positions
-            for position in self.lp_positions:
-                if position.position_config_id:
+            version = position_refresh_scheduler.version
+            while _client_connected(client_token) and not stop.is_set():
+                async with self:
+                    from web_ui.state import AuthState
+                    auth_state = await self.get_state(AuthState)
+                    if not auth_state.is_authenticated:
+                        break
+                    position_ids = [p.position_config_id for p in self.lp_positions if p.position_config_id]
+                
+                position_refresh_scheduler.subscribe(client_token, position_ids)
+                refresh = asyncio.ensure_future(position_refresh_scheduler.wait_for_refresh(position_ids, version))
+                stopped = asyncio.ensure_future(stop.wait())
+                await asyncio.wait({refresh, stopped}, return_when=asyncio.FIRST_COMPLETED)
+                stopped.cancel()
+                if stop.is_set() or not refresh.done():
+                    # Stopped, or stopped and re-mounted: resubscribe on the next pass
+                    refresh.cancel()
+                    continue
+                version, changed = refresh.result()
+                
+                updates = {}
+                for position_id, snapshot in position_refresh_scheduler.get_snapshots(position_ids).items():
                     try:
-                        from web_ui.questdb_utils import get_latest_position_values, get_first_position_values, get_last_hedge_execution, format_time_ago
-                        
-                        # Get latest values from QuestDB
-                        latest_values = get_latest_position_values(position.position_config_id)
-                        if latest_values:
-                            # Update position values
-                            new_lp_value = latest_values['lp_value_usd']
-                            new_hedge_value = latest_values['hl_account_value']
-                            new_total_value = latest_values['total_value']
-                            
-                            # Get first values for PnL calculation
-                            first_values = get_first_position_values(position.position_config_id)
-                            
-                            # Initialize PnL variables
-                            new_lp_pnl_usd = None
-                            new_lp_pnl_pct = None
-                            new_hedge_pnl_usd = None
-                            new_hedge_pnl_pct = None
-                            new_total_pnl_usd = None
-                            new_total_pnl_pct = None
-                            new_apr = None
-                            new_position_age_days = None
-                            
-                            # Calculate PnL if we have first values
-                            if first_values:
-                                entry_lp_value = first_values['lp_value_usd']
-                                entry_hedge_value = first_values['hl_account_value']
-                                entry_total_value = first_values['total_value']
-                                
-                                # Calculate LP PnL
-                                new_lp_pnl_usd = new_lp_value - entry_lp_value
-                                new_lp_pnl_pct = (new_lp_pnl_usd / entry_lp_value * 100) if entry_lp_value > 0 else 0
-                                
-                                # Calculate Hedge PnL
-                                new_hedge_pnl_usd = new_hedge_value - entry_hedge_value
-                                new_hedge_pnl_pct = (new_hedge_pnl_usd / entry_hedge_value * 100) if entry_hedge_value > 0 else 0
-                                
-                                # Calculate Total PnL (includes fees as profit)
-                                fee_usd_total = latest_values.get('fee_usd_total', 0.0)
-                                new_total_pnl_usd = new_lp_pnl_usd + new_hedge_pnl_usd + fee_usd_total
-                                new_total_pnl_pct = (new_total_pnl_usd / entry_total_value * 100) if entry_total_value > 0 else 0
-                                
-                                # Calculate position age and APR
-                                from datetime import datetime
-                                
-                                start_time = datetime.fromisoformat(first_values['timestamp'])
-                                current_time = datetime.fromisoformat(latest_values['timestamp'])
-                                
-                                time_delta = current_time - start_time
-                                new_position_age_days = time_delta.total_seconds() / 86400
-                                
-                                new_apr = None
-                                if entry_total_value > 0 and new_position_age_days > 0:
-                                    new_apr = (new_total_pnl_usd / entry_total_value) * (365 / new_position_age_days) * 100
-                            
-                            # Log if values changed significantly (more than $0.01)
-                            if abs(position.position_size_usd - new_lp_value) > 0.01:
-                                print(f"[REFRESH STATUS] Position {position.position_name} LP value: ${position.position_size_usd:,.2f} -> ${new_lp_value:,.2f}", flush=True)
-                            
-                            # Update old fields (backward compatibility)
-                            position.position_size_usd = new_lp_value
-                            position.position_value_formatted = f"${new_lp_value:,.2f}"
-                            position.api_account_value = new_hedge_value
-                            position.total_value_usd = new_total_value
-                            position.total_value_formatted = f"${new_total_value:,.2f}"
-                            
-                            # Update metrics object with calculated values
-                            position.metrics.lp_value = new_lp_value
-                            position.metrics.hedge_value = new_hedge_value
-                            position.metrics.total_value = new_total_value
-                            
-                            # Update fee metrics
-                            fee_usd_total = latest_values.get('fee_usd_total', 0.0)
-                            position.metrics.fee_usd_total = fee_usd_total
-                            position.metrics.fee_amount_0 = latest_values.get('fee_amount_0', 0.0)
-                            position.metrics.fee_amount_1 = latest_values.get('fee_amount_1', 0.0)
-                            position.metrics.fee_usd_0 = latest_values.get('fee_usd_0', 0.0)
-                            position.metrics.fee_usd_1 = latest_values.get('fee_usd_1', 0.0)
-                            
-                            # Debug logging for fees
-                            if fee_usd_total > 0:
-                                print(f"[REFRESH STATUS] Position {position.position_name} fees: ${fee_usd_total:,.2f} (Token0: {position.metrics.fee_amount_0:.6f}, Token1: {position.metrics.fee_amount_1:.6f})", flush=True)
-                            else:
-                                print(f"[REFRESH STATUS] Position {position.position_name} has no fees (fee_usd_total={fee_usd_total})", flush=True)
-                            
-                            # Update entry baselines
-                            if first_values:
-                                position.metrics.entry_lp_value = entry_lp_value
-                                position.metrics.entry_hedge_value = entry_hedge_value
-                                position.metrics.entry_total_value = entry_total_value
-                            
-                            # Update PnL with CALCULATED values (NO backend fallback)
-                            position.metrics.lp_pnl_usd = new_lp_pnl_usd
-                            position.metrics.lp_pnl_pct = new_lp_pnl_pct
-                            position.metrics.hedge_pnl_usd = new_hedge_pnl_usd
-                            position.metrics.hedge_pnl_pct = new_hedge_pnl_pct
-                            position.metrics.current_pnl = new_total_pnl_usd
-                            position.metrics.pnl_percentage = new_total_pnl_pct
-                            position.metrics.apr = new_apr
-                            position.metrics.position_age_days = int(new_position_age_days) if new_position_age_days else None
-                        
-                        # Update last hedge execution time
-                        last_hedge_dt = get_last_hedge_execution(position.position_config_id)
-                        new_status = format_time_ago(last_hedge_dt)
-                        
-                        # Only log if status changed
-                        if position.last_hedge_execution != new_status:
-                            print(f"[REFRESH STATUS] Position {position.position_name} last check: {position.last_hedge_execution} -> {new_status}", flush=True)
-                            position.last_hedge_execution = new_status
-                            position.metrics.last_update = new_status
-                            
+                        if position_id in changed:
+                            updates[position_id] = compute_position_refresh(snapshot)
+                        else:
+                            # Unchanged position: only the relative "last check" time moves
+                            updates[position_id] = {
+                                'values': None,
+                                'last_update': format_time_ago(snapshot.get('last_execution')),
+                            }
                     except Exception as e:
-                        print(f"[REFRESH STATUS] Error refreshing position {position.position_config_id}: {e}", flush=True)
-            
-            print("[REFRESH STATUS] Refresh complete", flush=True)
+                        print(f"[REFRESH STATUS] Error refreshing position {position_id}: {e}", flush=True)
+                
+                async with self:
+                    for position in self.lp_positions:
+                        update = updates.get(position.position_config_id)
+                        if update:
+                            apply_position_refresh(position, update)
+                    chart_position_id = self.selected_chart_position_id if self.show_chart else ""
+                    chart_hours = self.chart_hours
+                
+                if chart_position_id:
+                    chart_data = await get_chart_series(chart_position_id, chart_hours)
+                    async with self:
+                        if self.show_chart and self.selected_chart_position_id == chart_position_id:
+                            self.chart_data = chart_data
         except Exception as e:
             print(f"[REFRESH STATUS ERROR] {e}", flush=True)
-            import traceback
-            traceback.print_exc()
+        finally:
+            position_refresh_scheduler.unsubscribe(client_token)
+            if _position_watchers.get(client_token) is stop:
+                del _position_watchers[client_token]
+    
+    def stop_position_updates(self):
+        """Stop this tab's watch_position_updates task (positions section unmounted)"""
+        client_token = self.router.session.client_token
+        stop = _position_watchers.get(client_token)
+        if stop:
+            stop.set()
+        from web_ui.position_refresh_scheduler import position_refresh_scheduler
+        position_refresh_scheduler.unsubscribe(client_token)
     
     async def load_positions(self):
         print("\n=== LOAD_POSITIONS START ===")
@@ -1211,208 +1535,15 @@ class LPPositionState(rx.State):
             
             self.lp_positions = []
             if response.data:
-                # Fetch config data to merge
+                # Fetch config data and trading accounts to merge
                 print(f"Fetching position_configs for user_id={auth_state.user_id}")
                 config_response = supabase.table("position_configs").select("*").eq("user_id", auth_state.user_id).execute()
                 print(f"position_configs response: {len(config_response.data) if config_response.data else 0} configs found")
+                api_keys_response = supabase.table("user_api_keys").select("id, account_name, account_value, available_balance, exchange, wallet_address").eq("user_id", auth_state.user_id).execute()
                 
-                # Build config map using protocol, network, and nft_id (actual columns in database)
-                config_map = {}
-                if config_response.data:
-                    for c in config_response.data:
-                        protocol = c.get('protocol', 'uniswap_v3')
-                        nft_id = c.get('nft_id', '')
-                        print(f"Config: protocol={protocol}, network={c.get('network')}, nft_id={nft_id}")
-                        if nft_id:
-                            config_map[f"{protocol}_{c['network']}_{nft_id}"] = c
-                print(f"Built config_map with {len(config_map)} entries")
-                
-                # Fetch trading accounts to get account names and balances
-                api_keys_response = supabase.table("user_api_keys").select("id, account_name, account_value, available_balance").eq("user_id", auth_state.user_id).execute()
-                api_key_map = {k["id"]: {"name": k["account_name"], "balance": float(k.get("account_value", 0.0))} for k in api_keys_response.data} if api_keys_response.data else {}
-                
-                for pos_data in response.data:
-                    # Look up config
-                    protocol = pos_data.get('protocol', 'uniswap_v3')
-                    config_key = f"{protocol}_{pos_data['network']}_{pos_data['nft_id']}"
-                    config = config_map.get(config_key, {})
-                    print(f"Position: network={pos_data['network']}, nft_id={pos_data['nft_id']}, config_found={bool(config)}")
-                    
-                    # Get trading account name and balance if assigned
-                    api_key_id = config.get("hl_api_key_id", "")
-                    api_key_info = api_key_map.get(api_key_id, {"name": "", "balance": 0.0})
-                    api_key_name = api_key_info["name"]
-                    api_account_value = api_key_info["balance"]
-                    
-                    # Get LP value from QuestDB (most accurate, updated by hedging bot)
-                    # Fall back to database value only if QuestDB has no data (new positions)
-                    position_size_usd = float(config.get("position_size_usd", 0.0))  # Fallback value
-                    last_hedge_time_str = "Never"
-                    
-                    # Initialize PnL variables
-                    entry_lp_value = None
-                    entry_hedge_value = None
-                    entry_total_value = None
-                    lp_pnl_usd = None
-                    lp_pnl_pct = None
-                    hedge_pnl_usd = None
-                    hedge_pnl_pct = None
-                    total_pnl_usd = None
-                    total_pnl_pct = None
-                    apr = None
-                    position_age_days = None
-                    
-                    # Initialize IL and range metrics
-                    lp_il_usd = None
-                    lp_il_pct = None
-                    lp_utilization_pct = None
-                    lp_distance_to_lower_pct = None
-                    lp_distance_to_upper_pct = None
-                    
-                    if config.get("id"):
-                        try:
-                            from web_ui.questdb_utils import get_latest_position_values, get_first_position_values, get_last_hedge_execution, format_time_ago
-                            
-                            # Try to get latest values from QuestDB
-                            latest_values = get_latest_position_values(config["id"])
-                            if latest_values and latest_values.get('lp_value_usd'):
-                                # Use QuestDB value (most accurate)
-                                position_size_usd = latest_values['lp_value_usd']
-                                
-                                # Get IL and range metrics from QuestDB
-                                lp_il_usd = latest_values.get('lp_il_usd')
-                                lp_il_pct = latest_values.get('lp_il_pct')
-                                lp_utilization_pct = latest_values.get('lp_utilization_pct')
-                                lp_distance_to_lower_pct = latest_values.get('lp_distance_to_lower_pct')
-                                lp_distance_to_upper_pct = latest_values.get('lp_distance_to_upper_pct')
-                                
-                                # Sync QuestDB value back to Supabase to keep database fresh
-                                try:
-                                    supabase.table("position_configs").update({
-                                        "position_size_usd": position_size_usd
-                                    }).eq("id", config["id"]).execute()
-                                except Exception as update_error:
-                                    print(f"Warning: Failed to sync position_size_usd to Supabase: {update_error}")
-                                
-                                # Also update hedge account value if available
-                                if latest_values.get('hl_account_value'):
-                                    api_account_value = latest_values['hl_account_value']
-                                
-                                # Get first values for PnL calculation
-                                first_values = get_first_position_values(config["id"])
-                                if first_values:
-                                    entry_lp_value = first_values['lp_value_usd']
-                                    entry_hedge_value = first_values['hl_account_value']
-                                    entry_total_value = first_values['total_value']
-                                    
-                                    # Calculate LP PnL
-                                    lp_pnl_usd = position_size_usd - entry_lp_value
-                                    lp_pnl_pct = (lp_pnl_usd / entry_lp_value * 100) if entry_lp_value > 0 else 0
-                                    
-                                    # Calculate Hedge PnL
-                                    hedge_pnl_usd = api_account_value - entry_hedge_value
-                                    hedge_pnl_pct = (hedge_pnl_usd / entry_hedge_value * 100) if entry_hedge_value > 0 else 0
-                                    
-                                    # Calculate Total PnL (includes fees as profit)
-                                    fee_usd_total_for_pnl = latest_values.get('fee_usd_total', 0.0) if latest_values else 0.0
-                                    total_pnl_usd = lp_pnl_usd + hedge_pnl_usd + fee_usd_total_for_pnl
-                                    total_pnl_pct = (total_pnl_usd / entry_total_value * 100) if entry_total_value > 0 else 0
-                                    
-                                    # Calculate position age and APR
-                                    from datetime import datetime
-                                    
-                                    start_time = datetime.fromisoformat(first_values['timestamp'])
-                                    current_time = datetime.fromisoformat(latest_values['timestamp'])
-                                    
-                                    # Calculate days (use fractional days if less than 1 day)
-                                    time_delta = current_time - start_time
-                                    position_age_days = time_delta.total_seconds() / 86400
-                                    
-                                    # Calculate APR
-                                    apr = None
-                                    if entry_total_value > 0 and position_age_days > 0:
-                                        apr = (total_pnl_usd / entry_total_value) * (365 / position_age_days) * 100
-                            
-                            # Get last hedge execution time
-                            last_hedge_dt = get_last_hedge_execution(config["id"])
-                            last_hedge_time_str = format_time_ago(last_hedge_dt)
-                        except Exception as e:
-                            print(f"Error fetching QuestDB data for position {config.get('id')}: {e}")
-                    
-                    # Calculate total value (LP position + API account + Accumulated Fees)
-                    fee_usd_total = latest_values.get('fee_usd_total', 0.0) if latest_values else 0.0
-                    total_value_usd = position_size_usd + api_account_value + fee_usd_total
-                    
-                    # Create PositionMetrics object
-                    position_metrics = PositionMetrics(
-                        lp_value=position_size_usd,
-                        hedge_value=api_account_value,
-                        total_value=total_value_usd,
-                        last_update=last_hedge_time_str,
-                        entry_lp_value=entry_lp_value,
-                        entry_hedge_value=entry_hedge_value,
-                        entry_total_value=entry_total_value,
-                        lp_pnl_usd=lp_pnl_usd,
-                        lp_pnl_pct=lp_pnl_pct,
-                        hedge_pnl_usd=hedge_pnl_usd,
-                        hedge_pnl_pct=hedge_pnl_pct,
-                        current_pnl=total_pnl_usd,
-                        pnl_percentage=total_pnl_pct,
-                        apr=apr,
-                        position_age_days=int(position_age_days) if position_age_days else None,
-                        il_usd=lp_il_usd,
-                        il_pct=lp_il_pct,
-                        utilization_pct=lp_utilization_pct,
-                        distance_to_lower_pct=lp_distance_to_lower_pct,
-                        distance_to_upper_pct=lp_distance_to_upper_pct,
-                        fee_usd_total=latest_values.get('fee_usd_total') if latest_values else None,
-                        fee_amount_0=latest_values.get('fee_amount_0') if latest_values else None,
-                        fee_amount_1=latest_values.get('fee_amount_1') if latest_values else None,
-                        fee_usd_0=latest_values.get('fee_usd_0') if latest_values else None,
-                        fee_usd_1=latest_values.get('fee_usd_1') if latest_values else None,
-                    )
-                    
-                    position = LPPositionData(
-                        id=pos_data["id"],
-                        position_config_id=config.get("id", ""),
-                        position_name=pos_data["position_name"],
-                        protocol=pos_data.get("protocol", "uniswap_v3"),
-                        network=pos_data["network"],
-                        nft_id=pos_data["nft_id"],
-                        pool_address=pos_data.get("pool_address", ""),
-                        token0_symbol=pos_data.get("token0_symbol", ""),
-                        token1_symbol=pos_data.get("token1_symbol", ""),
-                        fee_tier=str(pos_data.get("fee_tier", "")),
-                        liquidity=str(config.get("liquidity", "0")),
-                        is_active=pos_data.get("is_active", True),
-                        notes=pos_data.get("notes", ""),
-                        created_at=pos_data.get("created_at", ""),
-                        # Populate new fields from config
-                        position_size_usd=position_size_usd,
-                        position_value_formatted=f"${position_size_usd:,.2f}",
-                        hedge_enabled=config.get("hedge_enabled", False),
-                        target_hedge_ratio=float(config.get("target_hedge_ratio", 0.0)),
-                        hedge_details=f"Hedge: {int(float(config.get('target_hedge_ratio', 0.0)))}%" if config.get("hedge_enabled", False) else "Hedge: Disabled",
-                        api_key_name=api_key_name,
-                        api_account_value=api_account_value,
-                        total_value_usd=total_value_usd,
-                        total_value_formatted=f"${total_value_usd:,.2f}",
-                        hedge_token0=config.get("hedge_token0", True),
-                        hedge_token1=config.get("hedge_token1", True),
-                        use_dynamic_hedging=config.get("use_dynamic_hedging", False),
-                        dynamic_profile=config.get("dynamic_profile", "balanced"),
-                        rebalance_cooldown_hours=float(config.get("rebalance_cooldown_hours", 8.0)),
-                        delta_drift_threshold_pct=float(config.get("delta_drift_threshold_pct", 0.38)),
-                        down_threshold=float(config.get("down_threshold", -0.065)),
-                        bounce_threshold=float(config.get("bounce_threshold", -0.038)),
-                        lookback_hours=float(config.get("lookback_hours", 6.0)),
-                        drift_min_pct_of_capital=float(config.get("drift_min_pct_of_capital", 0.06)),
-                        max_hedge_drift_pct=float(config.get("max_hedge_drift_pct", 0.50)),
-                        last_hedge_execution=last_hedge_time_str,
-                        # New metrics object
-                        metrics=position_metrics,
-                    )
-                    self.lp_positions.append(position)
+                self.lp_positions = await build_lp_positions(
+                    supabase, auth_state.user_id, auth_state.access_token, response.data, config_response.data or [], api_keys_response.data or []
+                )
             else:
                 self.lp_positions = []
                 
@@ -1907,7 +2038,7 @@ class LPPositionState(rx.State):
     async def load_chart_data(self, position_id: str, hours: int = 24):
         """Load chart data for a position from QuestDB"""
         try:
-            from web_ui.questdb_utils import get_position_value_history
+            from web_ui.questdb_async import get_chart_series
             
             print(f"\n>>> load_chart_data called with position_id='{position_id}', hours={hours}")
             
@@ -1915,9 +2046,9 @@ class LPPositionState(rx.State):
             self.selected_chart_position_id = position_id
             self.chart_hours = hours
             
-            # Fetch data from QuestDB
-            print(f">>> Calling get_position_value_history...")
-            history = get_position_value_history(position_id, hours)
+            # Fetch downsampled data (cached per position/resolution; only new buckets are queried)
+            print(f">>> Calling get_chart_series...")
+            history = await get_chart_series(position_id, hours)
             
             print(f">>> Received {len(history)} data points from QuestDB")
             print(f">>> Setting chart_data and opening dialog...")
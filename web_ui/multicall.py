@@ -0,0 +1,121 @@
+"""
+Multicall3 batch reader for on-chain view calls
+
+Aggregates many contract view calls into a single eth_call against the
+Multicall3 contract (deployed at the same address on every supported chain).
+Each call is made with allowFailure=True, so one reverting call (e.g. a token
+without symbol()) doesn't fail the whole batch - its result is just None.
+"""
+from typing import Any, List, Optional, Sequence
+
+from web3 import Web3
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+
+from .web3_provider_pool import RPCEndpointError
+
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Minimal Multicall3 ABI (aggregate3 only)
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    }
+]
+
+# Calls per aggregate3 request - keeps request size well under RPC limits
+MULTICALL_BATCH_SIZE = 300
+
+
+def _decode_result(w3: Web3, fn, return_data: bytes) -> Any:
+    """Decode raw return data the same way ContractFunction.call() would"""
+    output_types = get_abi_output_types(fn.abi)
+    decoded = w3.codec.decode(output_types, return_data)
+    normalized = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, decoded)
+    if len(normalized) == 1:
+        return normalized[0]
+    return normalized
+
+
+def _aggregate3(w3: Web3, calls: Sequence) -> List[tuple]:
+    """Send one aggregate3 eth_call and return its (success, returnData) pairs"""
+    multicall = w3.eth.contract(
+        address=Web3.to_checksum_address(MULTICALL3_ADDRESS),
+        abi=MULTICALL3_ABI
+    )
+    payload = [(fn.address, True, fn._encode_transaction_data()) for fn in calls]
+    return multicall.functions.aggregate3(payload).call()
+
+
+def _call_individually(calls: Sequence) -> List[Optional[Any]]:
+    """Fallback for chains/RPCs where aggregate3 is unavailable"""
+    results = []
+    for fn in calls:
+        try:
+            results.append(fn.call())
+        except Exception:
+            results.append(None)
+    return results
+
+
+def multicall(w3: Web3, calls: Sequence, batch_size: int = MULTICALL_BATCH_SIZE) -> List[Optional[Any]]:
+    """
+    Execute contract view calls in as few round trips as possible.
+
+    Args:
+        w3: Web3 instance for the target network
+        calls: Bound contract functions, e.g. contract.functions.symbol()
+        batch_size: Max calls per aggregate3 request
+
+    Returns:
+        One result per call, in order. Failed calls (reverts or undecodable
+        return data) are None.
+    """
+    results: List[Optional[Any]] = []
+    for start in range(0, len(calls), batch_size):
+        chunk = calls[start:start + batch_size]
+        try:
+            raw_results = _aggregate3(w3, chunk)
+        except RPCEndpointError:
+            # Every RPC endpoint is down - individual calls would fail too
+            raise
+        except Exception as e:
+            print(f"Multicall3 aggregate failed ({e}), falling back to individual calls")
+            results.extend(_call_individually(chunk))
+            continue
+
+        for fn, (success, return_data) in zip(chunk, raw_results):
+            if not success or not return_data:
+                results.append(None)
+                continue
+            try:
+                results.append(_decode_result(w3, fn, return_data))
+            except Exception:
+                results.append(None)
+    return results
@@ -211,19 +211,10 @@ class PaymentSuccessState(rx.State):
             print("[PAYMENT SUCCESS] Updating Supabase...", flush=True)
             sys.stdout.flush()
             
-            from supabase import create_client
+            from ..auth import get_service_client
             
-            supabase_url = os.getenv("SUPABASE_URL")
-            supabase_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")  # Use service role JWT key to bypass RLS
-            print(f"[PAYMENT SUCCESS] SUPABASE_URL: {supabase_url}", flush=True)
-            sys.stdout.flush()
-            print(f"[PAYMENT SUCCESS] SUPABASE_SERVICE_ROLE_KEY exists: {bool(supabase_key)}", flush=True)
-            sys.stdout.flush()
-            
-            supabase = create_client(supabase_url, supabase_key)
-            
-            print(f"[PAYMENT SUCCESS] Supabase client created", flush=True)
-            sys.stdout.flush()
+            # Shared service role client to bypass RLS
+            supabase = get_service_client()
             
             # Query plan_tiers table to get the plan_tier_id based on tier_name
             plan_tier_id = None
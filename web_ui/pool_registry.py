@@ -0,0 +1,105 @@
+"""
+Pool address registry for Uniswap V3 style factories
+
+A pool's address is fixed by (factory, token0, token1, fee/tickSpacing), so it
+only ever needs resolving once. Resolution order:
+
+1. Addresses already resolved in this process
+2. CREATE2 computation for factories whose pool init code hash is known
+   (canonical Uniswap V3 deployments)
+3. Otherwise (Aerodrome, Project X) the caller looks it up with getPool and
+   stores it via set()
+
+data_pools isn't used as a source: it doesn't record which factory (DEX) a
+pool belongs to, so a pair/fee match could be another DEX's pool.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from eth_abi import encode
+from web3 import Web3
+
+
+# Uniswap V3 POOL_INIT_CODE_HASH, keyed by factory address (lowercase)
+POOL_INIT_CODE_HASHES = {
+    # Ethereum, Arbitrum, Polygon, Optimism
+    "0x1f98431c8ad98523631ae4a59f267346ea31f984": "0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54",
+    # Base
+    "0x33128a8fc17869897dce68ed026d694621f6fdfd": "0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54",
+}
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def compute_pool_address(factory: str, token0: str, token1: str, fee: int, init_code_hash: str) -> str:
+    """
+    Compute a Uniswap V3 pool address with CREATE2 (PoolAddress.computeAddress).
+
+    Args:
+        factory: Factory address
+        token0: First token address (sorted automatically)
+        token1: Second token address
+        fee: Pool fee in hundredths of a bip
+        init_code_hash: Pool init code hash for the factory
+
+    Returns:
+        Checksummed pool address
+    """
+    token0, token1 = sorted([token0.lower(), token1.lower()], key=lambda a: int(a, 16))
+    salt = Web3.keccak(encode(
+        ['address', 'address', 'uint24'],
+        [Web3.to_checksum_address(token0), Web3.to_checksum_address(token1), fee]
+    ))
+    digest = Web3.keccak(
+        b'\xff' + bytes.fromhex(factory[2:]) + salt + bytes.fromhex(init_code_hash[2:])
+    )
+    return Web3.to_checksum_address(digest[12:])
+
+
+class PoolRegistry:
+    """Process-wide (network, factory, token0, token1, fee/tickSpacing) -> pool address cache"""
+
+    def __init__(self):
+        self._pools: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(network: str, factory: str, token0: str, token1: str, pool_key: int) -> Tuple:
+        return (network.lower(), factory.lower(), token0.lower(), token1.lower(), int(pool_key))
+
+    def get(self, network: str, factory: str, token0: str, token1: str, pool_key: int) -> Optional[str]:
+        """
+        Resolve a pool address without RPC if possible.
+
+        Args:
+            network: Network name
+            factory: Factory address the pool belongs to
+            token0: Pool token0 address
+            token1: Pool token1 address
+            pool_key: Value passed to getPool (fee, or tickSpacing for Aerodrome)
+
+        Returns:
+            Checksummed pool address, or None if it needs a getPool lookup
+        """
+        key = self._key(network, factory, token0, token1, pool_key)
+        with self._lock:
+            address = self._pools.get(key)
+            if address:
+                return address
+
+            init_code_hash = POOL_INIT_CODE_HASHES.get(factory.lower())
+            if not init_code_hash:
+                return None
+            address = compute_pool_address(factory, token0, token1, int(pool_key), init_code_hash)
+            self._pools[key] = address
+            return address
+
+    def set(self, network: str, factory: str, token0: str, token1: str, pool_key: int, address: str):
+        """Memoize a pool address resolved by getPool (zero addresses are ignored)"""
+        if not address or int(address, 16) == 0:
+            return
+        with self._lock:
+            self._pools[self._key(network, factory, token0, token1, pool_key)] = Web3.to_checksum_address(address)
+
+
+pool_registry = PoolRegistry()
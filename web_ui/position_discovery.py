@@ -0,0 +1,154 @@
+"""
+Wallet-wide LP position discovery
+
+Lists every Uniswap V3, Aerodrome Slipstream and Project X position NFT a
+wallet owns, on all networks in NETWORK_RPCS, instead of looking up one nft_id
+at a time. Networks are scanned concurrently. On each network, one multicall
+reads balanceOf on every position manager. A second reads tokenOfOwnerByIndex
+for all owned NFTs, up to DISCOVERY_MAX_NFTS_PER_MANAGER per manager.
+read_positions_onchain then reads the positions in its usual batched round
+trips, and summarize_position shapes them exactly like the add-position
+form. Positions with zero liquidity (closed) are dropped.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from web3 import Web3
+
+from .blockchain_utils import (
+    AERODROME_POSITION_MANAGER_ADDRESSES,
+    NETWORK_RPCS,
+    POSITION_MANAGER_ADDRESSES,
+    POSITION_MANAGER_ENUMERABLE_ABI,
+    get_web3,
+    read_positions_onchain,
+    summarize_position,
+)
+from .multicall import multicall
+
+
+DISCOVERY_SCAN_WORKERS = int(os.getenv("DISCOVERY_SCAN_WORKERS", "8"))
+# NFTs enumerated per position manager (closed positions still count towards balanceOf)
+DISCOVERY_MAX_NFTS_PER_MANAGER = int(os.getenv("DISCOVERY_MAX_NFTS_PER_MANAGER", "500"))
+
+_executor = ThreadPoolExecutor(max_workers=DISCOVERY_SCAN_WORKERS, thread_name_prefix="position-discovery")
+
+
+def discovery_targets(networks: Optional[List[str]] = None) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Position managers to scan on each network.
+
+    Args:
+        networks: Networks to include (default: all of NETWORK_RPCS)
+
+    Returns:
+        Dictionary of network -> [(protocol, position manager address)]
+    """
+    targets = {}
+    for network in networks or list(NETWORK_RPCS):
+        network = network.lower()
+        managers = []
+        if network in POSITION_MANAGER_ADDRESSES:
+            # Project X is the Uniswap V3 fork on HyperEVM
+            protocol = "project_x" if network == "hyperevm" else "uniswap_v3"
+            managers.append((protocol, POSITION_MANAGER_ADDRESSES[network]))
+        if network in AERODROME_POSITION_MANAGER_ADDRESSES:
+            managers.append(("aerodrome_slipstream", AERODROME_POSITION_MANAGER_ADDRESSES[network]))
+        if managers:
+            targets[network] = managers
+    return targets
+
+
+def scan_network(network: str, owner: str, managers: List[Tuple[str, str]]) -> List[Dict]:
+    """
+    Open positions owned by a wallet on one network.
+
+    Args:
+        network: Network name
+        owner: Checksummed wallet address
+        managers: [(protocol, position manager address)] from discovery_targets
+
+    Returns:
+        Import-ready position dicts (see summarize_position) with non-zero liquidity
+    """
+    w3 = get_web3(network)
+    if not w3:
+        raise Exception(f"Could not connect to {network} network")
+
+    contracts = [
+        (protocol, w3.eth.contract(address=Web3.to_checksum_address(address), abi=POSITION_MANAGER_ENUMERABLE_ABI))
+        for protocol, address in managers
+    ]
+
+    # Round trip 1: how many NFTs the wallet holds on each manager
+    balances = multicall(w3, [contract.functions.balanceOf(owner) for _, contract in contracts])
+
+    # Round trip 2: the NFT IDs themselves
+    index_calls, call_protocols = [], []
+    for (protocol, contract), balance in zip(contracts, balances):
+        if balance is None:
+            print(f"[DISCOVERY] Could not read {protocol} balance on {network}")
+            continue
+        if balance > DISCOVERY_MAX_NFTS_PER_MANAGER:
+            print(f"[DISCOVERY] Wallet holds {balance} {protocol} NFTs on {network}, "
+                  f"only scanning the first {DISCOVERY_MAX_NFTS_PER_MANAGER}")
+            balance = DISCOVERY_MAX_NFTS_PER_MANAGER
+        for index in range(balance):
+            index_calls.append(contract.functions.tokenOfOwnerByIndex(owner, index))
+            call_protocols.append(protocol)
+    if not index_calls:
+        return []
+
+    nft_ids: Dict[str, List[str]] = {}
+    for protocol, nft_id in zip(call_protocols, multicall(w3, index_calls)):
+        if nft_id is not None:
+            nft_ids.setdefault(protocol, []).append(str(nft_id))
+
+    # Remaining round trips: batched position/token/pool/slot0 reads per protocol
+    positions = []
+    for protocol, ids in nft_ids.items():
+        for nft_id, chain_data in read_positions_onchain(network, ids, protocol).items():
+            if "error" in chain_data:
+                print(f"[DISCOVERY] Skipping {protocol} #{nft_id} on {network}: {chain_data['error']}")
+                continue
+            if chain_data["liquidity"] == 0:
+                continue
+            positions.append({"protocol": protocol, **summarize_position(network, nft_id, chain_data)})
+    return positions
+
+
+async def discover_wallet_positions(owner: str, networks: Optional[List[str]] = None) -> Dict:
+    """
+    Find every open LP position a wallet owns across all supported networks.
+
+    Args:
+        owner: Wallet address (any case)
+        networks: Networks to scan (default: all of NETWORK_RPCS)
+
+    Returns:
+        {"positions": [import-ready position dicts], "errors": {network: message}}
+        A network that can't be scanned is reported in errors without failing the rest.
+
+    Raises:
+        ValueError: If owner isn't a valid address
+    """
+    owner = Web3.to_checksum_address(owner)
+    targets = discovery_targets(networks)
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(_executor, scan_network, network, owner, managers)
+          for network, managers in targets.items()),
+        return_exceptions=True,
+    )
+
+    positions, errors = [], {}
+    for network, result in zip(targets, results):
+        if isinstance(result, Exception):
+            print(f"[DISCOVERY] Scan failed on {network}: {result}")
+            errors[network] = str(result)
+        else:
+            positions.extend(result)
+    return {"positions": positions, "errors": errors}
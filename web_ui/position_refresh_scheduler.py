@@ -0,0 +1,158 @@
+"""
+Shared server-side refresh of position snapshots
+
+Instead of every open dashboard tab polling QuestDB on its own timer, a single
+background loop refreshes the snapshot of each subscribed position_config_id
+once per POSITION_REFRESH_INTERVAL_SECONDS into a shared cache. Client states
+subscribe with the positions they show and wait for the next refresh; they
+only receive the positions whose snapshot actually changed since they last
+looked. Database load scales with distinct positions, not open tabs.
+"""
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+POSITION_REFRESH_INTERVAL_SECONDS = float(os.getenv('POSITION_REFRESH_INTERVAL_SECONDS', '60'))
+
+
+async def _fetch_snapshots(position_ids: List[str]) -> Dict[str, Dict]:
+    from .questdb_async import get_position_snapshots_concurrent
+    return await get_position_snapshots_concurrent(position_ids)
+
+
+class PositionRefreshScheduler:
+    """
+    Refreshes subscribed positions' snapshots on one shared interval.
+
+    Args:
+        interval_seconds: Time between refreshes
+        fetch: Async function returning snapshots (see get_position_snapshots)
+            for a list of position ids
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = POSITION_REFRESH_INTERVAL_SECONDS,
+        fetch: Callable[[List[str]], Awaitable[Dict[str, Dict]]] = _fetch_snapshots,
+    ):
+        self.interval_seconds = interval_seconds
+        self.fetch = fetch
+        self._subscriptions: Dict[str, Set[str]] = {}  # subscriber id -> position ids
+        self._snapshots: Dict[str, Dict] = {}  # position id -> latest snapshot
+        self._versions: Dict[str, int] = {}  # position id -> version it last changed at
+        self._version = 0
+        self._refreshed_at: Optional[float] = None
+        self._refreshed: Optional[asyncio.Condition] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _condition(self) -> asyncio.Condition:
+        if self._refreshed is None:
+            self._refreshed = asyncio.Condition()
+        return self._refreshed
+
+    def active_position_ids(self) -> List[str]:
+        """Distinct position ids across all subscribers"""
+        ids: Set[str] = set()
+        for position_ids in self._subscriptions.values():
+            ids.update(position_ids)
+        return sorted(ids)
+
+    def subscribe(self, subscriber_id: str, position_ids: Iterable[str]):
+        """
+        Register (or replace) the positions a subscriber wants refreshed.
+
+        Starts the refresh loop on the running event loop if it isn't running.
+        """
+        self._subscriptions[subscriber_id] = {pid for pid in position_ids if pid}
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def unsubscribe(self, subscriber_id: str):
+        self._subscriptions.pop(subscriber_id, None)
+
+    def get_snapshots(self, position_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Cached snapshots for the given positions (positions not refreshed yet are omitted)"""
+        return {pid: self._snapshots[pid] for pid in position_ids if pid in self._snapshots}
+
+    def changes_since(self, position_ids: Iterable[str], version: int) -> Dict[str, Dict]:
+        """Cached snapshots of the given positions that changed after version"""
+        return {
+            pid: self._snapshots[pid]
+            for pid in position_ids
+            if self._versions.get(pid, 0) > version
+        }
+
+    async def refresh(self):
+        """Fetch every subscribed position once and record which snapshots changed"""
+        position_ids = self.active_position_ids()
+        if position_ids:
+            snapshots = await self.fetch(position_ids)
+            changed = [pid for pid, snapshot in snapshots.items() if self._snapshots.get(pid) != snapshot]
+            if changed:
+                self._version += 1
+                for pid in changed:
+                    self._snapshots[pid] = snapshots[pid]
+                    self._versions[pid] = self._version
+
+        # Forget positions nobody is watching any more
+        active = set(position_ids)
+        for pid in [pid for pid in self._snapshots if pid not in active]:
+            self._snapshots.pop(pid, None)
+            self._versions.pop(pid, None)
+
+        self._refreshed_at = time.monotonic()
+        condition = self._condition()
+        async with condition:
+            condition.notify_all()
+
+    async def wait_for_refresh(
+        self, position_ids: Iterable[str], since_version: int, timeout: Optional[float] = None
+    ) -> Tuple[int, Dict[str, Dict]]:
+        """
+        Wait for the next refresh cycle.
+
+        Args:
+            position_ids: Positions the caller shows
+            since_version: Version the caller last saw (scheduler.version when it loaded)
+            timeout: Give up waiting after this many seconds (defaults to two intervals)
+
+        Returns:
+            Tuple of (current version, snapshots of position_ids that changed since since_version)
+        """
+        condition = self._condition()
+        try:
+            async with condition:
+                await asyncio.wait_for(condition.wait(), timeout or 2 * self.interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        return self._version, self.changes_since(position_ids, since_version)
+
+    async def _run(self):
+        while True:
+            if not self._subscriptions:
+                self._task = None
+                return
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"[REFRESH SCHEDULER] Refresh failed: {e}", flush=True)
+            await asyncio.sleep(self.interval_seconds)
+
+    def stats(self) -> Dict:
+        return {
+            'subscribers': len(self._subscriptions),
+            'positions': len(self.active_position_ids()),
+            'version': self._version,
+            'seconds_since_refresh': (
+                round(time.monotonic() - self._refreshed_at, 1) if self._refreshed_at is not None else None
+            ),
+        }
+
+
+position_refresh_scheduler = PositionRefreshScheduler()
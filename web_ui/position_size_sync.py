@@ -0,0 +1,179 @@
+"""
+Write-behind sync of position_size_usd back to Supabase
+
+Loading positions used to issue one position_configs UPDATE per position on
+every dashboard load. Instead, load_positions records the QuestDB LP value
+here and returns immediately; a background thread coalesces the latest value
+per position and writes them at most once per
+POSITION_SIZE_SYNC_INTERVAL_SECONDS, in one update_position_sizes RPC call
+per user. Values that moved less than the threshold from what's stored are
+not written at all.
+"""
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+
+POSITION_SIZE_SYNC_INTERVAL_SECONDS = float(os.getenv('POSITION_SIZE_SYNC_INTERVAL_SECONDS', '60'))
+# A change is written when it exceeds either threshold
+POSITION_SIZE_SYNC_MIN_CHANGE_USD = float(os.getenv('POSITION_SIZE_SYNC_MIN_CHANGE_USD', '1.0'))
+POSITION_SIZE_SYNC_MIN_CHANGE_PCT = float(os.getenv('POSITION_SIZE_SYNC_MIN_CHANGE_PCT', '0.5'))
+# Written sizes remembered until a load reads them back (oldest dropped beyond this)
+WRITTEN_CACHE_SIZE = 10000
+
+
+def client_for_token(access_token: str):
+    """
+    Supabase client to flush a user's sizes with, or None once their token has expired.
+
+    Writes always run as the user, so RLS applies. Sizes whose token expired
+    are dropped; the user's next dashboard load records them again.
+    """
+    from web_ui.auth import TOKEN_EXPIRY_LEEWAY_SECONDS, _token_expiry, get_supabase_client
+    if access_token and time.time() < _token_expiry(access_token) - TOKEN_EXPIRY_LEEWAY_SECONDS:
+        return get_supabase_client(access_token)
+    return None
+
+
+def write_position_sizes(supabase, sizes_by_id: Dict[str, float]):
+    """
+    Save position_size_usd for many positions in one call.
+
+    Falls back to per-row updates if the update_position_sizes function
+    hasn't been created yet (see migrations/add_update_position_sizes_function.sql).
+    """
+    rows = [{"id": position_id, "position_size_usd": size} for position_id, size in sizes_by_id.items()]
+    if not rows:
+        return
+
+    try:
+        supabase.rpc("update_position_sizes", {"sizes": rows}).execute()
+        return
+    except Exception as e:
+        print(f"Batch position size update unavailable, updating rows individually: {e}")
+
+    for row in rows:
+        try:
+            supabase.table("position_configs").update({
+                "position_size_usd": row["position_size_usd"]
+            }).eq("id", row["id"]).execute()
+        except Exception as e:
+            print(f"Warning: Failed to sync position_size_usd to Supabase: {e}")
+
+
+class PositionSizeSync:
+    """
+    Coalescing write-behind queue for position_size_usd.
+
+    Args:
+        interval_seconds: Minimum time between flushes
+        min_change_usd: Absolute change that's worth writing
+        min_change_pct: Relative change (percent of the stored value) that's worth writing
+        client_factory: Builds the Supabase client for an access token at flush time (None if expired)
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = POSITION_SIZE_SYNC_INTERVAL_SECONDS,
+        min_change_usd: float = POSITION_SIZE_SYNC_MIN_CHANGE_USD,
+        min_change_pct: float = POSITION_SIZE_SYNC_MIN_CHANGE_PCT,
+        client_factory: Callable = client_for_token,
+    ):
+        self.interval_seconds = interval_seconds
+        self.min_change_usd = min_change_usd
+        self.min_change_pct = min_change_pct
+        self.client_factory = client_factory
+        self._pending: Dict[str, tuple] = {}  # position id -> (size, user id, access token)
+        self._written: "OrderedDict[str, float]" = OrderedDict()  # position id -> size written, until read back
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _significant(self, new_size: float, stored_size: Optional[float]) -> bool:
+        if stored_size is None:
+            return True
+        change = abs(new_size - stored_size)
+        return change >= self.min_change_usd or change >= abs(stored_size) * self.min_change_pct / 100
+
+    def record(self, user_id: str, access_token: str, position_id: str, new_size: float, stored_size: Optional[float] = None):
+        """
+        Queue a position's current LP value for write-back (non-blocking).
+
+        Args:
+            user_id: Owner of the position
+            access_token: User's access token (the client is built from it when flushing)
+            position_id: position_configs id
+            new_size: Current LP value in USD
+            stored_size: position_size_usd as currently stored in Supabase
+        """
+        with self._lock:
+            # Compare against what we last wrote too, in case the row was read before that write landed
+            baseline = self._written.get(position_id, stored_size)
+            if stored_size is not None and baseline == stored_size:
+                # The row has caught up with our write
+                self._written.pop(position_id, None)
+            if not self._significant(new_size, stored_size) or not self._significant(new_size, baseline):
+                self._pending.pop(position_id, None)
+                return
+            self._pending[position_id] = (new_size, user_id, access_token)
+            self._ensure_worker()
+
+    def _ensure_worker(self):
+        """Start the flush thread (lock must be held)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='position-size-sync', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._wakeup.wait(self.interval_seconds):
+            self.flush()
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        Write all queued sizes now.
+
+        Returns:
+            Number of positions written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        # One batch per user, written with their most recently recorded token
+        batches: Dict[str, list] = {}
+        for position_id, (size, user_id, access_token) in pending.items():
+            batch = batches.setdefault(user_id, [access_token, {}])
+            batch[0] = access_token or batch[0]
+            batch[1][position_id] = size
+
+        written = 0
+        for access_token, sizes in batches.values():
+            try:
+                supabase = self.client_factory(access_token)
+                if supabase is None:
+                    print(f"Skipping {len(sizes)} position size(s): access token expired")
+                    continue
+                write_position_sizes(supabase, sizes)
+            except Exception as e:
+                print(f"Warning: Failed to sync position sizes to Supabase: {e}")
+                continue
+            with self._lock:
+                for position_id, size in sizes.items():
+                    self._written[position_id] = size
+                    self._written.move_to_end(position_id)
+                while len(self._written) > WRITTEN_CACHE_SIZE:
+                    self._written.popitem(last=False)
+            written += len(sizes)
+        return written
+
+
+position_size_sync = PositionSizeSync()
+atexit.register(position_size_sync.flush)
@@ -0,0 +1,105 @@
+"""
+Async QuestDB access for Reflex event handlers
+
+Same function surface as questdb_utils, but each call runs on a bounded
+thread pool so blocking psycopg2 I/O never stalls the event loop. The pool
+is sized to the QuestDB connection pool so worker threads don't queue up
+waiting for connections.
+"""
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from . import questdb_utils
+
+
+# Positions per snapshot query and concurrent snapshot queries when refreshing many positions
+SNAPSHOT_BATCH_SIZE = int(os.getenv('QUESTDB_SNAPSHOT_BATCH_SIZE', '25'))
+SNAPSHOT_MAX_CONCURRENCY = int(os.getenv('QUESTDB_SNAPSHOT_MAX_CONCURRENCY', '4'))
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('QUESTDB_ASYNC_WORKERS', os.getenv('QUESTDB_POOL_MAX_SIZE', '10'))),
+    thread_name_prefix='questdb',
+)
+
+
+async def run_questdb(func: Callable, *args, **kwargs):
+    """Run a blocking QuestDB call on the QuestDB executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+async def get_position_value_history(position_id: str, hours: int = 24) -> List[Dict]:
+    return await run_questdb(questdb_utils.get_position_value_history, position_id, hours)
+
+
+async def get_sampled_position_value_history(
+    position_id: str,
+    hours: int = 24,
+    target_points: int = questdb_utils.CHART_TARGET_POINTS,
+    since: Optional[datetime] = None,
+) -> List[Dict]:
+    return await run_questdb(
+        questdb_utils.get_sampled_position_value_history, position_id, hours, target_points, since
+    )
+
+
+async def get_latest_position_values(position_id: str) -> Optional[Dict]:
+    return await run_questdb(questdb_utils.get_latest_position_values, position_id)
+
+
+async def get_first_position_values(position_id: str) -> Optional[Dict]:
+    return await run_questdb(questdb_utils.get_first_position_values, position_id)
+
+
+async def get_accumulated_fees(position_id: str) -> Optional[Dict]:
+    return await run_questdb(questdb_utils.get_accumulated_fees, position_id)
+
+
+async def get_last_hedge_execution(position_id: str) -> Optional[datetime]:
+    return await run_questdb(questdb_utils.get_last_hedge_execution, position_id)
+
+
+async def get_position_snapshots(position_ids: List[str]) -> Dict[str, Dict]:
+    return await run_questdb(questdb_utils.get_position_snapshots, position_ids)
+
+
+async def get_position_snapshots_concurrent(
+    position_ids: List[str],
+    batch_size: int = SNAPSHOT_BATCH_SIZE,
+    max_concurrency: int = SNAPSHOT_MAX_CONCURRENCY,
+) -> Dict[str, Dict]:
+    """
+    get_position_snapshots fanned out over batches of positions.
+
+    Batches run concurrently (at most max_concurrency at a time), so refresh
+    time tracks the slowest batch rather than the sum of all of them.
+    """
+    position_ids = [pid for pid in dict.fromkeys(position_ids) if pid]
+    if len(position_ids) <= batch_size:
+        return await get_position_snapshots(position_ids)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_batch(batch: List[str]) -> Dict[str, Dict]:
+        async with semaphore:
+            return await get_position_snapshots(batch)
+
+    batches = [position_ids[i:i + batch_size] for i in range(0, len(position_ids), batch_size)]
+    snapshots: Dict[str, Dict] = {}
+    for batch_result in await asyncio.gather(*(fetch_batch(batch) for batch in batches)):
+        snapshots.update(batch_result)
+    return snapshots
+
+
+async def get_latest_regime_tracking(position_id: str) -> Optional[Dict]:
+    return await run_questdb(questdb_utils.get_latest_regime_tracking, position_id)
+
+
+async def get_chart_series(position_id: str, hours: int = 24) -> List[Dict]:
+    """Async wrapper for chart_series_cache.get_series"""
+    from .chart_cache import chart_series_cache
+    return await run_questdb(chart_series_cache.get_series, position_id, hours)
@@ -0,0 +1,264 @@
+"""
+Thread-safe connection pool for QuestDB (PG-wire via psycopg2)
+
+Connections are borrowed per query and returned afterwards instead of being
+opened and closed for every call. Idle connections are health-checked before
+reuse and reaped once they have been idle for too long.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+import psycopg2
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the acquire timeout"""
+
+
+class QuestDBConnectionPool:
+    """
+    Bounded pool of psycopg2 connections.
+
+    Args:
+        connect: Callable returning a new DB-API connection
+        min_size: Connections kept open even when idle
+        max_size: Hard cap on open connections (idle + in use)
+        max_idle_seconds: Idle connections above min_size are closed after this
+        health_check_seconds: Idle connections older than this are pinged before reuse
+        acquire_timeout: Seconds to wait for a free connection before giving up
+    """
+
+    def __init__(
+        self,
+        connect: Callable,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle_seconds: float = 300.0,
+        health_check_seconds: float = 30.0,
+        acquire_timeout: float = 10.0,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._connect = connect
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.health_check_seconds = health_check_seconds
+        self.acquire_timeout = acquire_timeout
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle: List[Tuple[object, float]] = []  # (connection, returned_at), LIFO
+        self._in_use = set()
+        self._closed = False
+
+        # Metrics
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._timeouts = 0
+        self._opened = 0
+        self._discarded = 0
+        self._reaped = 0
+        self._health_check_failures = 0
+
+    def _open_connection(self):
+        """Open a new connection (called without the lock held)"""
+        conn = self._connect()
+        try:
+            # Read-only workload: autocommit keeps connections out of idle transactions
+            conn.autocommit = True
+        except Exception:
+            pass
+        return conn
+
+    def _is_healthy(self, conn) -> bool:
+        """Ping a connection with SELECT 1"""
+        if getattr(conn, 'closed', 0):
+            return False
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _open_count(self) -> int:
+        return len(self._idle) + len(self._in_use)
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Borrow a connection from the pool, opening one if below max_size.
+
+        Blocks until a connection is free or the timeout expires.
+
+        Raises:
+            PoolTimeoutError: If no connection became available in time
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        wait_started = 0.0
+
+        while True:
+            candidate = None
+            reserve_slot = False
+            with self._available:
+                if self._closed:
+                    raise RuntimeError("QuestDB connection pool is closed")
+
+                while not self._idle and self._open_count() >= self.max_size:
+                    if not waited:
+                        waited = True
+                        wait_started = time.monotonic()
+                        self._waits += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        self._wait_time_total += time.monotonic() - wait_started
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout:.1f}s waiting for a QuestDB connection "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._available.wait(remaining)
+
+                if waited:
+                    self._wait_time_total += time.monotonic() - wait_started
+                    waited = False
+
+                if self._idle:
+                    candidate, returned_at = self._idle.pop()
+                    needs_check = (time.monotonic() - returned_at) >= self.health_check_seconds
+                else:
+                    needs_check = False
+                    reserve_slot = True
+                # Count the connection (or the slot being opened) as in use
+                # so concurrent callers respect max_size
+                token = candidate if candidate is not None else object()
+                self._in_use.add(token)
+
+            if reserve_slot:
+                try:
+                    conn = self._open_connection()
+                except Exception:
+                    with self._available:
+                        self._in_use.discard(token)
+                        self._available.notify()
+                    raise
+                with self._available:
+                    self._in_use.discard(token)
+                    self._in_use.add(conn)
+                    self._opened += 1
+                    self._checkouts += 1
+                return conn
+
+            if needs_check and not self._is_healthy(candidate):
+                self._close_quietly(candidate)
+                with self._available:
+                    self._in_use.discard(candidate)
+                    self._health_check_failures += 1
+                    self._discarded += 1
+                    self._available.notify()
+                continue
+
+            with self._available:
+                self._checkouts += 1
+            return candidate
+
+    def release(self, conn, discard: bool = False):
+        """
+        Return a borrowed connection to the pool.
+
+        Args:
+            conn: Connection obtained from acquire()
+            discard: Close the connection instead of reusing it (e.g. after a network error)
+        """
+        close_now = discard or bool(getattr(conn, 'closed', 0))
+        with self._available:
+            self._in_use.discard(conn)
+            if self._closed:
+                close_now = True
+            if close_now:
+                self._discarded += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._available.notify()
+
+        if close_now:
+            self._close_quietly(conn)
+        self.reap_idle()
+
+    def reap_idle(self) -> int:
+        """Close idle connections above min_size that exceeded max_idle_seconds"""
+        now = time.monotonic()
+        to_close = []
+        with self._available:
+            keep = []
+            # Oldest connections are at the front of the LIFO list
+            for conn, returned_at in self._idle:
+                surplus = self._open_count() - len(to_close) > self.min_size
+                if surplus and (now - returned_at) >= self.max_idle_seconds:
+                    to_close.append(conn)
+                else:
+                    keep.append((conn, returned_at))
+            self._idle = keep
+            self._reaped += len(to_close)
+
+        for conn in to_close:
+            self._close_quietly(conn)
+        return len(to_close)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # Connection-level failure: don't hand this connection out again
+            discard = True
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def stats(self) -> Dict:
+        """Snapshot of pool metrics for sizing under load"""
+        with self._available:
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'open_connections': self._open_count(),
+                'idle_connections': len(self._idle),
+                'in_use_connections': len(self._in_use),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time_total_s': round(self._wait_time_total, 4),
+                'timeouts': self._timeouts,
+                'connections_opened': self._opened,
+                'connections_discarded': self._discarded,
+                'connections_reaped': self._reaped,
+                'health_check_failures': self._health_check_failures,
+            }
+
+    def close_all(self):
+        """Close idle connections and stop handing out new ones"""
+        with self._available:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle = []
+            self._available.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
@@ -2,14 +2,23 @@
 QuestDB utility functions for querying hedge state and position data
 """
 import os
+import threading
+from contextlib import contextmanager
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
+from .questdb_pool import QuestDBConnectionPool
+from .baseline_cache import baseline_cache
+
+
+_pool: Optional[QuestDBConnectionPool] = None
+_pool_lock = threading.Lock()
+
 
 def get_questdb_connection():
-    """Create and return a QuestDB connection"""
+    """Create and return a new (unpooled) QuestDB connection"""
     questdb_host = os.getenv('QUESTDB_HOST', 'localhost')
     questdb_port = os.getenv('QUESTDB_PORT', '8812')
     questdb_user = os.getenv('QUESTDB_USER', 'admin')
@@ -27,6 +36,88 @@ def get_questdb_connection():
     return conn
 
 
+def get_questdb_pool() -> QuestDBConnectionPool:
+    """
+    Get the process-wide QuestDB connection pool, creating it on first use.
+    Sized via QUESTDB_POOL_MIN_SIZE / QUESTDB_POOL_MAX_SIZE and friends.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = QuestDBConnectionPool(
+                    connect=get_questdb_connection,
+                    min_size=int(os.getenv('QUESTDB_POOL_MIN_SIZE', '1')),
+                    max_size=int(os.getenv('QUESTDB_POOL_MAX_SIZE', '10')),
+                    max_idle_seconds=float(os.getenv('QUESTDB_POOL_MAX_IDLE_SECONDS', '300')),
+                    health_check_seconds=float(os.getenv('QUESTDB_POOL_HEALTH_CHECK_SECONDS', '30')),
+                    acquire_timeout=float(os.getenv('QUESTDB_POOL_ACQUIRE_TIMEOUT', '10')),
+                )
+    return _pool
+
+
+@contextmanager
+def questdb_cursor():
+    """Borrow a pooled connection and yield a RealDictCursor on it"""
+    with get_questdb_pool().connection() as conn:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+
+def get_questdb_pool_stats() -> Dict:
+    """Return QuestDB pool metrics (open connections, checkouts, waits, ...)"""
+    return get_questdb_pool().stats()
+
+
+def _format_fees(result: Dict) -> Dict:
+    """Convert a fee_log row into the fee dict used by the dashboard"""
+    return {
+        'fee_usd_total': float(result['fee_usd_total']) if result['fee_usd_total'] else 0.0,
+        'fee_amount_0': float(result['fee_amount_0']) if result['fee_amount_0'] else 0.0,
+        'fee_amount_1': float(result['fee_amount_1']) if result['fee_amount_1'] else 0.0,
+        'fee_usd_0': float(result['fee_usd_0']) if result['fee_usd_0'] else 0.0,
+        'fee_usd_1': float(result['fee_usd_1']) if result['fee_usd_1'] else 0.0,
+        'token0_symbol': result['token0_symbol'] if result['token0_symbol'] else '',
+        'token1_symbol': result['token1_symbol'] if result['token1_symbol'] else '',
+    }
+
+
+def _format_latest_values(result: Dict, fees: Optional[Dict]) -> Dict:
+    """Convert the latest hedge_state row (plus fees) into the latest-values dict"""
+    fee_usd_total = fees['fee_usd_total'] if fees else 0.0
+    return {
+        'timestamp': result['timestamp'].isoformat() if result['timestamp'] else None,
+        'lp_value_usd': float(result['lp_value_usd']) if result['lp_value_usd'] else 0.0,
+        'hl_account_value': float(result['hl_account_value']) if result['hl_account_value'] else 0.0,
+        'total_value': float(result['total_value']) + fee_usd_total if result['total_value'] else fee_usd_total,
+        'lp_il_usd': float(result['lp_il_usd']) if result['lp_il_usd'] is not None else None,
+        'lp_il_pct': float(result['lp_il_pct']) if result['lp_il_pct'] is not None else None,
+        'lp_utilization_pct': float(result['lp_utilization_pct']) if result['lp_utilization_pct'] is not None else None,
+        'lp_distance_to_lower_pct': float(result['lp_distance_to_lower_pct']) if result['lp_distance_to_lower_pct'] is not None else None,
+        'lp_distance_to_upper_pct': float(result['lp_distance_to_upper_pct']) if result['lp_distance_to_upper_pct'] is not None else None,
+        'fee_usd_total': fee_usd_total,
+        'fee_amount_0': fees['fee_amount_0'] if fees else 0.0,
+        'fee_amount_1': fees['fee_amount_1'] if fees else 0.0,
+        'fee_usd_0': fees['fee_usd_0'] if fees else 0.0,
+        'fee_usd_1': fees['fee_usd_1'] if fees else 0.0,
+        'token0_symbol': fees['token0_symbol'] if fees else '',
+        'token1_symbol': fees['token1_symbol'] if fees else '',
+    }
+
+
+def _format_first_values(result: Dict) -> Dict:
+    """Convert the first hedge_state row into the entry-baseline dict"""
+    return {
+        'timestamp': result['timestamp'].isoformat() if result['timestamp'] else None,
+        'lp_value_usd': float(result['lp_value_usd']) if result['lp_value_usd'] else 0.0,
+        'hl_account_value': float(result['hl_account_value']) if result['hl_account_value'] else 0.0,
+        'total_value': float(result['total_value']) if result['total_value'] else 0.0,
+    }
+
+
 def get_position_value_history(position_id: str, hours: int = 24) -> List[Dict]:
     """
     Get historical LP value and hedge account value for a position
@@ -43,34 +134,29 @@ def get_position_value_history(position_id: str, hours: int = 24) -> List[Dict]:
         print(f"Position ID: {position_id}")
         print(f"Hours: {hours}")
         
-        conn = get_questdb_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Calculate timestamp for X hours ago
-        time_ago = datetime.utcnow() - timedelta(hours=hours)
-        print(f"Querying data from: {time_ago} to now")
-        
-        # Query hedge_state table for position history
-        query = """
-            SELECT 
-                time as timestamp,
-                lp_value_usd,
-                hl_account_value,
-                (lp_value_usd + hl_account_value) as total_value
-            FROM hedge_state
-            WHERE position_id = %s
-            AND time >= %s
-            ORDER BY time ASC
-        """
-        
-        print(f"Executing query with position_id='{position_id}'")
-        cursor.execute(query, (position_id, time_ago))
-        results = cursor.fetchall()
-        
-        print(f"Query returned {len(results)} rows")
-        
-        cursor.close()
-        conn.close()
+        with questdb_cursor() as cursor:
+            # Calculate timestamp for X hours ago
+            time_ago = datetime.utcnow() - timedelta(hours=hours)
+            print(f"Querying data from: {time_ago} to now")
+            
+            # Query hedge_state table for position history
+            query = """
+                SELECT 
+                    time as timestamp,
+                    lp_value_usd,
+                    hl_account_value,
+                    (lp_value_usd + hl_account_value) as total_value
+                FROM hedge_state
+                WHERE position_id = %s
+                AND time >= %s
+                ORDER BY time ASC
+            """
+            
+            print(f"Executing query with position_id='{position_id}'")
+            cursor.execute(query, (position_id, time_ago))
+            results = cursor.fetchall()
+            
+            print(f"Query returned {len(results)} rows")
         
         # Convert to list of dicts with formatted data
         history = []
@@ -103,6 +189,130 @@ def get_position_value_history(position_id: str, hours: int = 24) -> List[Dict]:
         return []
 
 
+# Default number of points returned for chart history
+CHART_TARGET_POINTS = 500
+
+# Candidate SAMPLE BY buckets as (seconds, QuestDB unit), smallest first
+SAMPLE_INTERVALS = [
+    (10, '10s'),
+    (30, '30s'),
+    (60, '1m'),
+    (120, '2m'),
+    (300, '5m'),
+    (600, '10m'),
+    (900, '15m'),
+    (1800, '30m'),
+    (3600, '1h'),
+    (7200, '2h'),
+    (14400, '4h'),
+    (21600, '6h'),
+    (43200, '12h'),
+    (86400, '1d'),
+]
+
+
+def choose_sample_interval(hours: float, target_points: int = CHART_TARGET_POINTS) -> tuple:
+    """
+    Pick the smallest SAMPLE BY bucket that keeps a window under target_points buckets.
+
+    Args:
+        hours: Window length in hours
+        target_points: Maximum number of buckets wanted
+
+    Returns:
+        (bucket_seconds, sample_by_unit) e.g. (300, '5m')
+    """
+    required_seconds = (hours * 3600) / max(target_points, 1)
+    for seconds, unit in SAMPLE_INTERVALS:
+        if seconds >= required_seconds:
+            return seconds, unit
+    return SAMPLE_INTERVALS[-1]
+
+
+def _format_sampled_row(row: Dict) -> Dict:
+    """Convert a SAMPLE BY bucket into a chart point (last values + OHLC)"""
+    dt = row['timestamp']
+    timestamp_display = f"{dt.day:02d}-{dt.month:02d} {dt.hour:02d}:{dt.minute:02d}" if dt else ""
+
+    def _round(value):
+        return round(float(value), 2) if value else 0.0
+
+    return {
+        'time': dt.isoformat() if dt else '',  # Bucket start, used as incremental cursor
+        'timestamp': timestamp_display,
+        'lp_value_usd': _round(row['lp_value_usd']),
+        'hl_account_value': _round(row['hl_account_value']),
+        # Round the total once, from the unrounded parts
+        'total_value': round(float(row['lp_value_usd'] or 0) + float(row['hl_account_value'] or 0), 2),
+        'lp_open': _round(row['lp_open']),
+        'lp_high': _round(row['lp_high']),
+        'lp_low': _round(row['lp_low']),
+        'hl_open': _round(row['hl_open']),
+        'hl_high': _round(row['hl_high']),
+        'hl_low': _round(row['hl_low']),
+    }
+
+
+def get_sampled_position_value_history(
+    position_id: str,
+    hours: int = 24,
+    target_points: int = CHART_TARGET_POINTS,
+    since: Optional[datetime] = None,
+) -> List[Dict]:
+    """
+    Get downsampled LP value and hedge account value history for a position.
+    Uses QuestDB SAMPLE BY so the number of points stays near target_points
+    regardless of the window length.
+
+    Args:
+        position_id: The position ID to query
+        hours: Number of hours of history to fetch (default 24)
+        target_points: Maximum number of points to return (default 500)
+        since: Only return buckets starting at or after this time (incremental refresh).
+            Overrides the hours window start; bucket size is still derived from hours.
+
+    Returns:
+        List of dicts with timestamp, lp_value_usd, hl_account_value, total_value (last value
+        in each bucket) plus lp_open/lp_high/lp_low and hl_open/hl_high/hl_low
+    """
+    try:
+        _, sample_unit = choose_sample_interval(hours, target_points)
+        time_ago = since if since is not None else datetime.utcnow() - timedelta(hours=hours)
+
+        # sample_unit comes from SAMPLE_INTERVALS, never from user input
+        query = f"""
+            SELECT
+                time as timestamp,
+                first(lp_value_usd) as lp_open,
+                max(lp_value_usd) as lp_high,
+                min(lp_value_usd) as lp_low,
+                last(lp_value_usd) as lp_value_usd,
+                first(hl_account_value) as hl_open,
+                max(hl_account_value) as hl_high,
+                min(hl_account_value) as hl_low,
+                last(hl_account_value) as hl_account_value
+            FROM hedge_state
+            WHERE position_id = %s
+            AND time >= %s
+            SAMPLE BY {sample_unit} ALIGN TO CALENDAR
+            ORDER BY time ASC
+        """
+
+        with questdb_cursor() as cursor:
+            cursor.execute(query, (position_id, time_ago))
+            results = cursor.fetchall()
+
+        history = [_format_sampled_row(row) for row in results]
+        print(f"[SAMPLED HISTORY] position={position_id} hours={hours} bucket={sample_unit} points={len(history)}")
+        return history
+
+    except Exception as e:
+        print(f"❌ Error fetching sampled position value history: {e}")
+        import traceback
+        traceback.print_exc()
+        return []
+
+
 def get_latest_position_values(position_id: str) -> Optional[Dict]:
     """
     Get the most recent LP value and hedge account value for a position
@@ -114,55 +324,31 @@ def get_latest_position_values(position_id: str) -> Optional[Dict]:
         Dict with lp_value_usd, hl_account_value, total_value (including fees), timestamp, and fee data
     """
     try:
-        conn = get_questdb_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        query = """
-            SELECT 
-                time as timestamp,
-                lp_value_usd,
-                hl_account_value,
-                (lp_value_usd + hl_account_value) as total_value,
-                lp_il_usd,
-                lp_il_pct,
-                lp_utilization_pct,
-                lp_distance_to_lower_pct,
-                lp_distance_to_upper_pct
-            FROM hedge_state
-            WHERE position_id = %s
-            ORDER BY time DESC
-            LIMIT 1
-        """
-        
-        cursor.execute(query, (position_id,))
-        result = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
+        with questdb_cursor() as cursor:
+            query = """
+                SELECT 
+                    time as timestamp,
+                    lp_value_usd,
+                    hl_account_value,
+                    (lp_value_usd + hl_account_value) as total_value,
+                    lp_il_usd,
+                    lp_il_pct,
+                    lp_utilization_pct,
+                    lp_distance_to_lower_pct,
+                    lp_distance_to_upper_pct
+                FROM hedge_state
+                WHERE position_id = %s
+                ORDER BY time DESC
+                LIMIT 1
+            """
+            
+            cursor.execute(query, (position_id,))
+            result = cursor.fetchone()
         
         if result:
             # Get accumulated fees
             fees = get_accumulated_fees(position_id)
-            fee_usd_total = fees['fee_usd_total'] if fees else 0.0
-            
-            return {
-                'timestamp': result['timestamp'].isoformat() if result['timestamp'] else None,
-                'lp_value_usd': float(result['lp_value_usd']) if result['lp_value_usd'] else 0.0,
-                'hl_account_value': float(result['hl_account_value']) if result['hl_account_value'] else 0.0,
-                'total_value': float(result['total_value']) + fee_usd_total if result['total_value'] else fee_usd_total,
-                'lp_il_usd': float(result['lp_il_usd']) if result['lp_il_usd'] is not None else None,
-                'lp_il_pct': float(result['lp_il_pct']) if result['lp_il_pct'] is not None else None,
-                'lp_utilization_pct': float(result['lp_utilization_pct']) if result['lp_utilization_pct'] is not None else None,
-                'lp_distance_to_lower_pct': float(result['lp_distance_to_lower_pct']) if result['lp_distance_to_lower_pct'] is not None else None,
-                'lp_distance_to_upper_pct': float(result['lp_distance_to_upper_pct']) if result['lp_distance_to_upper_pct'] is not None else None,
-                'fee_usd_total': fee_usd_total,
-                'fee_amount_0': fees['fee_amount_0'] if fees else 0.0,
-                'fee_amount_1': fees['fee_amount_1'] if fees else 0.0,
-                'fee_usd_0': fees['fee_usd_0'] if fees else 0.0,
-                'fee_usd_1': fees['fee_usd_1'] if fees else 0.0,
-                'token0_symbol': fees['token0_symbol'] if fees else '',
-                'token1_symbol': fees['token1_symbol'] if fees else '',
-            }
+            return _format_latest_values(result, fees)
         
         return None
         
@@ -183,35 +369,32 @@ def get_first_position_values(position_id: str) -> Optional[Dict]:
     Returns:
         dict with first_lp_value, first_hedge_value, first_total_value (LP + Hedge only), or None if no data
     """
+    # The first row never changes once written, so serve it from the baseline cache
+    cached = baseline_cache.get(position_id)
+    if cached:
+        return cached
+    
     try:
-        conn = get_questdb_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        query = """
-            SELECT 
-                time as timestamp,
-                lp_value_usd,
-                hl_account_value,
-                (lp_value_usd + hl_account_value) as total_value
-            FROM hedge_state
-            WHERE position_id = %s
-            ORDER BY time ASC
-            LIMIT 1
-        """
-        
-        cursor.execute(query, (position_id,))
-        result = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
+        with questdb_cursor() as cursor:
+            query = """
+                SELECT 
+                    time as timestamp,
+                    lp_value_usd,
+                    hl_account_value,
+                    (lp_value_usd + hl_account_value) as total_value
+                FROM hedge_state
+                WHERE position_id = %s
+                ORDER BY time ASC
+                LIMIT 1
+            """
+            
+            cursor.execute(query, (position_id,))
+            result = cursor.fetchone()
         
         if result:
-            return {
-                'timestamp': result['timestamp'].isoformat() if result['timestamp'] else None,
-                'lp_value_usd': float(result['lp_value_usd']) if result['lp_value_usd'] else 0.0,
-                'hl_account_value': float(result['hl_account_value']) if result['hl_account_value'] else 0.0,
-                'total_value': float(result['total_value']) if result['total_value'] else 0.0,
-            }
+            first_values = _format_first_values(result)
+            baseline_cache.set(position_id, first_values)
+            return first_values
         
         return None
         
@@ -234,43 +417,30 @@ def get_accumulated_fees(position_id: str) -> Optional[Dict]:
     """
     try:
         print(f"[GET_ACCUMULATED_FEES] Querying fees for position_id: {position_id}", flush=True)
-        conn = get_questdb_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        # Get the LATEST fee entry (fee_log already has cumulative totals)
-        query = """
-            SELECT 
-                fee_usd_total,
-                fee_amount_0,
-                fee_amount_1,
-                fee_usd_0,
-                fee_usd_1,
-                token0_symbol,
-                token1_symbol
-            FROM fee_log
-            WHERE position_id = %s
-            ORDER BY time DESC
-            LIMIT 1
-        """
-        
-        cursor.execute(query, (position_id,))
-        result = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
+        with questdb_cursor() as cursor:
+            # Get the LATEST fee entry (fee_log already has cumulative totals)
+            query = """
+                SELECT 
+                    fee_usd_total,
+                    fee_amount_0,
+                    fee_amount_1,
+                    fee_usd_0,
+                    fee_usd_1,
+                    token0_symbol,
+                    token1_symbol
+                FROM fee_log
+                WHERE position_id = %s
+                ORDER BY time DESC
+                LIMIT 1
+            """
+            
+            cursor.execute(query, (position_id,))
+            result = cursor.fetchone()
         
         print(f"[GET_ACCUMULATED_FEES] Query result: {result}", flush=True)
         
         if result and result['fee_usd_total'] is not None:
-            fee_data = {
-                'fee_usd_total': float(result['fee_usd_total']) if result['fee_usd_total'] else 0.0,
-                'fee_amount_0': float(result['fee_amount_0']) if result['fee_amount_0'] else 0.0,
-                'fee_amount_1': float(result['fee_amount_1']) if result['fee_amount_1'] else 0.0,
-                'fee_usd_0': float(result['fee_usd_0']) if result['fee_usd_0'] else 0.0,
-                'fee_usd_1': float(result['fee_usd_1']) if result['fee_usd_1'] else 0.0,
-                'token0_symbol': result['token0_symbol'] if result['token0_symbol'] else '',
-                'token1_symbol': result['token1_symbol'] if result['token1_symbol'] else '',
-            }
+            fee_data = _format_fees(result)
             print(f"[GET_ACCUMULATED_FEES] Returning fee data: {fee_data}", flush=True)
             return fee_data
         
@@ -296,22 +466,17 @@ def get_last_hedge_execution(position_id: str) -> Optional[datetime]:
         datetime of last hedge execution, or None if no hedge data exists
     """
     try:
-        conn = get_questdb_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        query = """
-            SELECT time as timestamp
-            FROM hedge_state
-            WHERE position_id = %s
-            ORDER BY time DESC
-            LIMIT 1
-        """
-        
-        cursor.execute(query, (position_id,))
-        result = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
+        with questdb_cursor() as cursor:
+            query = """
+                SELECT time as timestamp
+                FROM hedge_state
+                WHERE position_id = %s
+                ORDER BY time DESC
+                LIMIT 1
+            """
+            
+            cursor.execute(query, (position_id,))
+            result = cursor.fetchone()
         
         if result and result['timestamp']:
             return result['timestamp']
@@ -323,6 +488,131 @@ def get_last_hedge_execution(position_id: str) -> Optional[datetime]:
         return None
 
 
+def get_position_snapshots(position_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Batched replacement for calling get_latest_position_values, get_first_position_values,
+    get_accumulated_fees and get_last_hedge_execution once per position.
+
+    Runs two queries regardless of how many positions are requested:
+    latest hedge_state row joined with latest fee_log row (LATEST ON ... PARTITION BY),
+    and the first hedge_state row per position (first() aggregates). Entry baselines
+    already in the baseline cache are not queried again.
+
+    Args:
+        position_ids: Position IDs (position_configs.id) to query
+
+    Returns:
+        Dict keyed by position_id, each value a dict with:
+            'latest': same shape as get_latest_position_values() or None
+            'first': same shape as get_first_position_values() or None
+            'fees': same shape as get_accumulated_fees() or None
+            'last_execution': datetime of the latest hedge_state row or None
+    """
+    ids = tuple(dict.fromkeys(pid for pid in position_ids if pid))
+    snapshots = {
+        pid: {'latest': None, 'first': None, 'fees': None, 'last_execution': None}
+        for pid in ids
+    }
+    if not ids:
+        return snapshots
+
+    latest_query = """
+        SELECT
+            h.position_id AS position_id,
+            h.time AS timestamp,
+            h.lp_value_usd AS lp_value_usd,
+            h.hl_account_value AS hl_account_value,
+            (h.lp_value_usd + h.hl_account_value) AS total_value,
+            h.lp_il_usd AS lp_il_usd,
+            h.lp_il_pct AS lp_il_pct,
+            h.lp_utilization_pct AS lp_utilization_pct,
+            h.lp_distance_to_lower_pct AS lp_distance_to_lower_pct,
+            h.lp_distance_to_upper_pct AS lp_distance_to_upper_pct,
+            f.fee_usd_total AS fee_usd_total,
+            f.fee_amount_0 AS fee_amount_0,
+            f.fee_amount_1 AS fee_amount_1,
+            f.fee_usd_0 AS fee_usd_0,
+            f.fee_usd_1 AS fee_usd_1,
+            f.token0_symbol AS token0_symbol,
+            f.token1_symbol AS token1_symbol
+        FROM (
+            SELECT
+                time, position_id, lp_value_usd, hl_account_value,
+                lp_il_usd, lp_il_pct, lp_utilization_pct,
+                lp_distance_to_lower_pct, lp_distance_to_upper_pct
+            FROM hedge_state
+            WHERE position_id IN %s
+            LATEST ON time PARTITION BY position_id
+        ) h
+        LEFT JOIN (
+            SELECT
+                time, position_id, fee_usd_total, fee_amount_0, fee_amount_1,
+                fee_usd_0, fee_usd_1, token0_symbol, token1_symbol
+            FROM fee_log
+            WHERE position_id IN %s
+            LATEST ON time PARTITION BY position_id
+        ) f ON h.position_id = f.position_id
+    """
+
+    # first() follows designated-timestamp order, so this is the first row per position
+    first_query = """
+        SELECT
+            position_id,
+            first(time) AS timestamp,
+            first(lp_value_usd) AS lp_value_usd,
+            first(hl_account_value) AS hl_account_value
+        FROM hedge_state
+        WHERE position_id IN %s
+    """
+
+    cached_baselines = baseline_cache.get_many(ids)
+    for pid, baseline in cached_baselines.items():
+        snapshots[pid]['first'] = baseline
+    uncached_ids = tuple(pid for pid in ids if pid not in cached_baselines)
+
+    try:
+        with questdb_cursor() as cursor:
+            cursor.execute(latest_query, (ids, ids))
+            latest_rows = cursor.fetchall()
+
+            first_rows = []
+            if uncached_ids:
+                cursor.execute(first_query, (uncached_ids,))
+                first_rows = cursor.fetchall()
+
+        for row in latest_rows:
+            snapshot = snapshots.get(row['position_id'])
+            if snapshot is None:
+                continue
+            fees = _format_fees(row) if row['fee_usd_total'] is not None else None
+            snapshot['fees'] = fees
+            snapshot['latest'] = _format_latest_values(row, fees)
+            snapshot['last_execution'] = row['timestamp']
+
+        for row in first_rows:
+            snapshot = snapshots.get(row['position_id'])
+            if snapshot is None:
+                continue
+            lp_value = row['lp_value_usd']
+            hl_value = row['hl_account_value']
+            row = dict(row)
+            row['total_value'] = lp_value + hl_value if lp_value is not None and hl_value is not None else None
+            snapshot['first'] = _format_first_values(row)
+
+        baseline_cache.set_many({
+            row['position_id']: snapshots[row['position_id']]['first']
+            for row in first_rows
+            if row['position_id'] in snapshots
+        })
+        return snapshots
+
+    except Exception as e:
+        print(f"Error fetching position snapshots: {e}")
+        import traceback
+        traceback.print_exc()
+        return snapshots
+
+
 def format_time_ago(dt: Optional[datetime]) -> str:
     """
     Format a datetime as a human-readable 'time ago' string.
@@ -404,14 +694,9 @@ def get_latest_regime_tracking(position_id: str) -> dict | None:
     """
     
     try:
-        conn = get_questdb_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        cursor.execute(query, (position_id,))
-        result = cursor.fetchone()
-        
-        cursor.close()
-        conn.close()
+        with questdb_cursor() as cursor:
+            cursor.execute(query, (position_id,))
+            result = cursor.fetchone()
         
         if result:
             return {
@@ -1,7 +1,7 @@
 import reflex as rx
 import sys
 import os
-from .auth import get_supabase_client
+from .auth import get_auth_client, get_supabase_client
 
 
 class AuthState(rx.State):
@@ -36,7 +36,7 @@ class AuthState(rx.State):
             return
         
         try:
-            supabase = get_supabase_client()
+            supabase = get_auth_client()
             
             supabase.auth.sign_in_with_otp({
                 "email": email,
@@ -69,7 +69,7 @@ class AuthState(rx.State):
             return
         
         try:
-            supabase = get_supabase_client()
+            supabase = get_auth_client()
             
             supabase.auth.sign_in_with_otp({
                 "email": email,
@@ -108,7 +108,7 @@ class AuthState(rx.State):
                 self.error_message = "Invalid magic link. Please try again."
                 return rx.redirect("/login")
             
-            supabase = get_supabase_client()
+            supabase = get_auth_client()
             
             # Verify OTP using token_hash (PKCE flow)
             print("[MAGIC LINK] Verifying OTP with token_hash", flush=True)
@@ -223,7 +223,7 @@ class AuthState(rx.State):
 
     async def sign_out(self):
         try:
-            supabase = get_supabase_client()
+            supabase = get_auth_client()
             supabase.auth.sign_out()
             
             # Clear auth state
@@ -0,0 +1,122 @@
+"""
+Exact Uniswap V3 TickMath / SqrtPriceMath
+
+Integer ports of TickMath.getSqrtRatioAtTick / getTickAtSqrtRatio and the
+SqrtPriceMath amount deltas. getSqrtRatioAtTick multiplies together one
+precomputed Q128 constant per set bit of |tick| (sqrt(1.0001)^-(2^i)), so
+results are bit-for-bit what the pool contracts compute. The float formula
+1.0001 ** (tick / 2) drifts by many units at large ticks, which shows up as
+off-by-N token amounts.
+
+See scripts/benchmark_tick_math.py for a speed comparison with the float path.
+"""
+from functools import lru_cache
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+Q96 = 1 << 96
+MAX_UINT256 = (1 << 256) - 1
+
+# (bit of |tick|, 2^128 / sqrt(1.0001)^bit) from TickMath.sol
+_SQRT_RATIO_TABLE = (
+    (0x2, 0xfff97272373d413259a46990580e213a),
+    (0x4, 0xfff2e50f5f656932ef12357cf3c7fdcc),
+    (0x8, 0xffe5caca7e10e4e61c3624eaa0941cd0),
+    (0x10, 0xffcb9843d60f6159c9db58835c926644),
+    (0x20, 0xff973b41fa98c081472e6896dfb254c0),
+    (0x40, 0xff2ea16466c96a3843ec78b326b52861),
+    (0x80, 0xfe5dee046a99a2a811c461f1969c3053),
+    (0x100, 0xfcbe86c7900a88aedcffc83b479aa3a4),
+    (0x200, 0xf987a7253ac413176f2b074cf7815e54),
+    (0x400, 0xf3392b0822b70005940c7a398e4b70f3),
+    (0x800, 0xe7159475a2c29b7443b29c7fa6e889d9),
+    (0x1000, 0xd097f3bdfd2022b8845ad8f792aa5825),
+    (0x2000, 0xa9f746462d870fdf8a65dc1f90e061e5),
+    (0x4000, 0x70d869a156d2a1b890bb3df62baf32f7),
+    (0x8000, 0x31be135f97d08fd981231505542fcfa6),
+    (0x10000, 0x9aa508b5b7a84e1c677de54f3e99bc9),
+    (0x20000, 0x5d6af8dedb81196699c329225ee604),
+    (0x40000, 0x2216e584f5fa1ea926041bedfe98),
+    (0x80000, 0x48a170391f7dc42444e8fa2),
+)
+
+
+@lru_cache(maxsize=4096)
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """
+    sqrt(1.0001^tick) * 2^96, exactly as TickMath.getSqrtRatioAtTick.
+
+    Cached: range bounds of tracked positions are looked up on every refresh.
+    """
+    abs_tick = -tick if tick < 0 else tick
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"Tick {tick} out of range [{MIN_TICK}, {MAX_TICK}]")
+
+    ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 0x1 else 0x100000000000000000000000000000000
+    for bit, multiplier in _SQRT_RATIO_TABLE:
+        if abs_tick & bit:
+            ratio = (ratio * multiplier) >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+
+    # Q128.128 -> Q64.96, rounding up so getTickAtSqrtRatio is consistent
+    return (ratio >> 32) + (1 if ratio & 0xffffffff else 0)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """Greatest tick whose sqrt ratio is <= sqrt_price_x96, as TickMath.getTickAtSqrtRatio"""
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError(f"sqrtPriceX96 {sqrt_price_x96} out of range")
+
+    ratio = sqrt_price_x96 << 32
+    msb = ratio.bit_length() - 1
+    r = ratio >> (msb - 127) if msb >= 128 else ratio << (127 - msb)
+
+    # log2(ratio) as Q64.64, fractional bits by repeated squaring
+    log_2 = (msb - 128) << 64
+    for shift in range(63, 49, -1):
+        r = (r * r) >> 127
+        f = r >> 128
+        log_2 |= f << shift
+        r >>= f
+
+    log_sqrt10001 = log_2 * 255738958999603826347141  # 128.128 number
+
+    tick_low = (log_sqrt10001 - 3402992956809132418596140100660247210) >> 128
+    tick_high = (log_sqrt10001 + 291339464771989622907027621153398088495) >> 128
+
+    if tick_low == tick_high:
+        return tick_low
+    return tick_high if get_sqrt_ratio_at_tick(tick_high) <= sqrt_price_x96 else tick_low
+
+
+def _mul_div(a: int, b: int, denominator: int, round_up: bool = False) -> int:
+    """FullMath.mulDiv / mulDivRoundingUp (Python ints don't overflow)"""
+    result, remainder = divmod(a * b, denominator)
+    return result + 1 if round_up and remainder else result
+
+
+def get_amount0_delta(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool = False) -> int:
+    """Token0 between two sqrt prices for a liquidity, as SqrtPriceMath.getAmount0Delta"""
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+    if sqrt_ratio_a_x96 <= 0:
+        raise ValueError("sqrt ratio must be positive")
+
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_ratio_b_x96 - sqrt_ratio_a_x96
+    if round_up:
+        amount = _mul_div(numerator1, numerator2, sqrt_ratio_b_x96, round_up=True)
+        return -(-amount // sqrt_ratio_a_x96)
+    return _mul_div(numerator1, numerator2, sqrt_ratio_b_x96) // sqrt_ratio_a_x96
+
+
+def get_amount1_delta(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool = False) -> int:
+    """Token1 between two sqrt prices for a liquidity, as SqrtPriceMath.getAmount1Delta"""
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+    return _mul_div(liquidity, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, Q96, round_up=round_up)
@@ -0,0 +1,122 @@
+"""
+Cache for ERC20 token metadata (symbol and decimals)
+
+Token symbol/decimals never change once deployed, so they only need to be read
+from chain once per (network, address). Lookups go through a small in-process
+LRU backed by an optional JSON store (TOKEN_METADATA_CACHE_PATH) so they
+survive restarts. The cache is warmed from the token_addresses section of
+token_mapping.json, so common pairs (WETH/USDC etc.) never hit the RPC.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from .token_registry import token_registry
+
+
+def _cache_key(network: str, address: str) -> str:
+    return f"{network.lower()}:{address.lower()}"
+
+
+class TokenMetadataCache:
+    """
+    Network-scoped token metadata cache with an LRU and optional JSON persistence.
+
+    Args:
+        path: JSON file to persist metadata to, or None for memory only
+        max_entries: Entries kept in the in-process LRU
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2048):
+        self.path = path
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, Dict]" = OrderedDict()
+        self._store: Dict[str, Dict] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        """Load the JSON store and token_mapping.json seeds on first access (lock must be held)"""
+        if self._loaded:
+            return
+        self._loaded = True
+
+        for network, tokens in token_registry.get().token_addresses.items():
+            for address, metadata in tokens.items():
+                self._store[_cache_key(network, address)] = {
+                    'symbol': metadata['symbol'],
+                    'decimals': int(metadata['decimals']),
+                }
+
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._store.update(data)
+        except Exception as e:
+            print(f"Warning: Could not load token metadata cache from {self.path}: {e}")
+
+    def _persist(self):
+        """Write the store to disk atomically (lock must be held)"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(self._store, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Warning: Could not persist token metadata cache to {self.path}: {e}")
+
+    def _remember(self, key: str, metadata: Dict):
+        """Insert into the LRU, evicting the least recently used entry (lock must be held)"""
+        self._lru[key] = metadata
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get_many(self, network: str, addresses: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Return cached metadata for the given token addresses (misses are omitted).
+
+        Returns:
+            Dictionary keyed by the address as passed in, values {'symbol', 'decimals'}
+        """
+        found = {}
+        with self._lock:
+            self._ensure_loaded()
+            for address in addresses:
+                key = _cache_key(network, address)
+                metadata = self._lru.get(key)
+                if metadata is None:
+                    metadata = self._store.get(key)
+                    if metadata is None:
+                        continue
+                    self._remember(key, metadata)
+                else:
+                    self._lru.move_to_end(key)
+                found[address] = dict(metadata)
+        return found
+
+    def set_many(self, network: str, metadata_by_address: Dict[str, Dict]):
+        """Store metadata read from chain for the given token addresses"""
+        if not metadata_by_address:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            for address, metadata in metadata_by_address.items():
+                key = _cache_key(network, address)
+                entry = {'symbol': metadata['symbol'], 'decimals': int(metadata['decimals'])}
+                self._store[key] = entry
+                self._remember(key, entry)
+            self._persist()
+
+
+token_metadata_cache = TokenMetadataCache(os.getenv('TOKEN_METADATA_CACHE_PATH') or None)
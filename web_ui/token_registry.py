@@ -0,0 +1,107 @@
+"""
+Parsed-once view of token_mapping.json
+
+token_mapping.json is read into immutable indexes (symbol -> HL market dict,
+stablecoin set, known token addresses) the first time it's needed. The file's
+mtime is checked at most every TOKEN_MAPPING_CHECK_SECONDS and the indexes are
+rebuilt when it changes, so edits are still picked up without a restart.
+"""
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Optional
+
+
+TOKEN_MAPPING_PATH = os.path.join(os.path.dirname(__file__), 'token_mapping.json')
+TOKEN_MAPPING_CHECK_SECONDS = float(os.getenv('TOKEN_MAPPING_CHECK_SECONDS', '2'))
+
+# Used when token_mapping.json can't be read
+FALLBACK_MAPPINGS = {
+    'ETH': 'ETH', 'WETH': 'ETH',
+    'BTC': 'BTC', 'WBTC': 'BTC',
+    'LINK': 'LINK', 'ENA': 'ENA',
+}
+FALLBACK_STABLECOINS = {'USDC', 'USDT', 'DAI'}
+
+
+class TokenIndexes:
+    """Immutable indexes built from one version of token_mapping.json"""
+
+    def __init__(self, mappings: Mapping[str, str], stablecoins: FrozenSet[str],
+                 token_addresses: Mapping[str, Mapping[str, Mapping]]):
+        self.mappings = mappings  # Uppercased pool symbol -> HL market symbol
+        self.stablecoins = stablecoins  # Uppercased stablecoin symbols
+        self.token_addresses = token_addresses  # network -> address -> {symbol, decimals}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "TokenIndexes":
+        mappings = {k.upper(): v for k, v in data.get('mappings', {}).items()}
+        stablecoins = frozenset(s.upper() for s in data.get('stablecoins', []))
+        token_addresses = {
+            network: MappingProxyType({
+                address.lower(): MappingProxyType(dict(metadata))
+                for address, metadata in tokens.items()
+            })
+            for network, tokens in data.get('token_addresses', {}).items()
+        }
+        return cls(MappingProxyType(mappings), stablecoins, MappingProxyType(token_addresses))
+
+    @classmethod
+    def fallback(cls) -> "TokenIndexes":
+        return cls(MappingProxyType(dict(FALLBACK_MAPPINGS)), frozenset(FALLBACK_STABLECOINS), MappingProxyType({}))
+
+
+class TokenRegistry:
+    """
+    Hot-reloading holder for TokenIndexes.
+
+    Args:
+        path: token_mapping.json location
+        check_seconds: Minimum interval between mtime checks
+    """
+
+    def __init__(self, path: str = TOKEN_MAPPING_PATH, check_seconds: float = TOKEN_MAPPING_CHECK_SECONDS):
+        self.path = path
+        self.check_seconds = check_seconds
+        self._indexes: Optional[TokenIndexes] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _reload(self):
+        """Re-parse the file if its mtime changed (lock must be held)"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError as e:
+            if self._indexes is None:
+                print(f"Warning: Could not load token_mapping.json: {e}")
+                self._indexes = TokenIndexes.fallback()
+            return
+
+        if self._indexes is not None and mtime == self._mtime:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._indexes = TokenIndexes.from_json(json.load(f))
+            self._mtime = mtime
+        except Exception as e:
+            # Keep serving the last good version (e.g. while the file is mid-edit)
+            print(f"Warning: Could not load token_mapping.json: {e}")
+            if self._indexes is None:
+                self._indexes = TokenIndexes.fallback()
+
+    def get(self) -> TokenIndexes:
+        """Current indexes, reloading first if the file changed"""
+        now = time.monotonic()
+        if self._indexes is not None and now - self._checked_at < self.check_seconds:
+            return self._indexes
+        with self._lock:
+            if self._indexes is None or now - self._checked_at >= self.check_seconds:
+                self._reload()
+                self._checked_at = now
+            return self._indexes
+
+
+token_registry = TokenRegistry()
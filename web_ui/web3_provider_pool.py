@@ -0,0 +1,227 @@
+"""
+Shared Web3 providers with keep-alive sessions and RPC failover
+
+One Web3 instance per network is shared by the whole process. Each network can
+have several RPC URLs (comma-separated in e.g. BASE_RPC). Every request goes to
+an endpoint chosen by latency (lower EWMA latency -> higher weight); transport
+errors, HTTP 429/5xx and JSON-RPC rate-limit errors are retried with
+exponential backoff on another endpoint not tried yet for that request. An
+endpoint that keeps failing trips its circuit breaker and is skipped until a
+cooldown passes; with every circuit open, requests fail immediately.
+
+Requests block, so async code should call into web3 from an executor.
+"""
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+
+
+RPC_TIMEOUT_SECONDS = float(os.getenv('RPC_TIMEOUT_SECONDS', '10'))
+RPC_MAX_RETRIES = int(os.getenv('RPC_MAX_RETRIES', '3'))
+RPC_BACKOFF_SECONDS = float(os.getenv('RPC_BACKOFF_SECONDS', '0.25'))
+RPC_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('RPC_CIRCUIT_FAILURE_THRESHOLD', '3'))
+RPC_CIRCUIT_COOLDOWN_SECONDS = float(os.getenv('RPC_CIRCUIT_COOLDOWN_SECONDS', '30'))
+
+# JSON-RPC error codes providers use for throttling
+RATE_LIMIT_ERROR_CODES = {-32005, -32090, 429}
+
+# Latency assumed for endpoints that haven't served a request yet
+DEFAULT_LATENCY_SECONDS = 0.3
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class RPCEndpointError(Exception):
+    """Raised when every endpoint for a network failed"""
+    pass
+
+
+def _is_rate_limited(response: Dict) -> bool:
+    error = response.get('error') if isinstance(response, dict) else None
+    if not isinstance(error, dict):
+        return False
+    message = str(error.get('message', '')).lower()
+    return error.get('code') in RATE_LIMIT_ERROR_CODES or 'rate limit' in message or 'too many requests' in message
+
+
+class RPCEndpoint:
+    """One RPC URL with its keep-alive session, latency EWMA and circuit breaker"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.provider = Web3.HTTPProvider(
+            url, request_kwargs={'timeout': RPC_TIMEOUT_SECONDS}, session=self.session
+        )
+
+        self.ewma_latency: Optional[float] = None
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def label(self) -> str:
+        """Host only - URLs like drpc embed API keys in the path"""
+        return urlparse(self.url).netloc or self.url
+
+    def is_available(self, now: float) -> bool:
+        """Closed circuit, or open circuit whose cooldown has passed (half-open)"""
+        return self.open_until <= now
+
+    def weight(self) -> float:
+        return 1.0 / max(self.ewma_latency or DEFAULT_LATENCY_SECONDS, 0.001)
+
+    def record_success(self, latency: float):
+        with self.lock:
+            self.requests += 1
+            self.consecutive_failures = 0
+            self.open_until = 0.0
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency = LATENCY_EWMA_ALPHA * latency + (1 - LATENCY_EWMA_ALPHA) * self.ewma_latency
+
+    def record_failure(self):
+        with self.lock:
+            self.requests += 1
+            self.errors += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= RPC_CIRCUIT_FAILURE_THRESHOLD:
+                self.open_until = time.monotonic() + RPC_CIRCUIT_COOLDOWN_SECONDS
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        if self.open_until > now:
+            circuit = 'open'
+        elif self.consecutive_failures >= RPC_CIRCUIT_FAILURE_THRESHOLD:
+            circuit = 'half_open'
+        else:
+            circuit = 'closed'
+        return {
+            'endpoint': self.label,
+            'requests': self.requests,
+            'errors': self.errors,
+            'error_rate': round(self.errors / self.requests, 4) if self.requests else 0.0,
+            'latency_ms': round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+            'circuit': circuit,
+        }
+
+
+class PooledHTTPProvider(JSONBaseProvider):
+    """
+    Web3 provider that spreads requests over several RPC endpoints.
+
+    Args:
+        urls: RPC URLs for one network
+        max_retries: Extra attempts (on other endpoints) after the first failure
+    """
+
+    def __init__(self, urls: List[str], max_retries: int = RPC_MAX_RETRIES):
+        super().__init__()
+        if not urls:
+            raise ValueError("PooledHTTPProvider needs at least one RPC URL")
+        self.endpoints = [RPCEndpoint(url) for url in urls]
+        self.max_retries = max_retries
+
+    def _choose_endpoint(self, tried: set) -> Optional[RPCEndpoint]:
+        """Latency-weighted pick among available endpoints not tried yet (None if there are none)"""
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e.is_available(now) and e not in tried]
+        if not candidates:
+            return None
+        return random.choices(candidates, weights=[e.weight() for e in candidates])[0]
+
+    def make_request(self, method, params) -> Any:
+        tried = set()
+        last_error: Optional[Exception] = None
+
+        # Each endpoint is tried at most once per request, so a network with a
+        # single dead RPC costs one timeout rather than one per retry
+        for attempt in range(self.max_retries + 1):
+            endpoint = self._choose_endpoint(tried)
+            if endpoint is None:
+                break
+            if attempt:
+                time.sleep(RPC_BACKOFF_SECONDS * (2 ** (attempt - 1)) * (1 + random.random()))
+
+            tried.add(endpoint)
+            start = time.monotonic()
+            try:
+                response = endpoint.provider.make_request(method, params)
+            except Exception as e:
+                endpoint.record_failure()
+                last_error = e
+                continue
+
+            if _is_rate_limited(response):
+                endpoint.record_failure()
+                last_error = RPCEndpointError(f"{endpoint.label} rate limited: {response['error']}")
+                continue
+
+            # Reverts and other JSON-RPC errors are answers, not endpoint failures
+            endpoint.record_success(time.monotonic() - start)
+            return response
+
+        if not tried:
+            # Every circuit is open - fail fast until one cools down
+            raise RPCEndpointError(f"All RPC endpoints unavailable for {method} (circuit open)")
+        raise RPCEndpointError(f"All RPC attempts failed for {method}: {last_error}")
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            response = self.make_request('web3_clientVersion', [])
+        except Exception:
+            return False
+        return 'error' not in response
+
+    def stats(self) -> List[Dict]:
+        return [endpoint.stats() for endpoint in self.endpoints]
+
+
+class Web3ProviderManager:
+    """Process-wide cache of one pooled Web3 instance per network"""
+
+    def __init__(self):
+        self._instances: Dict[str, Web3] = {}
+        self._lock = threading.Lock()
+
+    def get_web3(self, network: str, rpc_setting: str) -> Web3:
+        """
+        Get the shared Web3 instance for a network.
+
+        Args:
+            network: Network name
+            rpc_setting: One or more comma-separated RPC URLs
+        """
+        network = network.lower()
+        with self._lock:
+            w3 = self._instances.get(network)
+            if w3 is None:
+                urls = [url.strip() for url in rpc_setting.split(',') if url.strip()]
+                w3 = Web3(PooledHTTPProvider(urls))
+                self._instances[network] = w3
+            return w3
+
+    def stats(self) -> Dict[str, List[Dict]]:
+        """Per-endpoint latency/error/circuit stats for every network used so far"""
+        with self._lock:
+            return {network: w3.provider.stats() for network, w3 in self._instances.items()}
+
+
+web3_provider_manager = Web3ProviderManager()
+
+
+def get_rpc_stats() -> Dict[str, List[Dict]]:
+    """Per-endpoint RPC stats, keyed by network"""
+    return web3_provider_manager.stats()